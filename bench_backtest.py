@@ -0,0 +1,64 @@
+# bench_backtest.py
+# 목표가 그리드 탐색(modules/backtest.run_grid) 소요 시간을 측정합니다.
+# 기본값: 10년치 일봉(약 2,520개) × 1,000개 (매수가, 매도가) 조합
+# 실행: python bench_backtest.py [티커]   (티커를 주면 로컬 BarStore/yfinance의 'max' 이력 사용)
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from modules.backtest import backtest, run_grid
+from modules.trading_service import evaluate_target_rule
+
+
+def _synthetic_history(n=2_520, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    index = pd.bdate_range("2015-01-01", periods=n)
+    return pd.DataFrame({"Close": close}, index=index)
+
+
+def _loop_backtest(close, target_buy, target_sell):
+    """검증용 반복문 구현 (자동 매매 서비스의 규칙을 봉마다 그대로 적용)"""
+    bought, cash = False, 0.0
+    for price in close:
+        action = evaluate_target_rule(price, target_buy, target_sell, bought)
+        if action == "buy":
+            bought, cash = True, cash - price
+        elif action == "sell":
+            bought, cash = False, cash + price
+    return cash + (close[-1] if bought else 0.0)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from modules.scraper import StockScraper
+
+        df = StockScraper(sys.argv[1]).get_history(period="10y")
+    else:
+        df = _synthetic_history()
+
+    close = df["Close"].to_numpy()
+    lo, hi = np.percentile(close, [5, 95])
+    buy_levels = np.linspace(lo, (lo + hi) / 2, 40)
+    sell_levels = np.linspace((lo + hi) / 2, hi, 25)
+
+    print(f"--- 백테스트 벤치마크: 봉 {len(df):,}개, 조합 {len(buy_levels) * len(sell_levels):,}개 ---")
+
+    # 1. 정확성 확인
+    summary, _ = backtest(df, buy_levels[10], sell_levels[10])
+    expected = _loop_backtest(close, buy_levels[10], sell_levels[10])
+    assert abs(summary["total_pnl"] - expected) < 1e-6, (summary, expected)
+    print(f"정확성 확인 완료: {summary}")
+
+    # 2. 단일 프로세스 / 프로세스 풀 비교
+    for processes in (1, None):
+        started = time.perf_counter()
+        sweep = run_grid(df, buy_levels, sell_levels, processes=processes)
+        elapsed = time.perf_counter() - started
+        label = "단일 프로세스" if processes == 1 else "프로세스 풀"
+        print(f"{label}: {elapsed:.2f}초")
+
+    print("\n[상위 5개 조합]")
+    print(sweep.head().to_string())
@@ -0,0 +1,136 @@
+# bench_kis.py
+# 로컬 KIS 모의 서버(modules/kis_mock.py)를 띄우고 KisTrader 주문 경로의 지연 시간과 처리량을 측정합니다.
+# 네트워크 없이 실행되므로 CI에서 주문 경로 성능 회귀 확인용으로 쓸 수 있습니다.
+# 실행: python bench_kis.py [--orders 500] [--concurrency 16] [--latency-ms 5] [--max-p99-ms 200]
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from modules.kis_mock import MockKisServer
+
+parser = argparse.ArgumentParser(
+    description="KisTrader 주문 경로 벤치마크 (로컬 모의 서버)"
+)
+parser.add_argument("--orders", type=int, default=500, help="단계별 주문 수")
+parser.add_argument(
+    "--concurrency", type=int, default=16, help="비동기 단계 동시 주문 수"
+)
+parser.add_argument("--latency-ms", type=float, default=5.0, help="모의 서버 응답 지연")
+parser.add_argument("--jitter-ms", type=float, default=1.0)
+parser.add_argument("--error-rate", type=float, default=0.0)
+parser.add_argument(
+    "--rate-limit", type=float, default=None, help="모의 서버 초당 한도"
+)
+parser.add_argument(
+    "--max-p99-ms", type=float, default=None, help="p99가 이 값을 넘으면 종료 코드 1"
+)
+args = parser.parse_args()
+
+server = MockKisServer(
+    latency_ms=args.latency_ms,
+    jitter_ms=args.jitter_ms,
+    error_rate=args.error_rate,
+    rate_limit=args.rate_limit,
+    seed=42,
+).start()
+
+# KisTrader가 실제 증권사 대신 모의 서버와, 실제 토큰 파일 대신 임시 폴더를 사용하도록 설정
+os.environ["KIS_BASE_URL"] = server.url
+os.environ["KIS_TOKEN_DIR"] = tempfile.mkdtemp(prefix="kis-bench-")
+os.environ.setdefault("KIS_APP_KEY", "bench-app-key")
+os.environ.setdefault("KIS_APP_SECRET", "bench-app-secret")
+os.environ.setdefault("KIS_ACCOUNT_NO", "00000000")
+
+# 환경 변수 설정 후 import (토큰 저장 폴더는 import 시점에 결정됨)
+from modules.trader import AsyncKisTrader, KisTrader  # noqa: E402
+
+TICKERS = [f"{i:06d}" for i in range(1, 51)]
+
+
+def report(name, latencies, failures, elapsed):
+    lat = np.array(latencies) * 1000
+    print(
+        f"{name:<18} 주문 {len(lat):>5}건 | 실패 {failures:>4} | "
+        f"p50 {np.percentile(lat, 50):7.2f}ms | p99 {np.percentile(lat, 99):7.2f}ms | "
+        f"평균 {lat.mean():7.2f}ms | 처리량 {len(lat) / elapsed:8.1f}건/초"
+    )
+    return np.percentile(lat, 99)
+
+
+def bench_sync(trader, n):
+    """KisTrader.send_order를 순차 호출 (기존 동기 경로)"""
+    latencies, failures = [], 0
+    started = time.perf_counter()
+    for i in range(n):
+        t0 = time.perf_counter()
+        ok = trader.send_order(TICKERS[i % len(TICKERS)], 1, 0, "buy")
+        latencies.append(time.perf_counter() - t0)
+        failures += not ok
+    return latencies, failures, time.perf_counter() - started
+
+
+async def bench_async(n, concurrency):
+    """AsyncKisTrader.place_order를 동시에 최대 concurrency건씩 호출"""
+    trader = await AsyncKisTrader.create()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def one(i):
+        nonlocal failures
+        async with semaphore:
+            t0 = time.perf_counter()
+            result = await trader.place_order(TICKERS[i % len(TICKERS)], 1, 0, "buy")
+            latencies.append(time.perf_counter() - t0)
+            failures += not result["success"]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    elapsed = time.perf_counter() - started
+    await trader.aclose()
+    return latencies, failures, elapsed
+
+
+# 주문 결과 출력이 측정 결과를 가리지 않도록 주문 단계에서는 표준 출력을 잠시 끕니다.
+class _Quiet:
+    def __enter__(self):
+        self.stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+
+    def __exit__(self, *exc):
+        sys.stdout.close()
+        sys.stdout = self.stdout
+
+
+print(
+    f"--- KisTrader 벤치마크: 모의 서버 {server.url}, 지연 {args.latency_ms}±{args.jitter_ms}ms, "
+    f"오류율 {args.error_rate:.1%}, 초당 한도 {args.rate_limit or '없음'} ---"
+)
+
+trader = KisTrader()
+if not trader.access_token:
+    server.stop()
+    sys.exit("토큰 발급 실패")
+
+with _Quiet():
+    trader.send_order(TICKERS[0], 1, 0, "buy")  # 연결 준비 (측정 제외)
+    sync_result = bench_sync(trader, args.orders)
+    async_result = asyncio.run(bench_async(args.orders, args.concurrency))
+
+p99_sync = report("동기 (순차)", *sync_result)
+p99_async = report(f"비동기 (동시 {args.concurrency})", *async_result)
+
+timing = trader.timing_summary().get("send_order", {})
+print(f"연결 재사용률 (동기): {timing.get('reuse_rate', 0):.0%}")
+print(f"모의 서버 통계: {server.state.stats}")
+
+trader.close()
+server.stop()
+
+if args.max_p99_ms is not None and max(p99_sync, p99_async) > args.max_p99_ms:
+    print(f"❌ p99가 기준 {args.max_p99_ms}ms를 넘었습니다.")
+    sys.exit(1)
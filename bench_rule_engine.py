@@ -0,0 +1,75 @@
+# bench_rule_engine.py
+# RuleTable 벡터 평가의 틱당 지연 시간을 측정합니다.
+# 실행: python bench_rule_engine.py [규칙 수] [종목 수] [틱 수]
+import sys
+import time
+
+import numpy as np
+
+from modules.rule_engine import RuleTable
+from modules.trading_service import evaluate_target_rule
+
+n_rules = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+n_tickers = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+n_ticks = int(sys.argv[3]) if len(sys.argv) > 3 else 1_000
+
+rng = np.random.default_rng(42)
+tickers = [f"T{i:04d}" for i in range(n_tickers)]
+base = rng.uniform(10, 500, n_tickers)
+
+table = RuleTable()
+for ticker in tickers:
+    table.ticker_id(ticker)  # 종목 번호를 tickers 순서와 맞춤 (가격 벡터를 그대로 사용)
+for i in range(n_rules):
+    t = int(rng.integers(n_tickers))
+    table.add_rule(
+        (f"user{i}", tickers[t]),
+        tickers[t],
+        base[t] * rng.uniform(0.80, 0.995),
+        base[t] * rng.uniform(1.005, 1.20),
+        bought=bool(rng.integers(2)),
+    )
+
+print(f"--- RuleTable 벤치마크: 규칙 {n_rules:,}개, 종목 {n_tickers:,}개, 틱 {n_ticks:,}회 ---")
+
+# 1. 정확성 확인: 스칼라 규칙(evaluate_target_rule)과 결과 비교
+prices = base * rng.uniform(0.85, 1.15, n_tickers)
+vector_hits = {(i["key"], i["side"]) for i in table.evaluate(prices)}
+scalar_hits = set()
+for row, key in enumerate(table.keys):
+    side = evaluate_target_rule(
+        prices[table.ticker_idx[row]],
+        table.target_buy[row],
+        table.target_sell[row],
+        table.bought[row],
+    )
+    if side:
+        scalar_hits.add((key, side))
+assert vector_hits == scalar_hits, "벡터 평가 결과가 스칼라 규칙과 다릅니다"
+print(f"정확성 확인 완료 (발동 규칙 {len(vector_hits):,}개)")
+
+# 2. 틱당 지연 시간 (가격 벡터 입력, ±1% 변동으로 일부 규칙만 발동)
+latencies = []
+n_intents = 0
+for _ in range(n_ticks):
+    prices = base * rng.uniform(0.99, 1.01, n_tickers)
+    started = time.perf_counter()
+    n_intents += len(table.evaluate(prices))
+    latencies.append(time.perf_counter() - started)
+
+lat_us = np.array(latencies) * 1e6
+print(
+    f"틱당 지연 시간(μs): 평균 {lat_us.mean():,.1f} | p50 {np.percentile(lat_us, 50):,.1f} "
+    f"| p99 {np.percentile(lat_us, 99):,.1f} (틱당 평균 발동 {n_intents / n_ticks:,.1f}건)"
+)
+
+# 3. 비교: 규칙별 스칼라 평가 루프
+started = time.perf_counter()
+for row in range(len(table)):
+    evaluate_target_rule(
+        prices[table.ticker_idx[row]],
+        table.target_buy[row],
+        table.target_sell[row],
+        table.bought[row],
+    )
+print(f"스칼라 루프 1회: {(time.perf_counter() - started) * 1e6:,.1f}μs")
@@ -0,0 +1,22 @@
+# conftest.py
+# 테스트 공통 fixture: 로컬 KIS 모의 서버(modules/kis_mock.py)와 그 서버를 쓰는 KisTrader
+import pytest
+
+from modules import token_manager
+from modules.kis_mock import MockKisServer
+
+
+@pytest.fixture
+def mock_kis(monkeypatch, tmp_path):
+    """
+    KIS 모의 서버를 띄우고 KisTrader가 그 서버와 임시 토큰 폴더를 사용하도록 설정합니다.
+    Yields: MockKisServer (server.state로 계좌 상태/호출 통계 확인)
+    """
+    with MockKisServer() as server:
+        monkeypatch.setenv("KIS_BASE_URL", server.url)
+        monkeypatch.setenv("KIS_APP_KEY", "test-app-key")
+        monkeypatch.setenv("KIS_APP_SECRET", "test-app-secret")
+        monkeypatch.setenv("KIS_ACCOUNT_NO", "00000000")
+        monkeypatch.setattr(token_manager, "TOKEN_DIR", str(tmp_path))
+        monkeypatch.setattr(token_manager, "_managers", {})
+        yield server
@@ -1,5 +1,4 @@
 # main.py
-import time
 import datetime
 import json
 
@@ -9,26 +8,31 @@ from streamlit_cookies_manager import EncryptedCookieManager
 from modules.config import get_secret
 from modules.constants import (
     SK_USER_INFO,
-    SK_BOUGHT_STATUS,
     SK_WATCHLIST,
     SK_JOURNAL_DATE,
 )
-from modules.scraper import (
-    StockScraper,
-    fetch_stock_history,
-    fetch_stock_info,
-    fetch_watchlist_data,
-    WATCHLIST_UPDATE_SEC,
-)
+from modules.scraper import fetch_watchlist_data, WATCHLIST_UPDATE_SEC
+from modules.loader import load_analysis_data
 from modules.auth_manager import AuthManager
-from modules.db import ensure_schema, get_journal_dates, save_journal, load_journal
+from modules.db import ensure_schema, save_journal, load_journal
 from modules.trader import KisTrader
-from modules.portfolio import PortfolioManager
+from modules.account_state import AccountCache
 from modules.pdf_generator import download_journal_pdf
+from modules.trade_history import load_day_trades, trades_dataframe
 from ui.sidebar import render_sidebar
 from ui.dashboard import render_dashboard
 from ui.login_page import render_login_page
 from ui.portfolio_ui import render_portfolio_dashboard
+from ui.auto_trade_ui import (
+    close_price_subscription,
+    render_auto_trade_monitor,
+    sync_auto_trade_rule,
+)
+from ui.journal_ui import (
+    refresh_journal_month,
+    render_journal_calendar,
+    render_journal_search,
+)
 
 # 페이지 기본 설정
 st.set_page_config(
@@ -72,12 +76,14 @@ st.markdown(
 # 1. Trader 객체 캐싱 (앱 실행 중 1회만 로그인)
 @st.cache_resource
 def get_trader():
+    # 주문은 매매 서비스(modules/trading_service.py)가 보내고 체결 기록(trades)도 그쪽에서 남깁니다.
     return KisTrader()
 
 
-# 2. 세션 상태 초기화 (중복 주문 방지용)
-if "bought_status" not in st.session_state:
-    st.session_state[SK_BOUGHT_STATUS] = {}  # {ticker: True/False}
+# 2. 계좌 잔고 캐시 (화면에서는 새로고침 버튼을 누를 때만 증권사 재조회)
+@st.cache_resource
+def get_account_cache():
+    return AccountCache(get_trader())
 
 
 def main():
@@ -205,89 +211,40 @@ def main():
         # 앱이 처음 로드되거나 버튼이 눌렸을 때 실행
         if ticker:
             with st.spinner("데이터를 불러오는 중입니다..."):
-                # (1) 주가 데이터 (캐싱 적용)
-                df = fetch_stock_history(ticker, period)
-
-                # (2) 기본 정보 (캐싱 적용)
-                info = fetch_stock_info(ticker)
-
-                # (3) 뉴스 (캐싱 미적용 - 최신성 유지)
-                scraper = StockScraper(ticker)
-                news = scraper.get_news()
+                # 주가 데이터, 기본 정보, 뉴스, 공시를 동시에 요청하여
+                # 가장 느린 요청 하나만큼만 기다립니다.
+                data = load_analysis_data(ticker, period)
+                df = data["history"]
+                info = data["info"]
+                news = data["news"]
 
             # 데이터가 유효하면 대시보드 그리기
+            current_price = None
             if info and not df.empty:
-                render_dashboard(df, info, news, ticker=ticker)
+                render_dashboard(df, info, news, ticker=ticker, user_id=user_id)
                 current_price = df["Close"].iloc[-1]
             else:
                 st.error("데이터를 찾을 수 없습니다. 종목 코드를 확인해주세요.")
             # ---------------------------------------------------------
             # [핵심] 자동 매매 로직 연결
             # ---------------------------------------------------------
+            # 자동 매매 설정은 백그라운드 매매 서비스(modules/trading_service.py)의 규칙으로 등록되고,
+            # 주문과 매수 상태 관리는 서비스가 담당합니다.
+            sync_auto_trade_rule(
+                user_id, ticker, is_auto, config["target_buy"], config["target_sell"]
+            )
             if is_auto:
                 st.divider()
-                st.subheader("🤖 자동 매매 모니터링")
-
-                status_cols = st.columns(4)
-                status_cols[0].metric("현재가", f"{current_price:,.0f}")
-                status_cols[1].metric("목표 매수가", f"{config['target_buy']:,.0f}")
-                status_cols[2].metric("목표 매도가", f"{config['target_sell']:,.0f}")
-
-                # 로그 창 (컨테이너)
-                log_container = st.empty()
-
-                trader = get_trader()
-
-                # 매수 로직
-                # 1. 목표가가 설정되어 있고
-                # 2. 현재가가 목표가보다 낮거나 같으며
-                # 3. 아직 매수하지 않은 상태일 때
-                if config["target_buy"] > 0 and current_price <= config["target_buy"]:
-                    if not st.session_state[SK_BOUGHT_STATUS].get(ticker, False):
-                        log_container.warning(
-                            f"⚡ 매수 조건 충족! ({current_price} <= {config['target_buy']}) 주문 실행 중..."
-                        )
-
-                        # API 주문 실행 (수량 1주로 고정 예시)
-                        success = trader.send_order(ticker, 1, 0, "buy")
-
-                        if success:
-                            st.session_state[SK_BOUGHT_STATUS][ticker] = True
-                            st.success(f"✅ {ticker} 1주 매수 완료!")
-                            time.sleep(1)  # 메시지 확인용 대기
-                        else:
-                            st.error("❌ 매수 주문 실패")
-                    else:
-                        status_cols[3].info("상태: 이미 매수함")
-
-                # 매도 로직
-                elif (
-                    config["target_sell"] > 0 and current_price >= config["target_sell"]
-                ):
-                    if st.session_state[SK_BOUGHT_STATUS].get(ticker, False):
-                        log_container.warning(
-                            f"⚡ 매도 조건 충족! ({current_price} >= {config['target_sell']}) 주문 실행 중..."
-                        )
-
-                        success = trader.send_order(ticker, 1, 0, "sell")
-
-                        if success:
-                            st.session_state[SK_BOUGHT_STATUS][
-                                ticker
-                            ] = False  # 매도했으므로 상태 초기화
-                            st.success(f"✅ {ticker} 1주 매도 완료!")
-                            time.sleep(1)
-                        else:
-                            st.error("❌ 매도 주문 실패")
-                    else:
-                        status_cols[3].info("상태: 보유 주식 없음")
-
-                else:
-                    log_container.info("⏳ 조건 감시 중... (특이사항 없음)")
-
-                # 자동 리프레시 (3초마다 재실행하여 실시간 감시 효과)
-                time.sleep(3)
-                st.rerun()
+                # 시세 스트림의 새 틱마다 모니터링 영역만 갱신됩니다.
+                render_auto_trade_monitor(
+                    user_id,
+                    ticker,
+                    config["target_buy"],
+                    config["target_sell"],
+                    current_price,
+                )
+            else:
+                close_price_subscription()
 
             pass
 
@@ -295,19 +252,26 @@ def main():
     # TAB 2: 포트폴리오 관리
     # -----------------------------------------------------
     with tab_portfolio:
-        trader = get_trader()
-
-        # 포트폴리오 매니저 초기화
-        portfolio_manager = PortfolioManager(trader)
+        account = get_account_cache()
 
-        # 버튼을 눌러야 갱신되도록 (API 호출 절약)
-        if st.button("내 자산 현황 조회 (새로고침)"):
+        # 모든 탭이 매 rerun마다 실행되므로 평소에는 캐시된 잔고만 보여주고,
+        # 버튼을 누르거나 아직 조회한 적이 없을 때만 증권사에서 다시 조회
+        force = st.button("내 자산 현황 조회 (새로고침)")
+        if force or account.synced_at is None:
             with st.spinner("증권사 계좌 정보를 불러오는 중..."):
-                account_info, holdings_df = portfolio_manager.get_portfolio_status()
-                render_portfolio_dashboard(account_info, holdings_df)
-        else:
-            # 초기 로드 시 자동 실행을 원하면 이 else문을 지우고 위 코드를 밖으로 빼세요
-            st.info("버튼을 누르면 최신 잔고 정보를 불러옵니다.")
+                account.ensure_fresh(force=force)
+        account_info, holdings_df = account.cached_snapshot()
+        if account.synced_at:
+            synced = datetime.datetime.fromtimestamp(account.synced_at)
+            st.caption(
+                f"마지막 잔고 조회: {synced:%H:%M:%S}"
+                + (
+                    f" (이후 주문 {account.pending_orders}건 반영)"
+                    if account.pending_orders
+                    else ""
+                )
+            )
+        render_portfolio_dashboard(account_info, holdings_df)
 
         pass
 
@@ -321,8 +285,13 @@ def main():
         if SK_JOURNAL_DATE not in st.session_state:
             st.session_state[SK_JOURNAL_DATE] = datetime.date.today()
 
-        #  DB에서 작성된 일지 목록 가져오기 (이벤트로 표시)
-        selected_date = st.date_input("날짜 선택", value=datetime.date.today())
+        # 키워드 검색 (결과의 날짜를 누르면 아래 날짜 선택이 그 날짜로 바뀜)
+        render_journal_search(user_id)
+
+        # 월 달력: 보이는 달의 일지만 조회하고 이전/다음 달은 미리 읽어 둠
+        render_journal_calendar(user_id)
+
+        selected_date = st.date_input("날짜 선택", key=SK_JOURNAL_DATE)
 
         # DB에서 내용 불러오기
         # 선택한 날짜가 변경될 때마다 DB에서 데이터를 새로 가져옵니다.
@@ -336,12 +305,13 @@ def main():
             height=200,
         )
 
-        # 실제 매매 기록 (예시)
-        trades_data = None  # 실제 데이터는 여기에 들어가야 함
-
         if st.button("일지 저장 및 PDF 생성", width="stretch"):
             if journal_content.strip():
                 save_journal(user_id, selected_date, journal_content)
+                refresh_journal_month(user_id, selected_date)
+                # 그날의 실제 매매 기록 (해당 월 파티션만 조회)
+                day_trades = load_day_trades(user_id, selected_date)
+                trades_data = trades_dataframe(day_trades) if day_trades else None
                 download_journal_pdf(selected_date, journal_content, trades_data)
             else:
                 st.warning("일지를 입력해주세요.")
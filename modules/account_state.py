@@ -0,0 +1,200 @@
+# modules/account_state.py
+import threading
+import time
+
+import pandas as pd
+
+from modules.config import get_secret
+from modules.portfolio import EMPTY_ACCOUNT, PortfolioManager
+from modules.trader import kis_ticker
+
+# 증권사 잔고와 대조(재조회)하는 주기 (초). 그 사이에는 주문 결과로 캐시를 직접 갱신
+ACCOUNT_RECONCILE_SEC = float(get_secret("ACCOUNT_RECONCILE_SEC", 300))
+ACCOUNT_RETRY_SEC = 10  # 잔고 조회 실패 시 재시도 간격 (초)
+
+
+class AccountCache:
+    """
+    계좌 잔고(보유 종목, 예수금) 메모리 캐시.
+    - 조회는 메모리에서 바로 반환하고, 증권사 잔고 조회는 주기적으로만 수행
+    - KisTrader의 주문 성공 이벤트로 보유 수량/예수금을 낙관적으로 갱신
+    - 캐시 값이 의심스러우면(음수 수량/예수금, 가격을 모르는 시장가 주문 등) 다음 조회 때 즉시 재조회
+    - 종목은 KIS 종목코드(005930)로 보관하며, yfinance 심볼(005930.KS)로 조회해도 됩니다.
+    """
+
+    def __init__(self, trader, reconcile_sec=ACCOUNT_RECONCILE_SEC):
+        self.trader = trader
+        self.portfolio = PortfolioManager(trader)
+        self.reconcile_sec = reconcile_sec
+
+        self._lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()  # 동시에 여러 곳에서 재조회하지 않도록
+        self.account_info = dict(EMPTY_ACCOUNT)
+        self.holdings = pd.DataFrame()  # 종목코드 인덱스, PortfolioManager 컬럼
+        self.synced_at = None  # 마지막으로 증권사 잔고와 맞춘 시각 (time.time)
+        self.pending_orders = 0  # 마지막 대조 이후 반영한 주문 수
+        self.reconcile_count = 0
+        self._suspicious = False
+        self._retry_at = 0.0
+
+        trader.add_order_listener(self.on_order)
+
+    # --- 조회 ---
+
+    def snapshot(self, force=False):
+        """
+        (account_info, holdings_df) - PortfolioManager.get_portfolio_status와 같은 형식.
+        호출한 쪽에서 DataFrame을 수정해도 캐시에 영향이 없도록 복사본을 반환합니다.
+        """
+        self.ensure_fresh(force)
+        return self.cached_snapshot()
+
+    def cached_snapshot(self):
+        """snapshot과 같은 형식이지만 재조회 없이 지금 캐시에 있는 값만 반환합니다."""
+        with self._lock:
+            return dict(self.account_info), self.holdings.reset_index()
+
+    def position(self, ticker):
+        """
+        보유 수량 (캐시 기준). 필요하면 먼저 증권사 잔고와 맞춥니다.
+        한 번도 조회하지 못했거나 캐시 값이 의심스러우면(재조회 실패) 수량을 모르므로 None을 반환합니다.
+        """
+        ticker = kis_ticker(ticker)
+        self.ensure_fresh()
+        with self._lock:
+            if self.synced_at is None or self._suspicious:
+                return None
+            if ticker in self.holdings.index:
+                return int(self.holdings.at[ticker, "보유수량"])
+            return 0
+
+    def cash(self):
+        """예수금 (캐시 기준)"""
+        self.ensure_fresh()
+        with self._lock:
+            return self.account_info["deposit"]
+
+    def is_stale(self):
+        if self.synced_at is None or self._suspicious:
+            return True
+        return time.time() - self.synced_at >= self.reconcile_sec
+
+    def ensure_fresh(self, force=False):
+        if not force and not self.is_stale():
+            return
+        with self._reconcile_lock:
+            # 잠금을 기다리는 동안 다른 스레드가 이미 재조회했을 수 있으므로 다시 확인
+            if force or (self.is_stale() and time.monotonic() >= self._retry_at):
+                self.reconcile()
+
+    # --- 증권사 잔고와 대조 ---
+
+    def reconcile(self):
+        """증권사 잔고를 다시 조회하여 캐시를 교체합니다. 실패하면 기존 캐시를 유지합니다."""
+        with self._lock:
+            pending = self.pending_orders
+        status = self.portfolio.load_status()
+        if status is None:
+            self._retry_at = time.monotonic() + ACCOUNT_RETRY_SEC
+            return False
+
+        account_info, df = status
+        with self._lock:
+            # 조회 중에 들어온 주문은 조회 결과에 빠져 있을 수 있으므로 다음에 한 번 더 맞춤
+            changed = self.pending_orders != pending
+            self.account_info = account_info
+            self.holdings = df.set_index("종목코드") if not df.empty else df
+            self.synced_at = time.time()
+            self.pending_orders = 0
+            self.reconcile_count += 1
+            self._suspicious = changed
+        return True
+
+    # --- 주문 반영 ---
+
+    def on_order(self, event):
+        """
+        주문 성공 이벤트를 캐시에 반영합니다. (KisTrader 주문 리스너)
+        체결가는 주문가(시장가면 캐시의 현재가)로 가정하며, 실제 체결 결과는 다음 대조 때 맞춰집니다.
+        """
+        ticker = kis_ticker(event["ticker"])
+        quantity = int(event["quantity"])
+        sign = 1 if event["order_type"] == "buy" else -1
+
+        with self._lock:
+            self.pending_orders += 1
+            if self.synced_at is None:
+                return  # 아직 한 번도 조회하지 않았으면 다음 조회 결과를 그대로 사용
+
+            held = ticker in self.holdings.index
+            price = event["price"] or (
+                float(self.holdings.at[ticker, "현재가"]) if held else 0.0
+            )
+            if price <= 0:
+                # 보유하지 않은 종목의 시장가 매수처럼 금액을 추정할 수 없는 경우
+                self._suspicious = True
+                return
+
+            if held:
+                row = self.holdings.loc[ticker]
+                new_qty = int(row["보유수량"]) + sign * quantity
+                if new_qty < 0:
+                    self._suspicious = True
+                    return
+                if sign > 0:
+                    cost = row["매입가"] * row["보유수량"] + price * quantity
+                    self.holdings.at[ticker, "매입가"] = cost / new_qty
+                if new_qty == 0:
+                    self.holdings = self.holdings.drop(ticker)
+                else:
+                    self.holdings.at[ticker, "보유수량"] = new_qty
+                    self._revalue(ticker)
+            elif sign > 0:
+                self._add_holding(ticker, quantity, price)
+            else:
+                # 캐시에 없는 종목을 매도 → 캐시가 실제 잔고와 다름
+                self._suspicious = True
+                return
+
+            self.account_info["deposit"] -= int(sign * price * quantity)
+            if self.account_info["deposit"] < 0:
+                self._suspicious = True
+            self._update_totals()
+
+    def _add_holding(self, ticker, quantity, price):
+        row = pd.DataFrame(
+            {
+                "종목명": [ticker],
+                "보유수량": [quantity],
+                "매입가": [float(price)],
+                "현재가": [float(price)],
+                "평가손익": [0],
+                "수익률(%)": [0.0],
+            },
+            index=pd.Index([ticker], name="종목코드"),
+        )
+        self.holdings = row if self.holdings.empty else pd.concat([self.holdings, row])
+
+    def _revalue(self, ticker):
+        row = self.holdings.loc[ticker]
+        cost = row["매입가"] * row["보유수량"]
+        profit = (row["현재가"] - row["매입가"]) * row["보유수량"]
+        self.holdings.at[ticker, "평가손익"] = int(profit)
+        self.holdings.at[ticker, "수익률(%)"] = (
+            float(profit / cost * 100) if cost else 0.0
+        )
+
+    def _update_totals(self):
+        if self.holdings.empty:
+            stock_value, cost = 0.0, 0.0
+        else:
+            stock_value = (self.holdings["현재가"] * self.holdings["보유수량"]).sum()
+            cost = (self.holdings["매입가"] * self.holdings["보유수량"]).sum()
+        profit = stock_value - cost
+        self.account_info["total_asset"] = int(
+            self.account_info["deposit"] + stock_value
+        )
+        self.account_info["total_profit"] = int(profit)
+        self.account_info["profit_rate"] = (
+            round(float(profit / cost * 100), 2) if cost else 0.0
+        )
@@ -0,0 +1,138 @@
+# modules/backtest.py
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+SWEEP_CHUNK_SIZE = 64  # 프로세스 작업 1건이 한 번에 계산하는 (매수가, 매도가) 조합 수
+
+_worker_close = None  # 그리드 탐색 작업 프로세스가 공유하는 종가 배열
+
+
+def _simulate(close, target_buy, target_sell, quantity, fee_rate):
+    """
+    여러 (매수가, 매도가) 조합을 한 번에 시뮬레이션합니다.
+    close: (n,) 종가, target_buy/target_sell: (m,) 목표가 → 결과 배열은 (m,)
+
+    규칙은 자동 매매 서비스와 동일합니다. (trading_service.evaluate_target_rule)
+    - 매수 구간(종가 <= 목표 매수가)이면 미보유 시 매수
+    - 그 외 매도 구간(종가 >= 목표 매도가)이면 보유 시 매도
+    보유 상태는 '가장 최근에 발생한 구간 이벤트'로 결정되므로 반복문 없이 계산할 수 있습니다.
+    체결은 신호가 발생한 봉의 종가로 가정합니다.
+    """
+    n = close.shape[0]
+    buy = target_buy[:, None]
+    sell = target_sell[:, None]
+    price = close[None, :]
+
+    in_buy_zone = (buy > 0) & (price <= buy)
+    in_sell_zone = ~in_buy_zone & (sell > 0) & (price >= sell)
+    event = in_buy_zone.astype(np.int8) - in_sell_zone.astype(np.int8)
+
+    # 각 봉 시점까지 마지막으로 발생한 이벤트 위치 (없으면 -1)
+    last = np.where(event != 0, np.arange(n), -1)
+    np.maximum.accumulate(last, axis=1, out=last)
+    last_event = np.take_along_axis(event, np.maximum(last, 0), axis=1)
+    position = (last >= 0) & (last_event == 1)
+
+    # +1: 매수 체결, -1: 매도 체결
+    fills = np.diff(position.astype(np.int8), axis=1, prepend=0)
+    notional = close * quantity
+    cash = np.cumsum(-fills * notional - np.abs(fills) * notional * fee_rate, axis=1)
+    equity = cash + position * notional
+
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 0.0)
+    return {
+        "total_pnl": equity[:, -1],
+        "max_drawdown": (peak - equity).max(axis=1),
+        "num_buys": (fills == 1).sum(axis=1),
+        "num_sells": (fills == -1).sum(axis=1),
+        "holding_at_end": position[:, -1],
+    }, equity
+
+
+def backtest(df, target_buy, target_sell, quantity=1, fee_rate=0.0):
+    """
+    OHLCV DataFrame(StockScraper.get_history 형식)으로 목표가 매수/매도 규칙을 검증합니다.
+
+    Returns: (summary, equity)
+        - summary: {"total_pnl", "max_drawdown", "num_buys", "num_sells", "holding_at_end"}
+        - equity: 봉별 평가손익 Series (시작 시점 0 기준)
+    """
+    if df.empty:
+        raise ValueError("백테스트할 주가 데이터가 없습니다.")
+
+    close = df["Close"].to_numpy(dtype=np.float64)
+    result, equity = _simulate(
+        close,
+        np.array([target_buy], dtype=np.float64),
+        np.array([target_sell], dtype=np.float64),
+        quantity,
+        fee_rate,
+    )
+    summary = {name: values[0].item() for name, values in result.items()}
+    return summary, pd.Series(equity[0], index=df.index, name="equity")
+
+
+def _init_worker(close):
+    global _worker_close
+    _worker_close = close
+
+
+def _run_chunk(args):
+    buys, sells, quantity, fee_rate = args
+    result, _ = _simulate(_worker_close, buys, sells, quantity, fee_rate)
+    result["target_buy"] = buys
+    result["target_sell"] = sells
+    return result
+
+
+def run_grid(df, buy_levels, sell_levels, quantity=1, fee_rate=0.0, processes=None):
+    """
+    목표 매수가 × 목표 매도가 조합 전체를 프로세스 풀에서 병렬로 백테스트합니다.
+    각 작업 프로세스는 종가 배열을 한 번만 전달받고, 조합 묶음 단위로 벡터 계산합니다.
+
+    Returns: DataFrame - 조합별 결과 (total_pnl 내림차순)
+    """
+    if df.empty:
+        raise ValueError("백테스트할 주가 데이터가 없습니다.")
+
+    close = df["Close"].to_numpy(dtype=np.float64)
+    combos = np.array(list(itertools.product(buy_levels, sell_levels)), dtype=np.float64)
+    chunks = [
+        (
+            combos[i : i + SWEEP_CHUNK_SIZE, 0],
+            combos[i : i + SWEEP_CHUNK_SIZE, 1],
+            quantity,
+            fee_rate,
+        )
+        for i in range(0, len(combos), SWEEP_CHUNK_SIZE)
+    ]
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(chunks) == 1:
+        _init_worker(close)
+        results = [_run_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(processes, len(chunks)),
+            initializer=_init_worker,
+            initargs=(close,),
+        ) as executor:
+            results = list(executor.map(_run_chunk, chunks))
+
+    columns = [
+        "target_buy",
+        "target_sell",
+        "total_pnl",
+        "max_drawdown",
+        "num_buys",
+        "num_sells",
+        "holding_at_end",
+    ]
+    sweep = pd.DataFrame(
+        {col: np.concatenate([r[col] for r in results]) for col in columns}
+    )
+    return sweep.sort_values("total_pnl", ascending=False, ignore_index=True)
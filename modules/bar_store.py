@@ -0,0 +1,174 @@
+# modules/bar_store.py
+import os
+import re
+import threading
+
+import pandas as pd
+import pyarrow as pa
+
+from modules.config import get_secret
+
+BAR_STORE_DIR = get_secret("BAR_STORE_DIR", ".bar_store")
+
+# 스키마 메타데이터 키: 마지막 전체 수집이 어느 시점부터의 데이터를 보장하는지 기록
+META_COVERED_FROM = b"covered_from"
+COVERED_MAX = "max"
+
+
+def period_start(period, now):
+    """
+    yfinance period 문자열을 슬라이스 시작 시각으로 변환합니다.
+    'Nd' 처럼 거래일 기준인 기간은 None을 반환합니다. (slice_period에서 처리)
+    """
+    if period == "max":
+        return None
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
+
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if not match:
+        raise ValueError(f"지원하지 않는 period: {period}")
+
+    n, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return None
+    if unit == "wk":
+        return now - pd.DateOffset(weeks=n)
+    if unit == "mo":
+        return now - pd.DateOffset(months=n)
+    return now - pd.DateOffset(years=n)
+
+
+def required_start(period, now):
+    """period 조회를 로컬 이력만으로 처리하려면 필요한 최소 시작 시각 ('max', 'Nd'는 None)."""
+    if period == "max":
+        return None
+
+    # 'Nd'(최근 N 거래일)는 주말·휴장일 때문에 달력 시각으로 정할 수 없습니다. (covers에서 봉 수로 확인)
+    if re.fullmatch(r"\d+d", period):
+        return None
+    return period_start(period, now)
+
+
+def covers(covered_from, period, now, index):
+    """
+    저장된 이력이 요청한 period 전체를 포함하는지 확인합니다.
+    'Nd'는 covered_from 이후 연속으로 저장된 봉에 N개 이상의 거래일이 있어야 포함으로 봅니다.
+
+    Args:
+        index: 저장된 이력의 DatetimeIndex
+    """
+    if covered_from is None:
+        return False
+    if covered_from == COVERED_MAX:
+        return True
+    if period == "max":
+        return False
+
+    match = re.fullmatch(r"(\d+)d", period)
+    if match:
+        sessions = index[index >= pd.Timestamp(covered_from)].normalize().nunique()
+        return sessions >= int(match.group(1))
+    return pd.Timestamp(covered_from) <= required_start(period, now)
+
+
+def slice_period(df, period):
+    """저장된 전체 이력에서 period에 해당하는 구간만 잘라 반환합니다."""
+    if df.empty or period == "max":
+        return df
+
+    # 'Nd'는 달력일이 아니라 최근 N 거래일을 의미합니다. (yfinance와 동일)
+    match = re.fullmatch(r"(\d+)d", period)
+    if match:
+        days = df.index.normalize().unique()[-int(match.group(1)) :]
+        return df[df.index.normalize().isin(days)]
+
+    start = period_start(period, df.index[-1])
+    return df[df.index >= start]
+
+
+class BarStore:
+    """
+    종목·간격별 OHLCV 이력을 Arrow IPC 파일로 보관하는 로컬 저장소.
+    읽기는 메모리 매핑으로 처리하고, 쓰기는 임시 파일에 기록 후 교체하여
+    다른 프로세스가 읽는 도중에도 깨진 파일을 보지 않도록 합니다.
+    """
+
+    def __init__(self, root=BAR_STORE_DIR):
+        self.root = root
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, ticker, interval):
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+        return os.path.join(self.root, f"{safe_ticker}__{interval}.arrow")
+
+    def _lock(self, path):
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def load(self, ticker, interval):
+        """
+        저장된 이력과 커버리지 정보를 반환합니다.
+        Returns: (DataFrame, covered_from) - 없으면 (빈 DataFrame, None)
+        """
+        path = self._path(ticker, interval)
+        if not os.path.exists(path):
+            return pd.DataFrame(), None
+
+        try:
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+            meta = table.schema.metadata or {}
+            covered = meta.get(META_COVERED_FROM)
+            return table.to_pandas(), covered.decode() if covered else None
+        except Exception as e:
+            # 파일이 손상된 경우 저장소가 없는 것으로 간주하고 다시 수집합니다.
+            print(f"{ticker} 이력 파일 읽기 실패: {e}")
+            return pd.DataFrame(), None
+
+    def save(self, ticker, interval, df, covered_from):
+        """이력 전체를 원자적으로 기록합니다."""
+        path = self._path(ticker, interval)
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        meta = dict(table.schema.metadata or {})
+        meta[META_COVERED_FROM] = str(covered_from).encode()
+        table = table.replace_schema_metadata(meta)
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock(path):
+            # 메모리 매핑 읽기를 위해 압축 없이 저장합니다.
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+
+    def append(self, ticker, interval, stored, new_bars, covered_from):
+        """
+        새 봉을 기존 이력 뒤에 병합합니다. 같은 시각의 봉은 새 값으로 덮어씁니다.
+        (당일 봉처럼 아직 완성되지 않은 봉이 다시 수집되는 경우)
+        """
+        if stored.empty:
+            merged = new_bars
+        elif new_bars.empty:
+            merged = stored
+        else:
+            merged = pd.concat([stored, new_bars])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+
+        self.save(ticker, interval, merged, covered_from)
+        return merged
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_bar_store():
+    """프로세스 전역에서 공유하는 BarStore 인스턴스를 반환합니다."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = BarStore()
+        return _default_store
@@ -9,3 +9,13 @@ SK_NEW_TICKER_INPUT = "new_ticker_input"
 SK_LAST_SELECTED_TICKER = "_last_selected_ticker"
 SK_TARGET_BUY = "target_buy"
 SK_TARGET_SELL = "target_sell"
+SK_PRICE_SUBSCRIPTION = "price_subscription"
+SK_LAST_TICK = "last_price_tick"
+SK_SYNCED_RULE = "synced_auto_trade_rule"
+SK_AUTO_TRADE_TOGGLE = "auto_trade_toggle"  # + "_<ticker>": 종목별 자동 매매 토글
+SK_JOURNAL_SEARCH = "journal_search_query"
+SK_JOURNAL_SEARCH_PAGE = "journal_search_page"
+SK_JOURNAL_MONTH = "journal_calendar_month"
+SK_JOURNAL_CALENDAR_EVENT = "journal_calendar_event"
+SK_JOURNAL_PREFETCHED = "_journal_prefetched_month"
+SK_TRADE_LOG_PAGES = "trade_log_pages"
@@ -8,8 +8,11 @@ import requests
 import streamlit as st
 
 from modules.config import get_secret
+from modules.singleflight import single_flight
 
 DART_BASE_URL = "https://opendart.fss.or.kr/api"
+DISCLOSURE_LOOKBACK_DAYS = 90  # 공시 검색 기본 조회 기간 (일)
+DISCLOSURE_PAGE_COUNT = 50  # 공시 탭에 표시할 결과 수
 
 
 def _get_api_key():
@@ -56,6 +59,13 @@ def get_corp_code_map():
         return {}
 
 
+def default_disclosure_range():
+    """공시 검색 기본 기간 (bgn_de, end_de)을 YYYYMMDD 문자열로 반환합니다."""
+    now = datetime.now()
+    bgn_de = (now - timedelta(days=DISCLOSURE_LOOKBACK_DAYS)).strftime("%Y%m%d")
+    return bgn_de, now.strftime("%Y%m%d")
+
+
 def ticker_to_corp_code(ticker: str):
     """
     yfinance 티커("005930.KS") → DART corp_code 변환.
@@ -74,6 +84,7 @@ def ticker_to_corp_code(ticker: str):
     return None, None
 
 
+@single_flight(fresh_ttl=300)
 @st.cache_data(ttl=300)  # 5분 캐싱
 def search_disclosures(corp_code: str, bgn_de: str = None, end_de: str = None, page_count: int = 20):
     """
@@ -89,10 +100,11 @@ def search_disclosures(corp_code: str, bgn_de: str = None, end_de: str = None, p
     if not api_key:
         return []
 
+    default_bgn_de, default_end_de = default_disclosure_range()
     if not bgn_de:
-        bgn_de = (datetime.now() - timedelta(days=90)).strftime("%Y%m%d")
+        bgn_de = default_bgn_de
     if not end_de:
-        end_de = datetime.now().strftime("%Y%m%d")
+        end_de = default_end_de
 
     params = {
         "crtfc_key": api_key,
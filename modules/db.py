@@ -1,66 +1,101 @@
 # modules/db.py
-import psycopg
+import atexit
+import datetime
+import threading
+from zoneinfo import ZoneInfo
+
+from psycopg import sql
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import ConnectionPool
 
 from modules.config import get_secret
+from modules.migrations import migrate
+
+# 프로세스 전체가 공유하는 연결 풀 설정
+DB_POOL_MIN_SIZE = int(get_secret("DB_POOL_MIN_SIZE", 1))
+DB_POOL_MAX_SIZE = int(get_secret("DB_POOL_MAX_SIZE", 10))
+DB_POOL_TIMEOUT_SEC = 10  # 빈 연결을 기다리는 최대 시간
+DB_POOL_MAX_IDLE_SEC = 300  # 이 시간 이상 쉬는 연결은 닫음 (min_size 초과분)
+DB_CONNECT_TIMEOUT_SEC = 5
+
+_pool = None
+_pool_lock = threading.Lock()
+_schema_ready = False  # 이 프로세스에서 스키마 확인을 마쳤는지
+_schema_lock = threading.Lock()
+
+TRADES_TIMEZONE = "Asia/Seoul"  # trades 월 파티션 경계 기준 시간대
+TRADE_PARTITION_LOCK_ID = 20240602
+_trade_partitions = set()  # 이 프로세스에서 있음을 확인한 월 파티션 (각 달의 1일)
+_trade_partitions_lock = threading.Lock()
+
+
+def get_pool():
+    """연결 풀을 처음 사용할 때 한 번만 만듭니다."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                conninfo = make_conninfo(
+                    host=get_secret("PGHOST"),
+                    port=get_secret("PGPORT", "5432"),
+                    dbname=get_secret("PGDATABASE"),
+                    user=get_secret("PGUSER"),
+                    password=get_secret("PGPASSWORD"),
+                    connect_timeout=DB_CONNECT_TIMEOUT_SEC,
+                )
+                _pool = ConnectionPool(
+                    conninfo,
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=DB_POOL_MAX_SIZE,
+                    timeout=DB_POOL_TIMEOUT_SEC,
+                    max_idle=DB_POOL_MAX_IDLE_SEC,
+                    # 연결을 빌려주기 전에 살아 있는지 확인 (서버 재시작, 유휴 연결 끊김 대비)
+                    check=ConnectionPool.check_connection,
+                    name="stock-trading-app",
+                    open=True,
+                )
+                atexit.register(_pool.close)
+    return _pool
 
 
 def get_conn():
-    return psycopg.connect(
-        host=get_secret("PGHOST"),
-        port=get_secret("PGPORT", "5432"),
-        dbname=get_secret("PGDATABASE"),
-        user=get_secret("PGUSER"),
-        password=get_secret("PGPASSWORD"),
-        connect_timeout=5,
-    )
+    """
+    풀에서 연결을 빌려옵니다. with 블록이 끝나면 연결은 닫히지 않고 풀로 돌아갑니다.
+    (예외 없이 끝나면 커밋, 예외가 나면 롤백)
+    """
+    return get_pool().connection()
 
 
-def ensure_schema():
-    with get_conn() as conn, conn.cursor() as cur:
-        cur.execute(
-            """
-        CREATE TABLE IF NOT EXISTS watchlists (
-          user_id TEXT NOT NULL,
-          ticker TEXT NOT NULL,
-          created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
-          PRIMARY KEY (user_id, ticker)
-        );
-        CREATE INDEX IF NOT EXISTS idx_watchlists_user ON watchlists(user_id);
-        """
-        )
+def get_pool_stats() -> dict:
+    """
+    연결 풀 상태와 대기 지표.
+    pool_size/pool_available: 현재 연결 수/빈 연결 수, requests_waiting: 지금 기다리는 요청 수,
+    requests_num/requests_wait_ms: 누적 요청 수/누적 대기 시간, avg_wait_ms: 요청당 평균 대기 시간
+    """
+    stats = get_pool().get_stats()
+    requests = stats.get("requests_num", 0)
+    stats["avg_wait_ms"] = (
+        stats.get("requests_wait_ms", 0) / requests if requests else 0.0
+    )
+    return stats
 
-        # 기존 테이블에 stock_name 컬럼이 없으면 추가 (마이그레이션)
-        cur.execute(
-            """
-        DO $$
-        BEGIN
-            IF NOT EXISTS (
-                SELECT 1 
-                FROM information_schema.columns 
-                WHERE table_name='watchlists' AND column_name='stock_name'
-            ) THEN
-                ALTER TABLE watchlists ADD COLUMN stock_name TEXT;
-            END IF;
-        END
-        $$;
-        """
-        )
 
-        # 매매일지 테이블
-        # user_id와 journal_date를 복합키로 사용하여 유저별로 날짜당 1개의 일지만 존재하도록 함
-        cur.execute(
-            """
-        CREATE TABLE IF NOT EXISTS journals (
-          user_id TEXT NOT NULL,
-          journal_date DATE NOT NULL,
-          content TEXT,
-          updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
-          PRIMARY KEY (user_id, journal_date)
-        );
-        CREATE INDEX IF NOT EXISTS idx_journals_user_date ON journals(user_id, journal_date);
-        """
-        )
-        conn.commit()
+def ensure_schema():
+    """
+    스키마를 최신 버전으로 맞춥니다. (modules/migrations.py)
+    프로세스당 한 번만 DB를 확인하고, 이후 호출(Streamlit 재실행 등)은 바로 반환합니다.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        with get_conn() as conn:
+            applied = migrate(conn)
+        if applied:
+            print(f"DB 스키마 마이그레이션 적용: {applied}")
+        _schema_ready = True
 
 
 def load_watchlist(user_id: str) -> list[str]:
@@ -105,6 +140,51 @@ def remove_watchlist(user_id: str, ticker: str):
         conn.commit()
 
 
+def import_watchlist(user_id: str, rows) -> int:
+    """
+    관심 종목을 한 번에 등록합니다. rows: (ticker, stock_name) 목록
+    이미 등록된 종목은 이름만 갱신합니다. (이름이 None이면 기존 이름 유지)
+    INSERT 문을 파이프라인으로 묶어 보내므로 종목 수와 관계없이 서버 왕복은 한 번입니다.
+    Returns: 등록(갱신)한 종목 수
+    """
+    params = {}  # 같은 종목이 여러 번 있으면 마지막 값 사용
+    for ticker, stock_name in rows:
+        ticker = ticker.upper().strip()
+        if ticker:
+            params[ticker] = (user_id, ticker, stock_name)
+    if not params:
+        return 0
+
+    with get_conn() as conn, conn.cursor() as cur:
+        with conn.pipeline():
+            cur.executemany(
+                """
+              INSERT INTO watchlists(user_id, ticker, stock_name)
+              VALUES (%s, %s, %s)
+              ON CONFLICT (user_id, ticker) DO UPDATE
+                SET stock_name = COALESCE(EXCLUDED.stock_name, watchlists.stock_name);
+            """,
+                list(params.values()),
+            )
+        conn.commit()
+    return len(params)
+
+
+def export_watchlist_csv(user_id: str) -> str:
+    """관심 종목을 CSV(ticker,stock_name 헤더 포함) 문자열로 내보냅니다. (COPY TO STDOUT)"""
+    with get_conn() as conn, conn.cursor() as cur:
+        with cur.copy(
+            """
+            COPY (
+              SELECT ticker, stock_name FROM watchlists
+              WHERE user_id = %s ORDER BY ticker
+            ) TO STDOUT WITH (FORMAT CSV, HEADER)
+            """,
+            (user_id,),
+        ) as copy:
+            return b"".join(bytes(block) for block in copy).decode("utf-8")
+
+
 # 매매 일지 관련 함수
 def get_journal_dates(user_id: str) -> list:
     """
@@ -123,6 +203,27 @@ def get_journal_dates(user_id: str) -> list:
         return [row[0] for row in cur.fetchall()]
 
 
+def get_journal_calendar(user_id: str, start, end) -> list:
+    """
+    [start, end) 기간에 작성한 일지의 날짜, 글자 수, 수정 시각을 반환합니다. (달력 표시용)
+    본문은 읽지 않으며 커버링 인덱스(idx_journals_calendar)만으로 처리됩니다.
+    Returns: [{"journal_date", "content_length", "updated_at"}] (날짜 순)
+    """
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT journal_date, content_length, updated_at FROM journals
+            WHERE user_id=%s AND journal_date >= %s AND journal_date < %s
+            ORDER BY journal_date;
+        """,
+            (user_id, start, end),
+        )
+        return [
+            {"journal_date": row[0], "content_length": row[1], "updated_at": row[2]}
+            for row in cur.fetchall()
+        ]
+
+
 def save_journal(user_id: str, date, content: str):
     """
     매매 일지 저장 (Upsert: 있으면 업데이트, 없으면 삽입)
@@ -157,3 +258,324 @@ def load_journal(user_id: str, date) -> str:
         )
         result = cur.fetchone()
         return result[0] if result else ""
+
+
+JOURNAL_HEADLINE_OPTIONS = 'StartSel=**, StopSel=**, MaxWords=30, MinWords=10, MaxFragments=2, FragmentDelimiter=" … "'
+
+
+def search_journals(user_id: str, query: str, limit: int = 10, offset: int = 0) -> list:
+    """
+    매매 일지 전문 검색. 관련도(ts_rank) 순, 같으면 최근 날짜 순으로 반환합니다.
+    query는 웹 검색 문법을 따릅니다. ("문구 검색", 단어 OR 단어, -제외)
+    한국어 조사가 붙은 단어도 찾도록 각 검색어는 접두어 일치로 바꿉니다. (예: 삼성 → 삼성전자를)
+    Returns: [{"journal_date", "rank", "headline"}] - headline은 일치 부분을 **굵게** 표시한 발췌문
+    """
+    if not query or not query.strip():
+        return []
+    with get_conn() as conn, conn.cursor() as cur:
+        # 발췌문(ts_headline)은 원문을 다시 분석하므로 현재 페이지의 행에만 만듦
+        cur.execute(
+            """
+            WITH q AS (
+              SELECT regexp_replace(
+                websearch_to_tsquery('simple', %(query)s)::text,
+                '''((?:[^'']|'''')+)''', '''\\1'':*', 'g'
+              )::tsquery AS query
+            ),
+            page AS (
+              SELECT j.journal_date, j.content, ts_rank(j.content_tsv, q.query) AS rank
+              FROM journals j, q
+              WHERE j.user_id = %(user_id)s AND j.content_tsv @@ q.query
+              ORDER BY rank DESC, j.journal_date DESC
+              LIMIT %(limit)s OFFSET %(offset)s
+            )
+            SELECT page.journal_date, page.rank,
+                   ts_headline('simple', page.content, q.query, %(options)s)
+            FROM page, q
+            ORDER BY page.rank DESC, page.journal_date DESC;
+        """,
+            {
+                "query": query,
+                "user_id": user_id,
+                "limit": limit,
+                "offset": offset,
+                "options": JOURNAL_HEADLINE_OPTIONS,
+            },
+        )
+        return [
+            {"journal_date": row[0], "rank": row[1], "headline": row[2]}
+            for row in cur.fetchall()
+        ]
+
+
+# 자동 매매 규칙 관련 함수
+def upsert_trade_rule(
+    user_id: str,
+    ticker: str,
+    target_buy: float,
+    target_sell: float,
+    enabled: bool = True,
+    quantity: int = 1,
+):
+    """
+    자동 매매 규칙 저장 (있으면 목표가/활성화 여부만 갱신, 매수 상태는 유지)
+    """
+    ticker = ticker.upper().strip()
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+          INSERT INTO auto_trade_rules(user_id, ticker, target_buy, target_sell, quantity, enabled)
+          VALUES (%s, %s, %s, %s, %s, %s)
+          ON CONFLICT (user_id, ticker)
+          DO UPDATE SET
+            target_buy = EXCLUDED.target_buy,
+            target_sell = EXCLUDED.target_sell,
+            quantity = EXCLUDED.quantity,
+            enabled = EXCLUDED.enabled,
+            updated_at = now();
+        """,
+            (user_id, ticker, target_buy, target_sell, quantity, enabled),
+        )
+        conn.commit()
+
+
+def load_active_trade_rules() -> list:
+    """
+    활성화된 모든 사용자의 자동 매매 규칙을 반환합니다. (매매 서비스용)
+    """
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute("""
+            SELECT user_id, ticker, target_buy, target_sell, quantity, bought
+            FROM auto_trade_rules
+            WHERE enabled;
+        """)
+        return [
+            {
+                "user_id": r[0],
+                "ticker": r[1],
+                "target_buy": r[2],
+                "target_sell": r[3],
+                "quantity": r[4],
+                "bought": r[5],
+            }
+            for r in cur.fetchall()
+        ]
+
+
+def load_trade_rule(user_id: str, ticker: str):
+    """
+    특정 종목의 자동 매매 규칙과 서비스가 기록한 최근 상태를 반환합니다. (없으면 None)
+    """
+    ticker = ticker.upper().strip()
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT target_buy, target_sell, quantity, enabled, bought,
+                   last_price, last_action, last_message, updated_at
+            FROM auto_trade_rules
+            WHERE user_id=%s AND ticker=%s;
+        """,
+            (user_id, ticker),
+        )
+        r = cur.fetchone()
+        if not r:
+            return None
+        return {
+            "target_buy": r[0],
+            "target_sell": r[1],
+            "quantity": r[2],
+            "enabled": r[3],
+            "bought": r[4],
+            "last_price": r[5],
+            "last_action": r[6],
+            "last_message": r[7],
+            "updated_at": r[8],
+        }
+
+
+def save_trade_rule_states(states: list):
+    """
+    매매 서비스의 규칙별 상태를 한 트랜잭션으로 일괄 기록합니다.
+    states: [{"user_id", "ticker", "bought", "last_price", "last_action", "last_message"}, ...]
+    """
+    if not states:
+        return
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.executemany(
+            """
+            UPDATE auto_trade_rules
+            SET bought = %(bought)s,
+                last_price = %(last_price)s,
+                last_action = COALESCE(%(last_action)s, last_action),
+                last_message = COALESCE(%(last_message)s, last_message),
+                updated_at = now()
+            WHERE user_id = %(user_id)s AND ticker = %(ticker)s;
+        """,
+            states,
+        )
+        conn.commit()
+
+
+# 매매 체결 기록 관련 함수
+TRADE_COLUMNS = (
+    "user_id",
+    "executed_at",
+    "trade_id",
+    "ticker",
+    "side",
+    "quantity",
+    "price",
+    "source",
+)
+
+
+def _add_month(month):
+    return (month.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def ensure_trade_partitions(months):
+    """
+    trades 테이블의 월 파티션(months: 각 달의 1일)이 없으면 만듭니다.
+    이 프로세스에서 이미 확인한 달은 DB에 묻지 않습니다.
+    """
+    missing = sorted(set(months) - _trade_partitions)
+    if not missing:
+        return
+    with _trade_partitions_lock, get_conn() as conn, conn.cursor() as cur:
+        # 여러 프로세스가 같은 파티션을 동시에 만들지 않도록 잠금
+        cur.execute("SELECT pg_advisory_xact_lock(%s);", (TRADE_PARTITION_LOCK_ID,))
+        for month in missing:
+            cur.execute(
+                sql.SQL(
+                    "CREATE TABLE IF NOT EXISTS {} PARTITION OF trades "
+                    "FOR VALUES FROM ({}) TO ({});"
+                ).format(
+                    sql.Identifier(f"trades_y{month:%Y}m{month:%m}"),
+                    sql.Literal(f"{month} 00:00:00 {TRADES_TIMEZONE}"),
+                    sql.Literal(f"{_add_month(month)} 00:00:00 {TRADES_TIMEZONE}"),
+                )
+            )
+        conn.commit()
+        _trade_partitions.update(missing)
+
+
+def _trade_months(trades):
+    zone = ZoneInfo(TRADES_TIMEZONE)
+    return {t["executed_at"].astimezone(zone).date().replace(day=1) for t in trades}
+
+
+def insert_trades(trades: list) -> int:
+    """
+    체결 기록을 한 번에 저장합니다. 이미 있는 기록(같은 사용자/시각/주문번호)은 건너뜁니다.
+    trades: [{"user_id", "executed_at"(시간대 포함), "trade_id", "ticker", "side",
+              "quantity", "price", "source"}, ...]
+    """
+    if not trades:
+        return 0
+    ensure_trade_partitions(_trade_months(trades))
+    with get_conn() as conn, conn.cursor() as cur:
+        with conn.pipeline():
+            cur.executemany(
+                """
+                INSERT INTO trades(user_id, executed_at, trade_id, ticker, side, quantity, price, source)
+                VALUES (%(user_id)s, %(executed_at)s, %(trade_id)s, %(ticker)s, %(side)s,
+                        %(quantity)s, %(price)s, %(source)s)
+                ON CONFLICT DO NOTHING;
+            """,
+                trades,
+            )
+        conn.commit()
+    return len(trades)
+
+
+def find_trade_owners(trade_ids: list, start, end) -> dict:
+    """[start, end) 기간에 기록된 주문번호별 사용자. Returns: {trade_id: user_id}"""
+    if not trade_ids:
+        return {}
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT DISTINCT ON (trade_id) trade_id, user_id FROM trades
+            WHERE trade_id = ANY(%s) AND executed_at >= %s AND executed_at < %s;
+        """,
+            (trade_ids, start, end),
+        )
+        return dict(cur.fetchall())
+
+
+def replace_order_trades(trade_ids: list, trades: list, start, end) -> int:
+    """
+    증권사 체결 내역으로 [start, end) 기간의 주문 기록을 교체합니다. (한 트랜잭션)
+    trade_ids의 주문 시점 기록(source='order')을 지우고 실제 체결 기록(trades)을 저장합니다.
+    체결되지 않은 주문은 trade_ids에만 있고 trades에는 없으므로 기록에서 빠집니다.
+    """
+    ensure_trade_partitions(_trade_months(trades))
+    with get_conn() as conn, conn.cursor() as cur:
+        with conn.pipeline():
+            cur.execute(
+                """
+                DELETE FROM trades
+                WHERE source = 'order' AND trade_id = ANY(%s)
+                  AND executed_at >= %s AND executed_at < %s;
+            """,
+                (trade_ids, start, end),
+            )
+            if trades:
+                cur.executemany(
+                    """
+                    INSERT INTO trades(user_id, executed_at, trade_id, ticker, side, quantity, price, source)
+                    VALUES (%(user_id)s, %(executed_at)s, %(trade_id)s, %(ticker)s, %(side)s,
+                            %(quantity)s, %(price)s, %(source)s)
+                    ON CONFLICT (user_id, executed_at, trade_id) DO UPDATE
+                      SET quantity = EXCLUDED.quantity,
+                          price = EXCLUDED.price,
+                          source = EXCLUDED.source;
+                """,
+                    trades,
+                )
+        conn.commit()
+    return len(trades)
+
+
+def load_trades(
+    user_id: str, ticker: str = None, limit: int = 50, before: tuple = None
+) -> tuple:
+    """
+    체결 기록을 최근 순으로 한 페이지 읽습니다. (키셋 페이지네이션)
+    before: 이전 페이지가 돌려준 커서 (executed_at, trade_id) - 이보다 오래된 기록부터 읽음
+    Returns: (기록 리스트, 다음 페이지 커서 또는 None)
+    """
+    conditions = ["user_id = %s"]
+    params = [user_id]
+    if ticker:
+        conditions.append("ticker = %s")
+        params.append(ticker)
+    if before:
+        conditions.append("(executed_at, trade_id) < (%s, %s)")
+        params.extend(before)
+    query = sql.SQL(
+        "SELECT {} FROM trades WHERE {} "
+        "ORDER BY executed_at DESC, trade_id DESC LIMIT %s;"
+    ).format(
+        sql.SQL(", ").join(map(sql.Identifier, TRADE_COLUMNS)),
+        sql.SQL(" AND ").join(map(sql.SQL, conditions)),
+    )
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute(query, params + [limit + 1])
+        rows = [dict(zip(TRADE_COLUMNS, row)) for row in cur.fetchall()]
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, (rows[-1]["executed_at"], rows[-1]["trade_id"])
+    return rows, None
+
+
+def load_trades_between(user_id: str, start, end) -> list:
+    """[start, end) 기간의 체결 기록 (시간 순). 해당 월 파티션만 읽습니다."""
+    query = sql.SQL(
+        "SELECT {} FROM trades WHERE user_id = %s "
+        "AND executed_at >= %s AND executed_at < %s "
+        "ORDER BY executed_at, trade_id;"
+    ).format(sql.SQL(", ").join(map(sql.Identifier, TRADE_COLUMNS)))
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute(query, (user_id, start, end))
+        return [dict(zip(TRADE_COLUMNS, row)) for row in cur.fetchall()]
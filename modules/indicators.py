@@ -0,0 +1,249 @@
+# modules/indicators.py
+import math
+from collections import deque
+
+
+class EMA:
+    """
+    지수이동평균. pandas의 ewm(span=span, adjust=False).mean()과 같은 값을 냅니다.
+    """
+
+    def __init__(self, span):
+        self.alpha = 2 / (span + 1)
+        self.value = None
+
+    def _next(self, x):
+        return x if self.value is None else self.value + self.alpha * (x - self.value)
+
+    def update(self, x):
+        self.value = self._next(x)
+        return self.value
+
+    def peek(self, x):
+        """x가 다음 값일 때의 결과. 상태는 바꾸지 않습니다. (형성 중인 봉용)"""
+        return self._next(x)
+
+
+class RSI:
+    """
+    Wilder 방식 RSI. 평균 상승/하락폭을 ewm(alpha=1/period, adjust=False)로 평활합니다.
+    """
+
+    def __init__(self, period=14):
+        self.alpha = 1 / period
+        self.prev = None
+        self.avg_gain = None
+        self.avg_loss = None
+        self.value = None
+
+    def _next(self, close):
+        """Returns: (avg_gain, avg_loss, value)"""
+        if self.prev is None:
+            return None, None, None
+
+        delta = close - self.prev
+        gain = max(delta, 0.0)
+        loss = max(-delta, 0.0)
+
+        if self.avg_gain is None:
+            avg_gain, avg_loss = gain, loss
+        else:
+            avg_gain = self.avg_gain + self.alpha * (gain - self.avg_gain)
+            avg_loss = self.avg_loss + self.alpha * (loss - self.avg_loss)
+
+        if avg_loss == 0:
+            value = 100.0 if avg_gain > 0 else None
+        else:
+            value = 100 - 100 / (1 + avg_gain / avg_loss)
+        return avg_gain, avg_loss, value
+
+    def update(self, close):
+        self.avg_gain, self.avg_loss, self.value = self._next(close)
+        self.prev = close
+        return self.value
+
+    def peek(self, close):
+        return self._next(close)[2]
+
+
+class MACD:
+    """MACD 선, 시그널 선, 히스토그램"""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.value = None  # (macd, signal, histogram)
+
+    def update(self, close):
+        macd = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(macd)
+        self.value = (macd, signal, macd - signal)
+        return self.value
+
+    def peek(self, close):
+        macd = self.fast.peek(close) - self.slow.peek(close)
+        signal = self.signal.peek(macd)
+        return (macd, signal, macd - signal)
+
+
+class Bollinger:
+    """
+    볼린저 밴드. 최근 window개 값의 합과 제곱합을 유지하여 O(1)로 갱신합니다.
+    표준편차는 pandas rolling().std()와 같은 표본 표준편차(ddof=1)입니다.
+    """
+
+    def __init__(self, window=20, k=2.0):
+        self.window = window
+        self.k = k
+        self.values = deque()
+        self.shift = None  # 수치 오차를 줄이기 위해 첫 값 기준으로 합계를 누적
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.value = None  # (middle, upper, lower)
+
+    def update(self, close):
+        if self.shift is None:
+            self.shift = close
+        x = close - self.shift
+        self.values.append(x)
+        self.total += x
+        self.total_sq += x * x
+
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+
+        n = len(self.values)
+        if n < self.window:
+            return None
+        self.value = self._bands(self.total, self.total_sq, n, self.shift)
+        return self.value
+
+    def peek(self, close):
+        shift = close if self.shift is None else self.shift
+        x = close - shift
+        total, total_sq, n = self.total + x, self.total_sq + x * x, len(self.values) + 1
+        if n > self.window:
+            old = self.values[0]
+            total -= old
+            total_sq -= old * old
+            n -= 1
+        if n < self.window:
+            return None
+        return self._bands(total, total_sq, n, shift)
+
+    def _bands(self, total, total_sq, n, shift):
+        mean = total / n
+        var = max((total_sq - n * mean * mean) / (n - 1), 0.0)
+        std = math.sqrt(var)
+        middle = mean + shift
+        return (middle, middle + self.k * std, middle - self.k * std)
+
+
+class VWAP:
+    """
+    거래량 가중 평균가. 대표가 (고가+저가+종가)/3 기준이며,
+    봉 시각(ts)을 넘기면 날짜가 바뀔 때 누적값을 초기화합니다. (일중 VWAP)
+    """
+
+    def __init__(self, reset_daily=True):
+        self.reset_daily = reset_daily
+        self.session = None
+        self.pv = 0.0
+        self.volume = 0.0
+        self.value = None
+
+    def _next(self, high, low, close, volume, ts):
+        """Returns: (session, pv, volume, value)"""
+        session, pv, total = self.session, self.pv, self.volume
+        if self.reset_daily and ts is not None and ts.date() != session:
+            session, pv, total = ts.date(), 0.0, 0.0
+
+        pv += (high + low + close) / 3 * volume
+        total += volume
+        value = pv / total if total > 0 else self.value
+        return session, pv, total, value
+
+    def update(self, high, low, close, volume, ts=None):
+        self.session, self.pv, self.volume, self.value = self._next(
+            high, low, close, volume, ts
+        )
+        return self.value
+
+    def peek(self, high, low, close, volume, ts=None):
+        return self._next(high, low, close, volume, ts)[3]
+
+
+class IndicatorSet:
+    """
+    EMA, RSI, MACD, 볼린저 밴드, VWAP을 함께 유지하는 묶음.
+    저장된 이력(fetch_stock_history / BarStore의 OHLCV DataFrame)으로 한 번 워밍업한 뒤,
+    틱마다 update_tick으로 형성 중인 봉을 반영하고, 봉이 마감되면 close_bar로 확정합니다. (모두 O(1))
+    """
+
+    def __init__(self, ema_span=20, rsi_period=14, bb_window=20, bb_k=2.0):
+        self.ema = EMA(ema_span)
+        self.rsi = RSI(rsi_period)
+        self.macd = MACD()
+        self.bollinger = Bollinger(bb_window, bb_k)
+        self.vwap = VWAP()
+
+    @classmethod
+    def from_history(cls, df, **kwargs):
+        indicators = cls(**kwargs)
+        indicators.warm(df)
+        return indicators
+
+    def warm(self, df):
+        """OHLCV DataFrame의 모든 봉을 순서대로 반영합니다."""
+        for ts, high, low, close, volume in zip(
+            df.index, df["High"], df["Low"], df["Close"], df["Volume"]
+        ):
+            self.close_bar(high, low, close, volume, ts)
+        return self
+
+    def update_tick(self, high, low, close, volume, ts=None):
+        """
+        형성 중인 봉의 현재까지 값(봉 고가/저가, 현재가, 봉 누적 거래량)으로 지표를 계산합니다.
+        확정된 상태는 바꾸지 않으므로 같은 봉의 틱마다 반복해서 호출해도 됩니다.
+        Returns: snapshot()과 같은 형식의 dict (형성 중인 봉 포함)
+        """
+        macd = self.macd.peek(close)
+        bollinger = self.bollinger.peek(close) or (None, None, None)
+        return {
+            "ema": self.ema.peek(close),
+            "rsi": self.rsi.peek(close),
+            "macd": macd[0],
+            "macd_signal": macd[1],
+            "macd_hist": macd[2],
+            "bb_middle": bollinger[0],
+            "bb_upper": bollinger[1],
+            "bb_lower": bollinger[2],
+            "vwap": self.vwap.peek(high, low, close, volume, ts),
+        }
+
+    def close_bar(self, high, low, close, volume, ts=None):
+        """마감된 봉을 반영하여 다음 봉으로 넘어갑니다. Returns: snapshot()"""
+        self.ema.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.bollinger.update(close)
+        self.vwap.update(high, low, close, volume, ts)
+        return self.snapshot()
+
+    def snapshot(self):
+        macd = self.macd.value or (None, None, None)
+        bollinger = self.bollinger.value or (None, None, None)
+        return {
+            "ema": self.ema.value,
+            "rsi": self.rsi.value,
+            "macd": macd[0],
+            "macd_signal": macd[1],
+            "macd_hist": macd[2],
+            "bb_middle": bollinger[0],
+            "bb_upper": bollinger[1],
+            "bb_lower": bollinger[2],
+            "vwap": self.vwap.value,
+        }
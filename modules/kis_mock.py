@@ -0,0 +1,415 @@
+# modules/kis_mock.py
+# 네트워크 없이 KisTrader를 시험/벤치마크하기 위한 로컬 KIS REST 모의 서버.
+# 이 앱이 사용하는 /oauth2/tokenP, inquire-balance, order-cash, inquire-daily-ccld만 흉내 냅니다.
+#
+# 단독 실행: python -m modules.kis_mock --port 8088 --latency-ms 30 --rate-limit 20
+# 앱에서 사용: secrets(.env)에 KIS_BASE_URL=http://127.0.0.1:8088
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from zoneinfo import ZoneInfo
+
+TOKEN_PATH = "/oauth2/tokenP"
+BALANCE_PATH = "/uapi/domestic-stock/v1/trading/inquire-balance"
+ORDER_PATH = "/uapi/domestic-stock/v1/trading/order-cash"
+EXECUTION_PATH = "/uapi/domestic-stock/v1/trading/inquire-daily-ccld"
+
+BALANCE_TR_IDS = ("VTTC8434R", "TTTC8434R")
+EXECUTION_TR_IDS = ("VTTC8001R", "TTTC8001R")
+ORDER_TR_IDS = {
+    "VTTC0802U": "buy",
+    "VTTC0801U": "sell",
+    "TTTC0802U": "buy",
+    "TTTC0801U": "sell",
+}
+BALANCE_PAGE_SIZE = 20  # 모의투자 잔고 조회 1페이지 종목 수
+EXECUTION_PAGE_SIZE = 20  # 체결 내역 조회 1페이지 주문 수
+KST = ZoneInfo("Asia/Seoul")  # 주문/체결 일시는 실제 서버처럼 한국 시간 기준
+MOCK_PRICE = 10_000  # 모의 서버의 모든 종목 현재가/매입가 (시장가 주문 체결가)
+MOCK_TOKEN = "mock-access-token"
+MOCK_DEPOSIT = 100_000_000
+
+
+class MockKisState:
+    """모의 계좌 상태 (보유 종목, 예수금, 주문 번호)와 서버 동작 설정"""
+
+    def __init__(
+        self,
+        latency_ms=0.0,
+        jitter_ms=0.0,
+        error_rate=0.0,
+        rate_limit=None,
+        holdings=None,
+        seed=None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit  # 초당 허용 호출 수 (None이면 제한 없음)
+        self.rng = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.calls = deque()  # 최근 1초간 호출 시각 (호출 한도 확인용)
+        self.holdings = dict(holdings or {})  # 종목코드 -> 수량
+        self.deposit = MOCK_DEPOSIT
+        self.order_no = 0
+        self.executions = []  # 체결된 주문 (모든 주문은 즉시 전량 체결)
+        self.stats = {
+            "token": 0,
+            "balance": 0,
+            "order": 0,
+            "executions": 0,
+            "throttled": 0,
+            "errors": 0,
+        }
+
+    def admit(self):
+        """
+        호출 1건을 받아들일지 결정합니다.
+        Returns: None(정상) | "throttled"(초당 한도 초과) | "error"(무작위 오류)
+        """
+        with self.lock:
+            if self.rate_limit:
+                now = time.monotonic()
+                while self.calls and now - self.calls[0] >= 1.0:
+                    self.calls.popleft()
+                if len(self.calls) >= self.rate_limit:
+                    self.stats["throttled"] += 1
+                    return "throttled"
+                self.calls.append(now)
+            if self.error_rate and self.rng.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return "error"
+        return None
+
+    def delay(self):
+        with self.lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+        seconds = max(0.0, self.latency_ms + jitter) / 1000
+        if seconds:
+            time.sleep(seconds)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 연결 재사용
+    disable_nagle_algorithm = (
+        True  # 헤더/본문을 나눠 보낼 때 Nagle 지연(~40ms)이 섞이지 않도록
+    )
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json; charset=utf-8")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw or b"{}")
+        except ValueError:
+            return {}
+
+    def _fail(self, status, msg_cd, msg1):
+        self._send(status, {"rt_cd": "1", "msg_cd": msg_cd, "msg1": msg1})
+
+    def _check(self, tr_ids):
+        """공통 검사: 지연, 호출 한도, 무작위 오류, 토큰, TR ID. 실패 응답을 보냈으면 False"""
+        self.state.delay()
+        verdict = self.state.admit()
+        if verdict == "throttled":
+            self._fail(500, "EGW00201", "초당 거래건수를 초과하였습니다.")
+            return False
+        if verdict == "error":
+            self._fail(500, "EGW00500", "모의 서버 오류")
+            return False
+        if self.headers.get("authorization") != f"Bearer {MOCK_TOKEN}":
+            self._fail(500, "EGW00123", "기간이 만료된 token 입니다.")
+            return False
+        if self.headers.get("tr_id") not in tr_ids:
+            self._fail(500, "EGW00203", "TR ID가 올바르지 않습니다.")
+            return False
+        return True
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        body = self._read_json()
+        if path == TOKEN_PATH:
+            self._token(body)
+        elif path == ORDER_PATH:
+            self._order(body)
+        else:
+            self._fail(404, "EGW00404", "없는 API 입니다.")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == BALANCE_PATH:
+            self._balance(parse_qs(url.query, keep_blank_values=True))
+        elif url.path == EXECUTION_PATH:
+            self._executions(parse_qs(url.query, keep_blank_values=True))
+        else:
+            self._fail(404, "EGW00404", "없는 API 입니다.")
+
+    def _token(self, body):
+        self.state.delay()
+        if not body.get("appkey") or not body.get("appsecret"):
+            self._send(
+                403,
+                {
+                    "error_code": "EGW00103",
+                    "error_description": "유효하지 않은 AppKey입니다.",
+                },
+            )
+            return
+        with self.state.lock:
+            self.state.stats["token"] += 1
+        self._send(
+            200,
+            {
+                "access_token": MOCK_TOKEN,
+                "token_type": "Bearer",
+                "expires_in": 86400,
+                "access_token_token_expired": datetime.now().strftime(
+                    "%Y-%m-%d %H:%M:%S"
+                ),
+            },
+        )
+
+    def _order(self, body):
+        order_type = ORDER_TR_IDS.get(self.headers.get("tr_id"))
+        if not self._check(ORDER_TR_IDS):
+            return
+        ticker = body.get("PDNO", "")
+        try:
+            quantity = int(body.get("ORD_QTY", 0))
+            price = float(body.get("ORD_UNPR", 0))
+        except ValueError:
+            quantity, price = 0, 0.0
+        if len(ticker) != 6 or quantity <= 0:
+            self._fail(200, "APBK0919", "주문 입력값이 올바르지 않습니다.")
+            return
+
+        state = self.state
+        with state.lock:
+            held = state.holdings.get(ticker, 0)
+            if order_type == "sell" and held < quantity:
+                fail = ("APBK0400", "주문 가능한 수량을 초과하였습니다.")
+            else:
+                fail = None
+                state.holdings[ticker] = held + (
+                    quantity if order_type == "buy" else -quantity
+                )
+                if not state.holdings[ticker]:
+                    del state.holdings[ticker]
+                state.deposit -= int(price * quantity) * (
+                    1 if order_type == "buy" else -1
+                )
+                state.order_no += 1
+                order_no = f"{state.order_no:010d}"
+                state.stats["order"] += 1
+                now = datetime.now(KST)
+                fill_price = price or MOCK_PRICE
+                state.executions.append(
+                    {
+                        "ord_dt": now.strftime("%Y%m%d"),
+                        "ord_tmd": now.strftime("%H%M%S"),
+                        "odno": order_no,
+                        "pdno": ticker,
+                        "prdt_name": f"모의종목{ticker}",
+                        "sll_buy_dvsn_cd": "02" if order_type == "buy" else "01",
+                        "ord_qty": str(quantity),
+                        "tot_ccld_qty": str(quantity),
+                        "avg_prvs": f"{fill_price:.4f}",
+                        "tot_ccld_amt": str(int(fill_price * quantity)),
+                    }
+                )
+        if fail:
+            self._fail(200, *fail)
+            return
+        self._send(
+            200,
+            {
+                "rt_cd": "0",
+                "msg_cd": "APBK0013",
+                "msg1": "주문 전송 완료 되었습니다.",
+                "output": {
+                    "KRX_FWDG_ORD_ORGNO": "00950",
+                    "ODNO": order_no,
+                    "ORD_TMD": datetime.now().strftime("%H%M%S"),
+                },
+            },
+        )
+
+    def _balance(self, params):
+        if not self._check(BALANCE_TR_IDS):
+            return
+        offset_text = (params.get("CTX_AREA_NK100") or [""])[0].strip()
+        offset = int(offset_text) if offset_text.isdigit() else 0
+
+        state = self.state
+        with state.lock:
+            state.stats["balance"] += 1
+            items = sorted(state.holdings.items())
+            deposit = state.deposit
+        page = items[offset : offset + BALANCE_PAGE_SIZE]
+        has_next = offset + BALANCE_PAGE_SIZE < len(items)
+
+        price = MOCK_PRICE
+        output1 = [
+            {
+                "pdno": ticker,
+                "prdt_name": f"모의종목{ticker}",
+                "hldg_qty": str(qty),
+                "pchs_avg_pric": f"{price:.4f}",
+                "prpr": str(price),
+                "evlu_amt": str(price * qty),
+                "evlu_pfls_amt": "0",
+                "evlu_pfls_rt": "0.00",
+            }
+            for ticker, qty in page
+        ]
+        stock_value = sum(qty for _, qty in items) * price
+        output2 = [
+            {
+                "dnca_tot_amt": str(deposit),
+                "tot_evlu_amt": str(deposit + stock_value),
+                "evlu_pfls_smtl_amt": "0",
+                "evlu_pfls_rt": "0.00",
+            }
+        ]
+        self._send(
+            200,
+            {
+                "rt_cd": "0",
+                "msg_cd": "KIOK0510",
+                "msg1": "조회가 완료되었습니다",
+                "ctx_area_fk100": "MOCK",
+                "ctx_area_nk100": str(offset + BALANCE_PAGE_SIZE) if has_next else "",
+                "output1": output1,
+                "output2": output2,
+            },
+            headers={"tr_cont": "M" if has_next else "D"},
+        )
+
+    def _executions(self, params):
+        if not self._check(EXECUTION_TR_IDS):
+            return
+        start = (params.get("INQR_STRT_DT") or [""])[0]
+        end = (params.get("INQR_END_DT") or [""])[0]
+        offset_text = (params.get("CTX_AREA_NK100") or [""])[0].strip()
+        offset = int(offset_text) if offset_text.isdigit() else 0
+
+        state = self.state
+        with state.lock:
+            state.stats["executions"] += 1
+            # INQR_DVSN 00: 최근 주문부터
+            items = [
+                dict(e)
+                for e in reversed(state.executions)
+                if start <= e["ord_dt"] <= end
+            ]
+        page = items[offset : offset + EXECUTION_PAGE_SIZE]
+        has_next = offset + EXECUTION_PAGE_SIZE < len(items)
+        self._send(
+            200,
+            {
+                "rt_cd": "0",
+                "msg_cd": "KIOK0510",
+                "msg1": "조회가 완료되었습니다",
+                "ctx_area_fk100": "MOCK",
+                "ctx_area_nk100": (
+                    str(offset + EXECUTION_PAGE_SIZE) if has_next else ""
+                ),
+                "output1": page,
+                "output2": {"tot_ord_qty": str(len(items))},
+            },
+            headers={"tr_cont": "M" if has_next else "D"},
+        )
+
+
+class MockKisServer:
+    """
+    백그라운드 스레드에서 동작하는 KIS 모의 서버.
+
+    with MockKisServer(latency_ms=20, rate_limit=20) as server:
+        os.environ["KIS_BASE_URL"] = server.url
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, **state_options):
+        self.state = MockKisState(**state_options)
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = self.state
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name="kis-mock", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 KIS REST 모의 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--rate-limit", type=float, default=None, help="초당 허용 호출 수"
+    )
+    args = parser.parse_args()
+
+    server = MockKisServer(
+        args.host,
+        args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+    )
+    print(f"🧪 KIS 모의 서버 실행 중: {server.url} (Ctrl+C로 종료)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# modules/loader.py
+import threading
+import time
+
+import pandas as pd
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+
+from modules.dart import (
+    DISCLOSURE_PAGE_COUNT,
+    default_disclosure_range,
+    search_disclosures,
+    ticker_to_corp_code,
+)
+from modules.scraper import StockScraper, fetch_stock_history, fetch_stock_info
+
+ANALYSIS_LOAD_TIMEOUT_SEC = 15  # 종목 분석 탭 데이터 전체를 기다리는 최대 시간
+
+
+def _fetch_news(ticker):
+    # 뉴스는 캐싱 미적용 (최신성 유지)
+    return StockScraper(ticker).get_news()
+
+
+def _prefetch_disclosures(ticker):
+    """
+    공시 탭의 기본 조회 기간으로 공시를 미리 가져옵니다.
+    search_disclosures는 캐싱되므로 이후 공시 탭 렌더링은 캐시에서 바로 응답합니다.
+    """
+    corp_code, _ = ticker_to_corp_code(ticker)
+    if not corp_code:
+        return []
+    bgn_de, end_de = default_disclosure_range()
+    return search_disclosures(corp_code, bgn_de, end_de, page_count=DISCLOSURE_PAGE_COUNT)
+
+
+def load_analysis_data(ticker, period, timeout=ANALYSIS_LOAD_TIMEOUT_SEC):
+    """
+    종목 분석 탭에 필요한 주가 이력, 기본 정보, 뉴스, 공시를 동시에 요청하고
+    하나의 마감 시간 안에 모아서 반환합니다.
+    마감 시간 안에 끝나지 않았거나 실패한 항목은 기본값(빈 데이터)으로 채워집니다.
+
+    Returns: dict - {"history": DataFrame, "info": dict|None, "news": list, "disclosures": list}
+    """
+    tasks = {
+        "history": lambda: fetch_stock_history(ticker, period),
+        "info": lambda: fetch_stock_info(ticker),
+        "news": lambda: _fetch_news(ticker),
+        "disclosures": lambda: _prefetch_disclosures(ticker),
+    }
+    results = {
+        "history": pd.DataFrame(),
+        "info": None,
+        "news": [],
+        "disclosures": [],
+    }
+
+    def run(name, fn):
+        try:
+            results[name] = fn()
+        except Exception as e:
+            print(f"{ticker} {name} 로딩 중 오류: {e}")
+
+    threads = []
+    for name, fn in tasks.items():
+        thread = threading.Thread(
+            target=run, args=(name, fn), name=f"load-{name}", daemon=True
+        )
+        # 작업 스레드에서도 st.error 등이 현재 세션에 표시되도록 컨텍스트를 연결
+        add_script_run_ctx(thread)
+        thread.start()
+        threads.append(thread)
+
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+        if thread.is_alive():
+            print(f"{ticker} {thread.name} 시간 초과 ({timeout}초)")
+
+    # 마감 이후에 끝난 작업이 결과를 바꾸지 않도록 복사본을 반환
+    return dict(results)
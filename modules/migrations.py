@@ -0,0 +1,155 @@
+# modules/migrations.py
+# DB 스키마 변경 이력. 새 변경은 항상 목록 끝에 다음 버전 번호로 추가하고,
+# 이미 배포된 단계의 SQL은 수정하지 않습니다. (적용 여부는 schema_version 테이블로 관리)
+#
+# 1~4단계는 예전 ensure_schema가 매번 실행하던 DDL과 같아서, 이미 테이블이 있는 DB에서도
+# IF NOT EXISTS 덕분에 그대로 적용(기록)만 됩니다.
+
+MIGRATION_LOCK_ID = (
+    20240601  # 여러 프로세스가 동시에 마이그레이션하지 않도록 잡는 advisory lock 번호
+)
+
+MIGRATIONS = [
+    (
+        1,
+        "관심 종목 테이블",
+        """
+        CREATE TABLE IF NOT EXISTS watchlists (
+          user_id TEXT NOT NULL,
+          ticker TEXT NOT NULL,
+          created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+          PRIMARY KEY (user_id, ticker)
+        );
+        CREATE INDEX IF NOT EXISTS idx_watchlists_user ON watchlists(user_id);
+        """,
+    ),
+    (
+        2,
+        "관심 종목 이름 컬럼",
+        """
+        ALTER TABLE watchlists ADD COLUMN IF NOT EXISTS stock_name TEXT;
+        """,
+    ),
+    (
+        3,
+        "매매 일지 테이블 (유저별 날짜당 1개)",
+        """
+        CREATE TABLE IF NOT EXISTS journals (
+          user_id TEXT NOT NULL,
+          journal_date DATE NOT NULL,
+          content TEXT,
+          updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+          PRIMARY KEY (user_id, journal_date)
+        );
+        CREATE INDEX IF NOT EXISTS idx_journals_user_date ON journals(user_id, journal_date);
+        """,
+    ),
+    (
+        4,
+        "자동 매매 규칙 테이블",
+        """
+        CREATE TABLE IF NOT EXISTS auto_trade_rules (
+          user_id TEXT NOT NULL,
+          ticker TEXT NOT NULL,
+          target_buy DOUBLE PRECISION NOT NULL DEFAULT 0,
+          target_sell DOUBLE PRECISION NOT NULL DEFAULT 0,
+          quantity INTEGER NOT NULL DEFAULT 1,
+          enabled BOOLEAN NOT NULL DEFAULT TRUE,
+          bought BOOLEAN NOT NULL DEFAULT FALSE,
+          last_price DOUBLE PRECISION,
+          last_action TEXT,
+          last_message TEXT,
+          updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+          PRIMARY KEY (user_id, ticker)
+        );
+        CREATE INDEX IF NOT EXISTS idx_auto_trade_rules_enabled
+          ON auto_trade_rules(enabled) WHERE enabled;
+        """,
+    ),
+    (
+        5,
+        "매매 일지 전문 검색 (tsvector + GIN)",
+        # 'simple' 사전: 한국어 형태소 분석 없이 공백 단위로 나눔 (검색 시 접두어 일치로 보완)
+        """
+        ALTER TABLE journals ADD COLUMN IF NOT EXISTS content_tsv tsvector
+          GENERATED ALWAYS AS (to_tsvector('simple', coalesce(content, ''))) STORED;
+        CREATE INDEX IF NOT EXISTS idx_journals_content_tsv
+          ON journals USING GIN (content_tsv);
+        """,
+    ),
+    (
+        6,
+        "매매 일지 달력 조회용 커버링 인덱스",
+        # 달력은 본문 대신 글자 수만 필요하므로 인덱스에 포함시켜 테이블을 읽지 않게 함.
+        # 기존 (user_id, journal_date) 인덱스는 PK와 새 인덱스가 대신하므로 삭제
+        """
+        ALTER TABLE journals ADD COLUMN IF NOT EXISTS content_length INTEGER
+          GENERATED ALWAYS AS (char_length(coalesce(content, ''))) STORED;
+        CREATE INDEX IF NOT EXISTS idx_journals_calendar
+          ON journals(user_id, journal_date) INCLUDE (content_length, updated_at);
+        DROP INDEX IF EXISTS idx_journals_user_date;
+        """,
+    ),
+    (
+        7,
+        "매매 체결 기록 테이블 (월별 파티션)",
+        # 월 파티션(trades_yYYYYmMM)은 기록할 때 필요한 달만 만듭니다. (db.ensure_trade_partitions)
+        # 파티션 테이블의 PK에는 파티션 키(executed_at)가 포함되어야 함
+        """
+        CREATE TABLE IF NOT EXISTS trades (
+          user_id TEXT NOT NULL,
+          executed_at TIMESTAMPTZ NOT NULL,
+          trade_id TEXT NOT NULL,
+          ticker TEXT NOT NULL,
+          side TEXT NOT NULL,
+          quantity INTEGER NOT NULL,
+          price DOUBLE PRECISION NOT NULL DEFAULT 0,
+          source TEXT NOT NULL,
+          created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+          PRIMARY KEY (user_id, executed_at, trade_id)
+        ) PARTITION BY RANGE (executed_at);
+        CREATE INDEX IF NOT EXISTS idx_trades_user_ticker_time
+          ON trades(user_id, ticker, executed_at DESC, trade_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_trades_trade_id ON trades(trade_id);
+        """,
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(cur) -> int:
+    cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version;")
+    return cur.fetchone()[0]
+
+
+def migrate(conn) -> list:
+    """
+    아직 적용되지 않은 단계를 순서대로 적용합니다. 한 트랜잭션으로 실행되므로
+    중간에 실패하면 전체가 롤백됩니다.
+    Returns: 이번에 적용한 버전 번호 리스트
+    """
+    applied = []
+    with conn.cursor() as cur:
+        # 다른 프로세스가 먼저 적용 중이면 끝날 때까지 기다립니다. (schema_version 생성도 잠금 안에서)
+        # 프로세스당 한 번만 실행되므로(db.ensure_schema) 최신 버전이어도 잠금을 먼저 잡습니다.
+        cur.execute("SELECT pg_advisory_xact_lock(%s);", (MIGRATION_LOCK_ID,))
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+              version INTEGER PRIMARY KEY,
+              description TEXT NOT NULL,
+              applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+            """)
+        version = current_version(cur)
+        for step, description, sql in MIGRATIONS:
+            if step <= version:
+                continue
+            cur.execute(sql)
+            cur.execute(
+                "INSERT INTO schema_version(version, description) VALUES (%s, %s);",
+                (step, description),
+            )
+            applied.append(step)
+    conn.commit()
+    return applied
@@ -0,0 +1,302 @@
+# modules/order_journal.py
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from modules.config import get_secret
+
+ORDER_JOURNAL_DIR = get_secret("ORDER_JOURNAL_DIR", ".order_journal")
+JOURNAL_LOG_FILE = "orders.log"
+JOURNAL_SNAPSHOT_FILE = "positions.snapshot.json"
+# 그룹 커밋 주기: 이 시간 동안 모인 기록을 한 번의 fsync로 디스크에 반영
+JOURNAL_FSYNC_SEC = 0.05
+JOURNAL_COMPACT_RECORDS = 10_000  # 로그에 이만큼 쌓이면 스냅샷으로 압축
+
+
+class OrderJournalError(Exception):
+    """기록을 디스크에 반영하지 못함 (디스크 가득 참 등). 이후 기록은 보장되지 않음"""
+
+
+class OrderJournal:
+    """
+    주문/보유 수량 선행 기록(WAL).
+    - 기록은 한 줄(JSON)씩 로그 파일 끝에 추가하고, 모인 기록은 주기적으로 한 번에 fsync
+    - 시작 시 스냅샷 + 그 이후 로그만 다시 읽어 (사용자, 종목)별 보유 수량을 복원
+    - 로그가 길어지면 현재 상태를 스냅샷으로 저장하고 로그를 비움
+
+    선행 기록 순서: intent() → flush(seq) → 주문 전송 → resolve(seq, 결과)
+    결과를 기록하지 못한 채 중단된 주문 의도는 복원 후에도 미해결로 남으며, 보유 수량에는
+    그 주문이 접수된 것으로 반영됩니다. (중복 매수 방지. 실제 결과는 잔고 보정(set_position)으로 맞춤)
+
+    종목은 규칙과 같은 yfinance 심볼(예: 005930.KS)로 기록합니다.
+    """
+
+    def __init__(self, directory=ORDER_JOURNAL_DIR, fsync_sec=JOURNAL_FSYNC_SEC):
+        self.directory = directory
+        self.log_path = os.path.join(directory, JOURNAL_LOG_FILE)
+        self.snapshot_path = os.path.join(directory, JOURNAL_SNAPSHOT_FILE)
+        self.fsync_sec = fsync_sec
+        os.makedirs(directory, exist_ok=True)
+
+        self.positions = {}  # (user_id, ticker) -> 보유 수량
+        self.intents = {}  # 일련번호 -> 결과를 아직 기록하지 않은 주문 의도
+        self.seq = 0  # 마지막으로 기록한 일련번호
+        self.log_records = 0  # 스냅샷 이후 로그에 쌓인 기록 수
+
+        self._cond = threading.Condition()
+        self._pending = []  # 아직 파일에 쓰지 않은 줄
+        self._durable_seq = 0  # fsync까지 끝난 마지막 일련번호
+        self._error = None  # 쓰기/fsync 실패 (설정되면 flush가 예외를 발생)
+
+        self.replay()
+        self._file = open(self.log_path, "a", encoding="utf-8")
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="order-journal", daemon=True
+        )
+        self._flusher.start()
+
+    # --- 복원 ---
+
+    def replay(self):
+        """스냅샷과 이후 로그로 보유 수량을 복원합니다. Returns: 복원에 걸린 시간(ms)"""
+        started = time.perf_counter()
+        self.positions = {}
+        self.intents = {}
+        self.seq = 0
+        self.log_records = 0
+
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.seq = snapshot["seq"]
+            self.positions = {
+                (user_id, ticker): qty for user_id, ticker, qty in snapshot["positions"]
+            }
+            self.intents = {r["seq"]: r for r in snapshot.get("intents", [])}
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError) as e:
+            print(f"주문 기록 스냅샷 읽기 실패: {e}")
+
+        try:
+            with open(self.log_path, "rb+") as f:
+                valid_end = 0
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 기록 중 중단되어 잘린 마지막 줄: 이후 기록이 이어 붙지 않도록 잘라냄
+                        break
+                    valid_end += len(line)
+                    if record["seq"] <= self.seq:
+                        continue  # 이미 스냅샷에 반영된 기록 (압축 중 중단된 경우)
+                    self._apply(record)
+                    self.seq = record["seq"]
+                    self.log_records += 1
+                f.truncate(valid_end)
+        except FileNotFoundError:
+            pass
+
+        self._durable_seq = self.seq
+        return (time.perf_counter() - started) * 1000
+
+    def _apply(self, record):
+        if record["type"] == "intent":
+            self.intents[record["seq"]] = record
+            return
+        if record["type"] in ("ack", "fail"):
+            intent = self.intents.pop(record["intent"], None)
+            if record["type"] == "fail" or intent is None:
+                return
+            record = intent  # 접수 확인: 의도 기록의 주문을 보유 수량에 반영
+
+        key = (record.get("user_id") or "", record["ticker"])
+        # "order": 주문 리스너가 접수 후에 남기던 이전 형식의 기록 (기존 로그 복원용)
+        if record["type"] in ("order", "intent"):
+            sign = 1 if record["side"] == "buy" else -1
+            qty = self.positions.get(key, 0) + sign * record["quantity"]
+        else:  # "adjust": 실제 잔고에 맞춘 보유 수량 보정 (이 종목의 미해결 주문 의도도 정리)
+            qty = record["quantity"]
+            for seq in [s for s, r in self.intents.items() if self._key(r) == key]:
+                del self.intents[seq]
+        # 0주도 남겨 두어 '기록 없음'과 '매도 완료'를 구분
+        self.positions[key] = max(qty, 0)
+
+    @staticmethod
+    def _key(record):
+        return (record.get("user_id") or "", record["ticker"])
+
+    # --- 기록 ---
+
+    def intent(self, user_id, ticker, side, quantity, price=0):
+        """
+        주문을 보내기 전에 주문 의도를 기록합니다. flush(seq)로 디스크 반영을 확인한 뒤 전송해야 합니다.
+        Returns: 일련번호 (resolve에 사용)
+        """
+        return self.append(
+            {
+                "type": "intent",
+                "user_id": user_id,
+                "ticker": ticker,
+                "side": side,
+                "quantity": int(quantity),
+                "price": price,
+                "ts": datetime.now().isoformat(),
+            }
+        )
+
+    def resolve(self, intent_seq, result):
+        """
+        주문 결과(KisTrader.place_order 응답)로 의도 기록을 마무리합니다.
+        접수 여부를 알 수 없는 결과(unknown: 응답 없음, 게이트웨이 오류 등)는 미해결로 남기며,
+        체결 내역으로 확인한 뒤 다시 resolve 합니다.
+        Returns: 일련번호 (미해결로 남기면 None)
+        """
+        if result.get("success"):
+            kind = "ack"
+        elif result.get("unknown"):
+            return None
+        else:
+            kind = "fail"
+        return self.append(
+            {
+                "type": kind,
+                "intent": intent_seq,
+                "order_no": result.get("order_no"),
+                "ts": datetime.now().isoformat(),
+            }
+        )
+
+    def set_position(self, user_id, ticker, quantity):
+        """보유 수량을 직접 보정합니다. (예: 실제 잔고에 없는 종목의 매수 상태 해제)"""
+        return self.append(
+            {
+                "type": "adjust",
+                "user_id": user_id,
+                "ticker": ticker,
+                "quantity": int(quantity),
+                "ts": datetime.now().isoformat(),
+            }
+        )
+
+    def append(self, record):
+        """기록을 메모리 상태에 반영하고 쓰기 대기열에 넣습니다. Returns: 일련번호"""
+        with self._cond:
+            self.seq += 1
+            record["seq"] = self.seq
+            self._apply(record)
+            self._pending.append(json.dumps(record, ensure_ascii=False) + "\n")
+            self._cond.notify_all()
+            return self.seq
+
+    def flush(self, seq=None, timeout=None):
+        """
+        seq(기본: 지금까지의 마지막 기록)까지 fsync될 때까지 기다립니다.
+        Raises: OrderJournalError - 기록 쓰기에 실패한 경우 (주문을 보내면 안 됨)
+        """
+        with self._cond:
+            target = self.seq if seq is None else seq
+            durable = self._cond.wait_for(
+                lambda: self._durable_seq >= target or self._error is not None,
+                timeout=timeout,
+            )
+            if self._durable_seq < target and self._error is not None:
+                raise OrderJournalError(f"주문 기록 쓰기 실패: {self._error}")
+            return durable
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+            # 짧게 기다려 그 사이 들어온 기록을 한 번의 fsync로 묶음 (그룹 커밋)
+            time.sleep(self.fsync_sec)
+            with self._cond:
+                try:
+                    self._write_pending()
+                    if self.log_records >= JOURNAL_COMPACT_RECORDS:
+                        self._compact()
+                except Exception as e:
+                    # 일부만 쓰였을 수 있는 로그 뒤에 이어 쓰지 않고 멈춤 (재시작 시 잘린 줄부터 정리됨)
+                    # 기다리던 flush()는 깨어나 예외를 받음
+                    print(f"주문 기록 쓰기 실패, 기록을 중단합니다: {e}")
+                    self._error = e
+                    self._cond.notify_all()
+                    return
+
+    def _write_pending(self):
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+        self._file.write("".join(lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.log_records += len(lines)
+        self._durable_seq = self.seq
+        self._cond.notify_all()
+
+    # --- 압축 ---
+
+    def compact(self):
+        """현재 상태를 스냅샷으로 저장하고 로그를 비웁니다."""
+        with self._cond:
+            self._write_pending()
+            self._compact()
+
+    def _compact(self):
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "seq": self.seq,
+                    "positions": [
+                        [user_id, ticker, qty]
+                        for (user_id, ticker), qty in self.positions.items()
+                    ],
+                    "intents": list(self.intents.values()),
+                },
+                f,
+                ensure_ascii=False,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        # 스냅샷이 디스크에 반영된 뒤에만 로그를 비움 (중간에 중단되면 seq로 중복 적용을 막음)
+        self._file.truncate(0)
+        self._file.seek(0)
+        self.log_records = 0
+
+    # --- 조회 ---
+
+    def position(self, user_id, ticker):
+        """
+        기록된 보유 수량. 이 (사용자, 종목)의 기록이 없으면 None
+        미해결 주문 의도는 접수된 것으로 보고 더합니다.
+        """
+        key = (user_id or "", ticker)
+        with self._cond:
+            qty = self.positions.get(key)
+            for record in self.intents.values():
+                if self._key(record) == key:
+                    sign = 1 if record["side"] == "buy" else -1
+                    qty = max((qty or 0) + sign * record["quantity"], 0)
+            return qty
+
+    def unresolved(self):
+        """결과를 아직 기록하지 않은 주문 의도 목록 (일련번호 순, 복사본)"""
+        with self._cond:
+            return [dict(r) for _, r in sorted(self.intents.items())]
+
+    def unresolved_keys(self):
+        """미해결 주문 의도가 있는 (사용자, 종목) 집합"""
+        with self._cond:
+            return {self._key(r) for r in self.intents.values()}
+
+    def is_bought(self, user_id, ticker):
+        return (self.position(user_id, ticker) or 0) > 0
+
+    def close(self):
+        with self._cond:
+            self._write_pending()
+            self._file.close()
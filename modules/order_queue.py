@@ -0,0 +1,222 @@
+# modules/order_queue.py
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from modules.config import get_secret
+
+# KIS 초당 호출 한도 (모의투자는 실전보다 훨씬 낮음). secrets의 KIS_RATE_LIMIT_<모드>로 변경 가능
+DEFAULT_RATE_LIMITS = {"VIRTUAL": 2.0, "PROD": 18.0}
+ORDER_DISPATCH_WORKERS = 4  # 동시에 전송 중일 수 있는 주문 수
+ORDER_MAX_RETRIES = 3  # 한도 초과 응답 시 재시도 횟수
+ORDER_BACKOFF_SEC = 0.5  # 재시도 대기 시간 (시도마다 2배)
+WAIT_HISTORY_SIZE = 500  # 대기 시간 통계에 쓰는 최근 주문 수
+
+PRIORITY = {"sell": 0, "buy": 1}  # 숫자가 작을수록 먼저 전송 (매도 우선)
+
+
+def get_rate_limit(mode):
+    """KIS_MODE별 초당 호출 한도"""
+    value = get_secret(f"KIS_RATE_LIMIT_{mode}")
+    if value is not None:
+        return float(value)
+    return DEFAULT_RATE_LIMITS.get(mode, DEFAULT_RATE_LIMITS["VIRTUAL"])
+
+
+class TokenBucket:
+    """
+    초당 rate개의 토큰이 채워지는 토큰 버킷. 최대 capacity개까지 몰아서 쓸 수 있습니다.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """토큰이 있으면 사용하고 0을, 없으면 토큰이 생길 때까지 남은 시간(초)을 반환합니다."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """토큰을 얻을 때까지 기다립니다. Returns: 기다린 시간(초)"""
+        waited = 0.0
+        while True:
+            delay = self.try_acquire()
+            if delay == 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def drain(self):
+        """한도 초과 응답을 받았을 때 남은 토큰을 비워 잠시 전송을 멈춥니다."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0.0)
+
+
+class _Order:
+    def __init__(self, ticker, quantity, price, order_type, user_id=None):
+        self.ticker = ticker
+        self.user_id = user_id
+        self.quantity = quantity
+        self.price = price
+        self.order_type = order_type
+        self.future = Future()
+        self.submitted = time.monotonic()
+        self.attempts = 0
+
+
+class OrderQueue:
+    """
+    KisTrader 앞단의 주문 대기열.
+    - 토큰 버킷으로 KIS_MODE별 초당 한도 이내로만 주문을 전송
+    - 매도 주문을 매수 주문보다 먼저 전송 (같은 우선순위는 접수 순서)
+    - 한도 초과 응답(EGW00201 등)은 지수 백오프 후 재시도
+    submit()은 KisTrader.place_order 결과(dict)를 담는 Future를 반환합니다.
+    """
+
+    def __init__(
+        self,
+        trader,
+        rate=None,
+        max_retries=ORDER_MAX_RETRIES,
+        backoff=ORDER_BACKOFF_SEC,
+        workers=ORDER_DISPATCH_WORKERS,
+    ):
+        self.trader = trader
+        self.bucket = TokenBucket(rate or get_rate_limit(trader.mode))
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="order-queue", daemon=True
+        )
+
+        self._waits = deque(maxlen=WAIT_HISTORY_SIZE)
+        self._counts = {"submitted": 0, "completed": 0, "failed": 0, "retried": 0}
+        self._in_flight = 0
+
+        self._dispatcher.start()
+
+    def submit(self, ticker, quantity, price=0, order_type="buy", user_id=None):
+        """주문을 대기열에 넣습니다. Returns: Future[dict]"""
+        order = _Order(ticker, quantity, price, order_type, user_id)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("주문 대기열이 종료되었습니다.")
+            self._counts["submitted"] += 1
+            self._push(order)
+        return order.future
+
+    def _push(self, order):
+        # 재시도 주문도 원래 접수 순서를 유지하도록 seq는 처음 한 번만 부여
+        if not hasattr(order, "seq"):
+            order.seq = next(self._seq)
+        heapq.heappush(
+            self._heap, (PRIORITY.get(order.order_type, 1), order.seq, order)
+        )
+        self._cond.notify()
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                # 종료 후에도 재시도 대기 중인 주문이 돌아올 수 있으므로 전송 중인 주문이 없을 때 끝냅니다.
+                while not self._heap and not (self._closed and not self._in_flight):
+                    self._cond.wait()
+                if not self._heap:
+                    return
+
+            # 토큰을 기다리는 동안 더 높은 우선순위 주문이 들어올 수 있으므로 토큰을 얻은 뒤에 꺼냅니다.
+            self.bucket.acquire()
+            with self._cond:
+                if not self._heap:
+                    continue
+                _, _, order = heapq.heappop(self._heap)
+                self._in_flight += 1
+                if order.attempts == 0:
+                    self._waits.append(time.monotonic() - order.submitted)
+            self._pool.submit(self._send, order)
+
+    def _send(self, order):
+        order.attempts += 1
+        try:
+            result = self.trader.place_order(
+                order.ticker,
+                order.quantity,
+                order.price,
+                order.order_type,
+                user_id=order.user_id,
+            )
+        except Exception as e:
+            result = {"success": False, "throttled": False, "msg1": str(e)}
+
+        if result.get("throttled") and order.attempts <= self.max_retries:
+            self.bucket.drain()
+            delay = self.backoff * 2 ** (order.attempts - 1)
+            print(
+                f"⏳ 호출 한도 초과, {delay:.1f}초 후 재시도: {order.ticker} {order.order_type}"
+            )
+            time.sleep(delay)
+            with self._cond:
+                self._in_flight -= 1
+                self._counts["retried"] += 1
+                self._push(order)
+            return
+
+        with self._cond:
+            self._in_flight -= 1
+            self._counts["completed" if result.get("success") else "failed"] += 1
+            self._cond.notify_all()
+        result["attempts"] = order.attempts
+        order.future.set_result(result)
+
+    def depth(self):
+        """전송을 기다리는 주문 수"""
+        with self._cond:
+            return len(self._heap)
+
+    def metrics(self):
+        """대기열 상태와 최근 주문들의 대기 시간(접수 → 첫 전송, ms)"""
+        with self._cond:
+            # 전송 스레드가 _waits에 추가하는 중에 정렬하지 않도록 잠금 안에서 복사
+            waits = list(self._waits)
+            metrics = {
+                "depth": len(self._heap),
+                "in_flight": self._in_flight,
+                "rate_limit": self.bucket.rate,
+                **self._counts,
+            }
+        waits.sort()
+        metrics["avg_wait_ms"] = sum(waits) / len(waits) * 1000 if waits else 0.0
+        metrics["p95_wait_ms"] = (
+            waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000 if waits else 0.0
+        )
+        metrics["max_wait_ms"] = waits[-1] * 1000 if waits else 0.0
+        return metrics
+
+    def close(self):
+        """남은 주문을 모두 전송한 뒤 종료합니다."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._dispatcher.join()
+        self._pool.shutdown(wait=True)
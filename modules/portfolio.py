@@ -1,6 +1,25 @@
 # modules/portfolio.py
 import pandas as pd
 
+from modules.trader import BalanceInquiryError
+
+# 잔고 응답 필드 -> (표시 컬럼명, 변환 함수)
+HOLDING_FIELDS = {
+    "pdno": ("종목코드", str),
+    "prdt_name": ("종목명", str),
+    "hldg_qty": ("보유수량", int),
+    "pchs_avg_pric": ("매입가", float),
+    "prpr": ("현재가", float),
+    "evlu_pfls_amt": ("평가손익", int),
+    "evlu_pfls_rt": ("수익률(%)", float),
+}
+EMPTY_ACCOUNT = {
+    "total_asset": 0,
+    "total_profit": 0,
+    "profit_rate": 0.0,
+    "deposit": 0,
+}
+
 
 class PortfolioManager:
     """
@@ -14,64 +33,56 @@ class PortfolioManager:
         """
         현재 계좌 상태를 조회하여 보기 좋은 포맷으로 반환합니다.
         """
-        holdings, summary = self.trader.get_balance()
+        status = self.load_status()
+        if status is None:
+            return dict(EMPTY_ACCOUNT), pd.DataFrame()
+        return status
 
-        # 1. 계좌 요약 정보 처리
-        if not summary:
-            account_info = {
-                "total_asset": 0,
-                "total_profit": 0,
-                "profit_rate": 0.0,
-                "deposit": 0,
-            }
-        else:
-            try:
-                s_data = summary[0]
-                account_info = {
-                    "total_asset": int(s_data.get("tot_evlu_amt", 0)),
-                    "total_profit": int(s_data.get("evlu_pfls_smtl_amt", 0)),
-                    "profit_rate": float(s_data.get("evlu_pfls_rt", 0.0)),
-                    "deposit": int(s_data.get("dnca_tot_amt", 0)),
-                }
-            except (IndexError, KeyError, TypeError, ValueError):
-                account_info = {
-                    "total_asset": 0,
-                    "total_profit": 0,
-                    "profit_rate": 0.0,
-                    "deposit": 0,
-                }
+    def load_status(self):
+        """
+        get_portfolio_status와 같은 형식으로 조회하되, 잔고 조회 자체가 실패하거나
+        연속 조회 도중 실패하여 일부 페이지만 받았으면 None을 반환합니다.
+        (보유 종목이 없는 계좌와 조회 실패를 구분해야 하는 계좌 캐시용)
+        잔고는 페이지 단위로 받아 필요한 컬럼 값만 누적하므로 원본 JSON을 모두 들고 있지 않습니다.
+        """
+        columns = {name: [] for name, _ in HOLDING_FIELDS.values()}
+        summary = []
+        pages = 0
 
-        # 2. 보유 종목 리스트 처리
-        if not holdings:
-            df = pd.DataFrame()
-        else:
-            try:
-                df = pd.DataFrame(holdings)
-                df = df[
-                    [
-                        "prdt_name",
-                        "hldg_qty",
-                        "pchs_avg_pric",
-                        "prpr",
-                        "evlu_pfls_amt",
-                        "evlu_pfls_rt",
+        # 1. 보유 종목 리스트 처리 (페이지를 받는 대로 컬럼별 리스트에 추가)
+        try:
+            for page, page_summary in self.trader.iter_balance():
+                pages += 1
+                summary = page_summary or summary
+                for row in page:
+                    # 한 행의 변환이 모두 성공한 뒤에 추가하여 컬럼 길이가 어긋나지 않도록 함
+                    values = [
+                        (name, cast(row[key]))
+                        for key, (name, cast) in HOLDING_FIELDS.items()
                     ]
-                ]
-                df.columns = [
-                    "종목명",
-                    "보유수량",
-                    "매입가",
-                    "현재가",
-                    "평가손익",
-                    "수익률(%)",
-                ]
-                df["보유수량"] = df["보유수량"].astype(int)
-                df["매입가"] = df["매입가"].astype(float)
-                df["현재가"] = df["현재가"].astype(float)
-                df["평가손익"] = df["평가손익"].astype(int)
-                df["수익률(%)"] = df["수익률(%)"].astype(float)
-            except (KeyError, ValueError, TypeError) as e:
-                print(f"보유 종목 데이터 처리 오류: {e}")
-                df = pd.DataFrame()
+                    for name, value in values:
+                        columns[name].append(value)
+            df = pd.DataFrame(columns) if columns["종목명"] else pd.DataFrame()
+        except (KeyError, ValueError, TypeError) as e:
+            print(f"보유 종목 데이터 처리 오류: {e}")
+            df = pd.DataFrame()
+        except BalanceInquiryError as e:
+            print(f"잔고 조회 중단: {e}")
+            return None
+
+        if not pages:
+            return None
+
+        # 2. 계좌 요약 정보 처리
+        try:
+            s_data = summary[0]
+            account_info = {
+                "total_asset": int(s_data.get("tot_evlu_amt", 0)),
+                "total_profit": int(s_data.get("evlu_pfls_smtl_amt", 0)),
+                "profit_rate": float(s_data.get("evlu_pfls_rt", 0.0)),
+                "deposit": int(s_data.get("dnca_tot_amt", 0)),
+            }
+        except (IndexError, KeyError, TypeError, ValueError):
+            account_info = dict(EMPTY_ACCOUNT)
 
         return account_info, df
@@ -0,0 +1,229 @@
+# modules/price_stream.py
+import queue
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from modules.bar_store import get_bar_store
+from modules.config import get_secret
+from modules.quotes import fetch_quotes
+
+PRICE_POLL_SEC = 2  # 시세 소스 조회 주기 (초)
+SUBSCRIPTION_QUEUE_SIZE = 100  # 구독자별 미처리 틱 보관 한도 (초과 시 오래된 틱부터 버림)
+# 이 시간(초) 동안 틱을 꺼내가지 않은 구독은 해제합니다. (세션 종료 등으로 버려진 구독 정리)
+SUBSCRIPTION_IDLE_SEC = float(get_secret("SUBSCRIPTION_IDLE_SEC", 60))
+
+
+class PriceSource(ABC):
+    """
+    시세 소스 인터페이스. fetch는 요청한 종목의 최신 가격을 반환합니다.
+    가격을 얻지 못한 종목은 결과에서 빠질 수 있습니다.
+    """
+
+    @abstractmethod
+    def fetch(self, tickers):
+        """Returns: dict[str, float] - {종목코드: 최신 가격}"""
+
+
+class YFinanceSource(PriceSource):
+    """Yahoo Finance 일괄 시세 조회를 사용하는 기본 소스"""
+
+    def fetch(self, tickers):
+        quotes = fetch_quotes(tickers, with_market_cap=False)
+        return {ticker: quote["last_price"] for ticker, quote in quotes.items()}
+
+
+class ReplaySource(PriceSource):
+    """
+    저장된 가격 시계열을 한 단계씩 재생하는 오프라인 소스.
+    series를 주지 않은 종목은 로컬 BarStore에 저장된 종가 이력을 재생합니다.
+    """
+
+    def __init__(self, series=None, interval="1d", loop=True):
+        self.series = {t: list(prices) for t, prices in (series or {}).items()}
+        self.interval = interval
+        self.loop = loop
+        self._positions = {}
+
+    def _load(self, ticker):
+        if ticker not in self.series:
+            df, _ = get_bar_store().load(ticker, self.interval)
+            self.series[ticker] = df["Close"].tolist() if not df.empty else []
+        return self.series[ticker]
+
+    def fetch(self, tickers):
+        prices = {}
+        for ticker in tickers:
+            series = self._load(ticker)
+            if not series:
+                continue
+
+            pos = self._positions.get(ticker, 0)
+            if pos >= len(series):
+                if not self.loop:
+                    prices[ticker] = series[-1]
+                    continue
+                pos = 0
+            prices[ticker] = series[pos]
+            self._positions[ticker] = pos + 1
+        return prices
+
+
+class SimulatorSource(PriceSource):
+    """무작위 보행(random walk)으로 가격을 생성하는 오프라인 시뮬레이터 소스"""
+
+    def __init__(self, start_prices=None, volatility=0.002, seed=None):
+        self.prices = dict(start_prices or {})
+        self.volatility = volatility
+        self._random = random.Random(seed)
+
+    def fetch(self, tickers):
+        for ticker in tickers:
+            price = self.prices.get(ticker, 100.0)
+            self.prices[ticker] = price * (1 + self._random.gauss(0, self.volatility))
+        return {ticker: self.prices[ticker] for ticker in tickers}
+
+
+def create_price_source(name=None):
+    """설정값(PRICE_SOURCE)에 따라 시세 소스를 생성합니다. (yfinance | replay | simulator)"""
+    name = (name or get_secret("PRICE_SOURCE", "yfinance")).lower()
+    if name == "replay":
+        return ReplaySource()
+    if name == "simulator":
+        return SimulatorSource()
+    return YFinanceSource()
+
+
+class Subscription:
+    """한 세션이 특정 종목의 틱을 받아가는 구독"""
+
+    def __init__(self, stream, ticker):
+        self.stream = stream
+        self.ticker = ticker
+        self.queue = queue.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+        self.last_read = time.monotonic()
+        self.closed = False
+
+    def _put(self, tick):
+        try:
+            self.queue.put_nowait(tick)
+        except queue.Full:
+            # 느린 구독자는 오래된 틱을 버리고 최신 틱을 유지합니다.
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(tick)
+
+    def drain(self):
+        """쌓여 있는 틱을 모두 꺼내 시간 순서대로 반환합니다."""
+        self.last_read = time.monotonic()
+        ticks = []
+        while True:
+            try:
+                ticks.append(self.queue.get_nowait())
+            except queue.Empty:
+                return ticks
+
+    def close(self):
+        self.stream.unsubscribe(self)
+
+
+class PriceStream:
+    """
+    백그라운드 생산자 스레드가 구독 중인 종목의 시세를 주기적으로 조회하고,
+    종목별 구독자에게 틱({"ticker", "price", "ts"})을 전달합니다.
+    여러 세션이 같은 종목을 구독해도 소스 조회는 주기마다 1회입니다.
+    """
+
+    def __init__(
+        self, source=None, interval=PRICE_POLL_SEC, idle_sec=SUBSCRIPTION_IDLE_SEC
+    ):
+        self.source = source or create_price_source()
+        self.interval = interval
+        self.idle_sec = idle_sec
+        self._lock = threading.Lock()
+        self._subscribers = {}  # ticker -> set[Subscription]
+        self._latest = {}  # ticker -> tick
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="price-stream", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def subscribe(self, ticker):
+        sub = Subscription(self, ticker)
+        with self._lock:
+            self._subscribers.setdefault(ticker, set()).add(sub)
+            latest = self._latest.get(ticker)
+        if latest:
+            sub._put(latest)  # 구독 즉시 마지막 시세를 받을 수 있도록
+        return sub
+
+    def unsubscribe(self, sub):
+        sub.closed = True
+        with self._lock:
+            subs = self._subscribers.get(sub.ticker)
+            if subs:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.ticker]
+
+    def latest(self, ticker):
+        with self._lock:
+            return self._latest.get(ticker)
+
+    def expire_idle(self):
+        """idle_sec 동안 읽지 않은 구독을 해제합니다."""
+        deadline = time.monotonic() - self.idle_sec
+        with self._lock:
+            idle = [
+                sub
+                for subs in self._subscribers.values()
+                for sub in subs
+                if sub.last_read < deadline
+            ]
+        for sub in idle:
+            sub.close()
+
+    def poll_once(self):
+        """구독 중인 종목의 시세를 1회 조회하여 발행합니다."""
+        self.expire_idle()
+        with self._lock:
+            tickers = list(self._subscribers)
+        if not tickers:
+            return
+
+        try:
+            prices = self.source.fetch(tickers)
+        except Exception as e:
+            print(f"시세 스트림 조회 오류: {e}")
+            return
+
+        now = time.time()
+        for ticker, price in prices.items():
+            if price is None:
+                continue
+            tick = {"ticker": ticker, "price": float(price), "ts": now}
+            with self._lock:
+                self._latest[ticker] = tick
+                subs = list(self._subscribers.get(ticker, ()))
+            for sub in subs:
+                sub._put(tick)
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.poll_once()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
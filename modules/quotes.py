@@ -0,0 +1,171 @@
+# modules/quotes.py
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pandas as pd
+import yfinance as yf
+
+QUOTE_MAX_WORKERS = 8  # fast_info 개별 조회에 사용할 최대 스레드 수
+QUOTE_TIMEOUT_SEC = 5  # 종목별 조회 대기 한도 (초과 시 해당 종목은 결과에서 제외)
+
+# 느린 종목이 스레드를 점유하더라도 전체 스레드 수가 늘어나지 않도록 프로세스 전역 풀을 공유합니다.
+_executor = ThreadPoolExecutor(
+    max_workers=QUOTE_MAX_WORKERS, thread_name_prefix="quote"
+)
+# yf.download는 모듈 전역 상태에 결과를 모으므로 한 프로세스에서 동시에 한 번만 실행합니다.
+_download_lock = threading.Lock()
+
+
+def _download(symbols, timeout):
+    if not _download_lock.acquire(timeout=timeout):
+        return None  # 앞선 다운로드가 아직 끝나지 않음 → 개별 조회로 대체
+    try:
+        return yf.download(
+            symbols,
+            period="5d",
+            interval="1d",
+            progress=False,
+            threads=True,  # 종목별 요청을 순차가 아닌 병렬로 보냄
+            timeout=timeout,
+        )
+    finally:
+        _download_lock.release()
+
+
+def _download_last_prices(symbols, timeout=QUOTE_TIMEOUT_SEC):
+    """
+    여러 종목의 최근 종가를 한 번의 다중 종목 다운로드로 가져옵니다.
+    다운로드 전체가 timeout 안에 끝나지 않으면 기다리지 않고 빈 결과를 반환합니다.
+    Returns: dict[str, float] - 가격을 얻지 못한 종목은 포함되지 않습니다.
+    """
+    future = _executor.submit(_download, symbols, timeout)
+    try:
+        data = future.result(timeout=timeout)
+    except FutureTimeoutError:
+        print(f"시세 일괄 조회 시간 초과 ({timeout}초)")
+        return {}
+    except Exception as e:
+        print(f"시세 일괄 조회 실패: {e}")
+        return {}
+
+    if data is None or data.empty:
+        return {}
+    if isinstance(data.columns, pd.MultiIndex):
+        if "Close" not in data.columns.get_level_values(0):
+            return {}
+        close = data["Close"]
+    elif "Close" in data.columns and len(symbols) == 1:
+        # 단일 종목은 yfinance 버전에 따라 (가격 항목) 1단 컬럼으로 반환됨
+        close = data[["Close"]].set_axis(symbols, axis=1)
+    else:
+        return {}
+
+    last_close = close.ffill().iloc[-1]
+    return {
+        symbol: float(price)
+        for symbol, price in last_close.items()
+        if pd.notna(price)
+    }
+
+
+def _fetch_fast_info(symbol, need_price, need_market_cap=True, started=None):
+    """fast_info로 시가총액(필요 시 현재가까지)을 조회합니다."""
+    if started is not None:
+        started[symbol] = time.monotonic()  # 종목별 제한 시간은 실제 조회 시작부터 계산
+    info = yf.Ticker(symbol).fast_info
+    quote = {}
+    if need_market_cap:
+        quote["market_cap"] = getattr(info, "market_cap", None)
+    if need_price:
+        quote["last_price"] = getattr(info, "last_price", None)
+    return quote
+
+
+def _wait_each(futures, started, submitted_at, timeout):
+    """
+    종목별 제한 시간으로 기다립니다. 조회 중인 종목은 시작 시점부터 timeout이 지나면 포기하므로
+    느린 종목 하나가 다른 종목을 붙잡지 않습니다. 아직 시작하지 못한 종목은 마지막 진행
+    (제출/시작/완료) 이후 timeout 동안 진행이 없을 때만 포기합니다. (풀이 다른 조회로 막힌 경우)
+    Returns: (완료된 future 집합, 시간 초과된 future 집합)
+    """
+    done, pending, expired = set(), set(futures), set()
+    progress = submitted_at
+    while pending:
+        now = time.monotonic()
+        progress = max([progress, *started.values()])
+        deadlines = {
+            future: started.get(futures[future], progress) + timeout
+            for future in pending
+        }
+        for future, deadline in deadlines.items():
+            if deadline <= now and not future.done():
+                expired.add(future)
+        pending -= expired
+        if not pending:
+            break
+        next_deadline = min(deadlines[future] for future in pending)
+        finished, pending = wait(
+            pending, timeout=max(0, next_deadline - now), return_when=FIRST_COMPLETED
+        )
+        if finished:
+            progress = time.monotonic()
+        done |= finished
+    return done, expired
+
+
+def fetch_quotes(symbols, timeout=QUOTE_TIMEOUT_SEC, with_market_cap=True):
+    """
+    여러 종목의 현재가와 시가총액을 조회합니다.
+
+    현재가는 다중 종목 다운로드 1회로 가져오고, 시가총액(및 다운로드에서 빠진 종목의 현재가)은
+    제한된 스레드 풀에서 병렬로 조회합니다. 다운로드는 전체를 timeout 안에 끝내지 못하면
+    건너뛰고 개별 조회로 대체합니다. 개별 조회의 timeout은 종목별 한도로, 조회를 시작한 뒤
+    timeout 안에 끝나지 않았거나 실패한 종목은 결과에서 빠지며 나머지 종목의 결과는 그대로 반환됩니다.
+    with_market_cap=False이면 다운로드에서 빠진 종목만 개별 조회합니다. (현재가 전용)
+
+    Returns: dict[str, dict] - {"AAPL": {"last_price": 190.1, "market_cap": 2.9e12}, ...}
+    """
+    symbols = list(dict.fromkeys(symbols))  # 순서 유지 중복 제거
+    if not symbols:
+        return {}
+
+    prices = _download_last_prices(symbols, timeout)
+
+    started = {}
+    submitted_at = time.monotonic()
+    futures = {
+        _executor.submit(
+            _fetch_fast_info, symbol, symbol not in prices, with_market_cap, started
+        ): symbol
+        for symbol in symbols
+        if with_market_cap or symbol not in prices
+    }
+    done, pending = _wait_each(futures, started, submitted_at, timeout)
+
+    for future in pending:
+        future.cancel()  # 아직 시작하지 않은 작업은 취소
+        print(f"{futures[future]} 시세 조회 시간 초과 ({timeout}초)")
+
+    quotes = {}
+    for symbol in symbols:
+        if symbol in prices:
+            quotes[symbol] = {"last_price": prices[symbol], "market_cap": None}
+
+    for future in done:
+        symbol = futures[future]
+        try:
+            detail = future.result()
+        except Exception as e:
+            # 특정 종목 조회 실패 시 로그만 찍고 다음 종목으로 진행
+            print(f"{symbol} 데이터 처리 중 오류: {e}")
+            continue
+
+        quote = quotes.setdefault(symbol, {"last_price": None, "market_cap": None})
+        if detail.get("last_price") is not None and quote["last_price"] is None:
+            quote["last_price"] = detail["last_price"]
+        if with_market_cap:
+            quote["market_cap"] = detail.get("market_cap")
+
+    return {s: q for s, q in quotes.items() if q["last_price"] is not None}
@@ -0,0 +1,155 @@
+# modules/rule_engine.py
+import numpy as np
+
+INITIAL_CAPACITY = 1024
+
+
+class RuleTable:
+    """
+    목표가 매수/매도 규칙을 NumPy 배열로 보관하고, 가격 벡터 하나로 전체 규칙을
+    한 번에 평가하는 규칙 테이블.
+
+    규칙 의미는 modules/trading_service.evaluate_target_rule과 동일합니다.
+    - 매수: target_buy > 0 이고 가격 <= target_buy 이며 미보유
+    - 매도: (매수 조건 구간이 아닐 때) target_sell > 0 이고 가격 >= target_sell 이며 보유
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.size = 0
+        self.keys = []  # 행 번호 -> 규칙 키 (예: (user_id, ticker))
+        self._rows = {}  # 규칙 키 -> 행 번호
+        self.tickers = []  # 종목 번호 -> 종목코드
+        self._ticker_index = {}  # 종목코드 -> 종목 번호
+
+        self.ticker_idx = np.zeros(capacity, dtype=np.int32)
+        self.target_buy = np.zeros(capacity, dtype=np.float64)
+        self.target_sell = np.zeros(capacity, dtype=np.float64)
+        self.quantity = np.zeros(capacity, dtype=np.int32)
+        self.bought = np.zeros(capacity, dtype=bool)
+
+    @classmethod
+    def from_rules(cls, rules):
+        """load_active_trade_rules() 형식의 규칙 리스트로 테이블을 만듭니다."""
+        table = cls(capacity=max(INITIAL_CAPACITY, len(rules)))
+        for r in rules:
+            table.add_rule(
+                (r["user_id"], r["ticker"]),
+                r["ticker"],
+                r["target_buy"],
+                r["target_sell"],
+                quantity=r.get("quantity", 1),
+                bought=r.get("bought", False),
+            )
+        return table
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        capacity = len(self.ticker_idx) * 2
+        for name in ("ticker_idx", "target_buy", "target_sell", "quantity", "bought"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+
+    def ticker_id(self, ticker):
+        """종목코드의 번호를 반환합니다. 처음 보는 종목이면 새로 등록합니다."""
+        idx = self._ticker_index.get(ticker)
+        if idx is None:
+            idx = len(self.tickers)
+            self._ticker_index[ticker] = idx
+            self.tickers.append(ticker)
+        return idx
+
+    def add_rule(self, key, ticker, target_buy, target_sell, quantity=1, bought=False):
+        """규칙을 추가합니다. 같은 키가 있으면 목표가/수량만 갱신합니다."""
+        row = self._rows.get(key)
+        if row is None:
+            if self.size == len(self.ticker_idx):
+                self._grow()
+            row = self.size
+            self.size += 1
+            self._rows[key] = row
+            self.keys.append(key)
+            self.bought[row] = bought
+
+        self.ticker_idx[row] = self.ticker_id(ticker)
+        self.target_buy[row] = target_buy
+        self.target_sell[row] = target_sell
+        self.quantity[row] = quantity
+        return row
+
+    def remove_rule(self, key):
+        """규칙을 삭제합니다. 마지막 행을 빈자리로 옮겨 배열을 연속으로 유지합니다."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            for arr in (
+                self.ticker_idx,
+                self.target_buy,
+                self.target_sell,
+                self.quantity,
+                self.bought,
+            ):
+                arr[row] = arr[last]
+            moved_key = self.keys[last]
+            self.keys[row] = moved_key
+            self._rows[moved_key] = row
+        self.keys.pop()
+        self.size = last
+
+    def set_bought(self, key, bought):
+        row = self._rows.get(key)
+        if row is not None:
+            self.bought[row] = bought
+
+    def is_bought(self, key):
+        row = self._rows.get(key)
+        return bool(self.bought[row]) if row is not None else False
+
+    def price_vector(self, prices):
+        """{종목코드: 가격} 딕셔너리를 종목 번호 순서의 가격 벡터로 변환합니다. (없는 종목은 NaN)"""
+        vector = np.full(len(self.tickers), np.nan)
+        for ticker, price in prices.items():
+            idx = self._ticker_index.get(ticker)
+            if idx is not None and price is not None:
+                vector[idx] = price
+        return vector
+
+    def evaluate(self, prices):
+        """
+        가격 벡터(또는 {종목코드: 가격} 딕셔너리)로 모든 규칙을 한 번에 평가합니다.
+        상태(bought)는 바꾸지 않으며, 주문 체결 후 set_bought로 반영합니다.
+
+        Returns: list[dict] - [{"key", "ticker", "side", "quantity", "price"}, ...]
+        """
+        if isinstance(prices, dict):
+            prices = self.price_vector(prices)
+
+        n = self.size
+        price = prices[self.ticker_idx[:n]]
+        target_buy = self.target_buy[:n]
+        target_sell = self.target_sell[:n]
+        bought = self.bought[:n]
+
+        # NaN 비교는 항상 False이므로 가격이 없는 종목의 규칙은 발동하지 않습니다.
+        in_buy_zone = (target_buy > 0) & (price <= target_buy)
+        buy = in_buy_zone & ~bought
+        sell = ~in_buy_zone & (target_sell > 0) & (price >= target_sell) & bought
+
+        intents = []
+        for side, mask in (("sell", sell), ("buy", buy)):
+            for row in np.flatnonzero(mask):
+                intents.append(
+                    {
+                        "key": self.keys[row],
+                        "ticker": self.tickers[self.ticker_idx[row]],
+                        "side": side,
+                        "quantity": int(self.quantity[row]),
+                        "price": float(price[row]),
+                    }
+                )
+        return intents
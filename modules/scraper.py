@@ -3,6 +3,16 @@ import yfinance as yf
 import pandas as pd
 import streamlit as st
 
+from modules.bar_store import (
+    COVERED_MAX,
+    covers,
+    get_bar_store,
+    required_start,
+    slice_period,
+)
+from modules.quotes import fetch_quotes
+from modules.singleflight import single_flight
+
 
 class StockScraper:
     """
@@ -30,22 +40,48 @@ class StockScraper:
     def get_history(self, period="1mo", interval="1d"):
         """
         지정된 기간 동안의 주가 이력(OHLCV) 데이터를 DataFrame으로 반환합니다.
+        로컬 BarStore에 저장된 이력이 기간을 포함하면 마지막 봉 이후만 추가로 수집하고,
+        결과는 저장된 전체 이력에서 period 구간을 잘라 반환합니다.
 
         Args:
             period (str): 데이터 기간 (예: '1d', '1mo', '1y', 'max')
             interval (str): 데이터 간격 (예: '1m', '1h', '1d', '1wk')
         """
+        store = get_bar_store()
         try:
-            df = self.stock.history(period=period, interval=interval)
-
-            # 데이터가 비어있는 경우 처리
-            if df.empty:
-                return pd.DataFrame()
+            stored, covered_from = store.load(self.ticker_symbol, interval)
+            tz = stored.index.tz if not stored.empty else None
+            now = pd.Timestamp.now(tz=tz)
+
+            if not stored.empty and covers(covered_from, period, now, stored.index):
+                # 마지막 저장 봉부터 다시 받아 미완성 봉을 갱신하고 이후 봉만 추가
+                new_bars = self.stock.history(start=stored.index[-1], interval=interval)
+                df = store.append(
+                    self.ticker_symbol, interval, stored, new_bars, covered_from
+                )
+            else:
+                df = self.stock.history(period=period, interval=interval)
+
+                # 데이터가 비어있는 경우 처리
+                if df.empty:
+                    return pd.DataFrame()
+
+                if period == "max":
+                    covered_from = COVERED_MAX
+                else:
+                    now = pd.Timestamp.now(tz=df.index.tz)
+                    start = required_start(period, now)
+                    covered_from = (
+                        df.index[0] if start is None else min(start, df.index[0])
+                    )
+                df = store.append(
+                    self.ticker_symbol, interval, stored, df, covered_from
+                )
 
             # 가독성을 위해 인덱스(날짜) 포맷 정리 (선택 사항)
             # df.index = df.index.strftime('%Y-%m-%d %H:%M')
 
-            return df
+            return slice_period(df, period)
         except Exception as e:
             st.error(f"데이터 수집 중 오류 발생: {e}")
             return pd.DataFrame()
@@ -111,12 +147,16 @@ class StockScraper:
 
 
 # Streamlit 캐싱을 위한 래퍼 함수 (main.py에서 호출 시 사용)
+# 캐시 만료 직후 여러 세션이 같은 종목을 요청해도 yfinance 호출은 1회만 일어나도록
+# single_flight로 동시 요청을 합칩니다. (st.cache_data 위에 두어야 만료된 값이 다시 캐싱되지 않음)
+@single_flight(fresh_ttl=300)
 @st.cache_data(ttl=300)  # 300초(5분)마다 데이터 갱신
 def fetch_stock_history(ticker, period="1mo"):
     scraper = StockScraper(ticker)
     return scraper.get_history(period=period)
 
 
+@single_flight(fresh_ttl=3600)
 @st.cache_data(ttl=3600)  # 기본 정보는 1시간 캐싱
 def fetch_stock_info(ticker):
     scraper = StockScraper(ticker)
@@ -127,6 +167,7 @@ def fetch_stock_info(ticker):
 WATCHLIST_UPDATE_SEC = 60
 
 
+@single_flight(fresh_ttl=WATCHLIST_UPDATE_SEC)
 @st.cache_data(ttl=WATCHLIST_UPDATE_SEC)  # 60초(1분)마다 데이터 갱신
 def fetch_watchlist_data(tickers):
     """
@@ -136,39 +177,32 @@ def fetch_watchlist_data(tickers):
         return pd.DataFrame()
 
     try:
-        # yfinance를 사용하여 여러 종목의 현재 데이터를 가져옵니다.
-        # Ticker 객체의 info에서 last_price, marketCap, trailingPE 등을 추출할 수 있습니다.
+        # 현재가는 다중 종목 일괄 다운로드로, 시가총액은 스레드 풀에서 병렬로 조회합니다.
+        # 느리거나 실패한 종목은 건너뛰고 나머지 종목의 결과만으로 표를 구성합니다.
+        quotes = fetch_quotes([tickerInfo["ticker"] for tickerInfo in tickers])
+
         data_list = []
         for tickerInfo in tickers:
             ticker = tickerInfo["ticker"]
-            stock_name = tickerInfo["name"]
-            yfticker = yf.Ticker(ticker)
-            info = yfticker.fast_info  # 빠른 정보 조회
-
-            try:
-                # fast_info는 딕셔너리가 아닌 객체이므로 .last_price 등으로 접근합니다.
-                # 참고: fast_info에는 PER, 섹터 정보가 포함되지 않는 경우가 많습니다.
-                last_price = info.last_price if hasattr(info, "last_price") else None
-                market_cap = info.market_cap if hasattr(info, "market_cap") else None
-
-                # 가격 정보가 있는 경우에만 리스트에 추가
-                if last_price is not None:
-                    data_list.append(
-                        {
-                            "종목코드": ticker,
-                            "종목이름": stock_name,
-                            "현재가": last_price,
-                            "시가총액": market_cap if market_cap else "N/A",
-                            # fast_info는 실시간 가격 중심이므로 PER/섹터 정보는 없을 수 있음 (N/A 처리)
-                            "PER": "N/A",
-                            "섹터": "N/A",
-                        }
-                    )
-            except Exception as e:
-                # 특정 종목 데이터 추출 실패 시 로그만 찍고 다음 종목으로 진행
-                print(f"{ticker} 데이터 처리 중 오류: {e}")
+            quote = quotes.get(ticker)
+
+            # 가격 정보가 있는 경우에만 리스트에 추가
+            if quote is None:
                 continue
 
+            market_cap = quote["market_cap"]
+            data_list.append(
+                {
+                    "종목코드": ticker,
+                    "종목이름": tickerInfo["name"],
+                    "현재가": quote["last_price"],
+                    "시가총액": market_cap if market_cap else "N/A",
+                    # fast_info는 실시간 가격 중심이므로 PER/섹터 정보는 없을 수 있음 (N/A 처리)
+                    "PER": "N/A",
+                    "섹터": "N/A",
+                }
+            )
+
         df = pd.DataFrame(data_list)
         # 필요한 경우 데이터 정제 및 포맷팅 (예: 시가총액 단위 조정)
 
@@ -0,0 +1,160 @@
+# modules/singleflight.py
+import functools
+import inspect
+import threading
+import time
+
+from modules.config import get_secret
+
+# 캐시가 만료된 값을 우선 응답하고 백그라운드에서 1회만 갱신할지 여부 (기본: 사용 안 함)
+STALE_WHILE_REVALIDATE = (
+    str(get_secret("STALE_WHILE_REVALIDATE", "false")).lower() == "true"
+)
+SWR_MAX_ENTRIES = 256  # 키별로 보관하는 마지막 성공 값의 최대 개수 (오래된 것부터 버림)
+
+
+class _Call:
+    """진행 중인 요청 1건. 같은 키의 후속 요청은 이 결과를 기다립니다."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 요청을 하나의 실제 호출로 합치는 프로세스 전역 계층.
+
+    stale_while_revalidate=True이면 마지막 성공 값을 보관해 두었다가,
+    fresh_ttl(초)이 지난 값은 그대로 응답하면서 백그라운드에서 한 번만 갱신합니다.
+    max_stale(기본: fresh_ttl의 2배)보다 오래된 값은 응답하지 않고 버린 뒤 새로 가져옵니다.
+    """
+
+    def __init__(
+        self,
+        stale_while_revalidate=False,
+        fresh_ttl=0,
+        max_stale=None,
+        max_entries=SWR_MAX_ENTRIES,
+    ):
+        self.stale_while_revalidate = stale_while_revalidate
+        self.fresh_ttl = fresh_ttl
+        self.max_stale = fresh_ttl * 2 if max_stale is None else max_stale
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call
+        self._values = {}  # key -> (value, stored_at)
+        self._refreshing = set()
+
+    def do(self, key, fn, refresh=None):
+        """
+        refresh: 백그라운드 갱신에 쓸 함수 (기본: fn). fn이 캐시를 거친다면
+        캐시를 비우고 다시 가져오는 함수를 주어야 만료된 값이 다시 쓰이지 않습니다.
+        """
+        if not self.stale_while_revalidate:
+            return self._do(key, fn)
+
+        with self._lock:
+            cached = self._values.get(key)
+
+        if cached is None:
+            return self._do(key, fn)
+
+        value, stored_at = cached
+        age = time.monotonic() - stored_at
+        if age >= self.max_stale:
+            return self._do(key, fn)
+        if age >= self.fresh_ttl:
+            self._refresh_in_background(key, refresh or fn)
+        return value
+
+    def _do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            call.event.wait()
+        else:
+            try:
+                call.value = fn()
+                if self.stale_while_revalidate:
+                    self._store(key, call.value)
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    def _store(self, key, value):
+        now = time.monotonic()
+        with self._lock:
+            self._values.pop(key, None)
+            self._values[key] = (value, now)  # 저장 순서 = 오래된 순
+            for old_key, (_, stored_at) in list(self._values.items()):
+                if (
+                    now - stored_at < self.max_stale
+                    and len(self._values) <= self.max_entries
+                ):
+                    break
+                del self._values[old_key]
+
+    def _refresh_in_background(self, key, fn):
+        with self._lock:
+            if key in self._refreshing or key in self._calls:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._do(key, fn)
+            except Exception as e:
+                # 갱신 실패 시 이전 값을 계속 사용합니다.
+                print(f"백그라운드 갱신 실패 ({key}): {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="singleflight-refresh", daemon=True).start()
+
+
+def single_flight(stale_while_revalidate=STALE_WHILE_REVALIDATE, fresh_ttl=0):
+    """
+    함수 호출을 인자 기준으로 합치는 데코레이터.
+    st.cache_data 위에 두어 캐시 미스가 동시에 몰려도 원본 호출은 1회만 일어나게 합니다.
+    (아래에 두면 만료된 값을 응답할 때 st.cache_data가 그 값을 다시 TTL만큼 캐싱합니다.)
+    백그라운드 갱신 때는 해당 인자의 st.cache_data 항목을 비운 뒤 다시 호출합니다.
+    """
+
+    def decorator(fn):
+        flight = SingleFlight(stale_while_revalidate, fresh_ttl)
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # 기본값을 채워 fn(t)와 fn(t, "1mo")가 같은 요청으로 합쳐지도록 합니다.
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = repr(tuple(bound.arguments.items()))
+
+            def refresh():
+                clear = getattr(fn, "clear", None)  # st.cache_data로 감싼 함수
+                if clear is not None:
+                    clear(*args, **kwargs)
+                return fn(*args, **kwargs)
+
+            return flight.do(key, lambda: fn(*args, **kwargs), refresh)
+
+        wrapper.flight = flight
+        return wrapper
+
+    return decorator
@@ -0,0 +1,98 @@
+# modules/symbols.py
+# 종목 코드 → 종목명 로컬 조회 테이블.
+# 관심 종목 등록 등에서 이름만 필요할 때 yfinance .info 같은 네트워크 호출 없이 이름을 찾습니다.
+import re
+import threading
+
+import FinanceDataReader as fdr
+import pandas as pd
+import streamlit as st
+
+KRX_BACKUP_URL = (
+    "https://raw.githubusercontent.com/corazzon/finance-data-analysis/main/krx.csv"
+)
+KRX_CODE_PATTERN = re.compile(r"^(\d{6})(?:\.(?:KS|KQ))?$")  # 005930, 005930.KS
+# KRX 시장 -> yfinance 티커 접미사
+MARKET_SUFFIX = {"KOSPI": ".KS", "KOSDAQ": ".KQ", "KONEX": ".KQ"}
+
+_names = {}  # 검색 결과 등에서 알게 된 심볼 -> 종목명
+_names_lock = threading.Lock()
+
+
+@st.cache_data
+def get_krx_list():
+    """
+    한국거래소(KRX) 상장 종목 전체 리스트를 가져와 캐싱합니다.
+    """
+    try:
+        df = fdr.StockListing("KRX")
+        return df[["Code", "Name", "Market"]]
+    except Exception as e:
+        st.warning(f"KRX Listing(FDR) 실패 → CSV 백업으로 폴백: {repr(e)}")
+
+        try:
+            df = pd.read_csv(KRX_BACKUP_URL)
+            if "Symbol" in df.columns and "Code" not in df.columns:
+                df = df.rename(columns={"Symbol": "Code"})
+            for col in ["Code", "Name", "Market"]:
+                if col not in df.columns:
+                    raise ValueError(
+                        f"백업 CSV에 {col} 컬럼이 없습니다. columns={df.columns.tolist()}"
+                    )
+            return df[["Code", "Name", "Market"]]
+        except Exception as e2:
+            st.error(f"KRX CSV 폴백도 실패: {repr(e2)}")
+            return pd.DataFrame()
+
+
+@st.cache_data
+def get_krx_index() -> dict:
+    """KRX 종목코드(6자리) -> {"name": 종목명, "suffix": yfinance 접미사}"""
+    df = get_krx_list()
+    if df.empty:
+        return {}
+    codes = df["Code"].astype(str).str.zfill(6)
+    return {
+        code: {"name": name, "suffix": MARKET_SUFFIX.get(market, "")}
+        for code, name, market in zip(codes, df["Name"], df["Market"])
+    }
+
+
+def remember_names(results):
+    """검색 결과({"symbol", "name", ...} 리스트)의 이름을 기억해 둡니다."""
+    with _names_lock:
+        for item in results:
+            if item.get("name"):
+                _names[item["symbol"].upper()] = item["name"]
+
+
+def resolve_name(ticker: str) -> str:
+    """
+    로컬 정보만으로 종목명을 찾습니다. (검색 결과 → KRX 상장 목록 순)
+    찾지 못하면 티커를 그대로 반환합니다.
+    """
+    ticker = ticker.upper().strip()
+    with _names_lock:
+        name = _names.get(ticker)
+    if name:
+        return name
+
+    match = KRX_CODE_PATTERN.match(ticker)
+    if match:
+        entry = get_krx_index().get(match.group(1))
+        if entry:
+            return entry["name"]
+    return ticker
+
+
+def normalize_ticker(ticker: str) -> str:
+    """
+    대문자/공백 정리 후, 접미사 없는 KRX 종목코드에는 시장 접미사(.KS/.KQ)를 붙입니다.
+    (CSV에서 숫자로 읽혀 앞자리 0이 빠진 코드도 6자리로 맞춤)
+    """
+    ticker = str(ticker).upper().strip()
+    if ticker.isdigit() and len(ticker) <= 6:
+        code = ticker.zfill(6)
+        entry = get_krx_index().get(code)
+        return code + (entry["suffix"] if entry else "")
+    return ticker
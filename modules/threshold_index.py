@@ -0,0 +1,121 @@
+# modules/threshold_index.py
+import threading
+from bisect import bisect_left, bisect_right
+
+
+class _SortedThresholds:
+    """가격 임계값을 정렬 상태로 유지하는 목록 (임계값과 규칙 ID를 나란히 보관)"""
+
+    def __init__(self):
+        self.prices = []
+        self.rule_ids = []
+
+    def add(self, price, rule_id):
+        pos = bisect_right(self.prices, price)
+        self.prices.insert(pos, price)
+        self.rule_ids.insert(pos, rule_id)
+
+    def remove(self, price, rule_id):
+        lo = bisect_left(self.prices, price)
+        hi = bisect_right(self.prices, price)
+        for pos in range(lo, hi):
+            if self.rule_ids[pos] == rule_id:
+                del self.prices[pos]
+                del self.rule_ids[pos]
+                return
+
+    def between(self, lo, hi):
+        """lo <= 위치 < hi 인 규칙 ID (bisect로 구한 위치 구간)"""
+        return self.rule_ids[lo:hi]
+
+
+class ThresholdIndex:
+    """
+    종목별 매수/매도 목표가를 정렬된 배열로 색인하여, 가격이 p0에서 p1로 움직일 때
+    새로 넘어선 규칙만 O(log n + k)에 찾아냅니다.
+
+    사이드바의 목표가 의미를 따릅니다.
+    - 매수 알림: 가격이 target_buy 이하로 내려옴 (p1 <= target_buy < p0)
+    - 매도 알림: 가격이 target_sell 이상으로 올라감 (p0 < target_sell <= p1)
+    - 목표가 0은 미설정으로 보고 색인하지 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buy = {}  # ticker -> _SortedThresholds
+        self._sell = {}  # ticker -> _SortedThresholds
+        self._rules = {}  # rule_id -> (ticker, target_buy, target_sell)
+        self._last_price = {}  # ticker -> 마지막으로 처리한 가격
+
+    def add_rule(self, rule_id, ticker, target_buy, target_sell):
+        """규칙을 추가합니다. 같은 ID가 있으면 교체합니다."""
+        with self._lock:
+            if self._rules.get(rule_id) == (ticker, target_buy, target_sell):
+                return  # 바뀐 것이 없으면 정렬 목록을 다시 만들지 않음
+            self._remove(rule_id)
+            if target_buy > 0:
+                self._buy.setdefault(ticker, _SortedThresholds()).add(target_buy, rule_id)
+            if target_sell > 0:
+                self._sell.setdefault(ticker, _SortedThresholds()).add(
+                    target_sell, rule_id
+                )
+            self._rules[rule_id] = (ticker, target_buy, target_sell)
+
+    def remove_rule(self, rule_id):
+        with self._lock:
+            self._remove(rule_id)
+
+    def _remove(self, rule_id):
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return
+        ticker, target_buy, target_sell = rule
+        if target_buy > 0:
+            self._buy[ticker].remove(target_buy, rule_id)
+        if target_sell > 0:
+            self._sell[ticker].remove(target_sell, rule_id)
+
+    def __len__(self):
+        return len(self._rules)
+
+    def rule_ids(self):
+        with self._lock:
+            return list(self._rules)
+
+    def crossed(self, ticker, p0, p1):
+        """
+        가격이 p0 → p1로 움직이며 넘어선 규칙을 반환합니다.
+        p0가 None이면(첫 시세) 현재 조건을 이미 만족하는 규칙을 모두 반환합니다.
+        Returns: {"buy": [rule_id, ...], "sell": [rule_id, ...]}
+        """
+        with self._lock:
+            buy = self._buy.get(ticker)
+            sell = self._sell.get(ticker)
+            result = {"buy": [], "sell": []}
+
+            if p0 is None:
+                if buy:
+                    result["buy"] = buy.between(bisect_left(buy.prices, p1), len(buy.prices))
+                if sell:
+                    result["sell"] = sell.between(0, bisect_right(sell.prices, p1))
+            elif p1 < p0 and buy:
+                result["buy"] = buy.between(
+                    bisect_left(buy.prices, p1), bisect_left(buy.prices, p0)
+                )
+            elif p1 > p0 and sell:
+                result["sell"] = sell.between(
+                    bisect_right(sell.prices, p0), bisect_right(sell.prices, p1)
+                )
+            return result
+
+    def on_price(self, ticker, price, report_initial=True):
+        """
+        새 시세를 반영하고 직전 시세 대비 넘어선 규칙을 반환합니다.
+        report_initial=False이면 종목의 첫 시세에서는 (넘어선 것이 아니므로) 아무것도 반환하지 않습니다.
+        """
+        with self._lock:
+            p0 = self._last_price.get(ticker)
+            self._last_price[ticker] = price
+        if p0 is None and not report_initial:
+            return {"buy": [], "sell": []}
+        return self.crossed(ticker, p0, price)
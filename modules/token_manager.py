@@ -0,0 +1,244 @@
+# modules/token_manager.py
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from filelock import FileLock, Timeout
+
+from modules.config import get_secret
+
+TOKEN_DIR = get_secret("KIS_TOKEN_DIR", ".")
+# 모의/실전, 접속 서버별로 토큰을 따로 보관 (endpoint: base_url 해시)
+TOKEN_FILE_TEMPLATE = "token_{mode}_{endpoint}.json"
+TOKEN_EXPIRE_HOURS = 23  # expires_in 응답이 없을 때의 유효 시간 (24시간보다 조금 짧게)
+TOKEN_REFRESH_AHEAD_MIN = 30  # 만료 30분 전에 백그라운드에서 미리 재발급
+TOKEN_RETRY_SEC = 60  # 발급 실패 시 재시도 간격 (KIS는 1분에 1회만 발급 허용)
+TOKEN_LOCK_TIMEOUT_SEC = 30  # 다른 프로세스가 발급 중일 때 기다리는 최대 시간
+TOKEN_HTTP_TIMEOUT_SEC = 10
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+class TokenIssueError(Exception):
+    """토큰 발급 응답을 받았지만 access_token이 없음 (키 오류 등)"""
+
+
+def _digest(value, length=None):
+    return hashlib.sha256(str(value).encode("utf-8")).hexdigest()[:length]
+
+
+def get_token_manager(mode, base_url, app_key, app_secret):
+    """
+    (모드, 접속 서버, 앱 키)별로 프로세스 안에서 하나의 TokenManager를 공유합니다.
+    같은 앱 키라도 로컬 모의 서버와 실제 서버의 토큰은 섞이지 않습니다.
+    """
+    key = (mode, base_url, app_key)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = TokenManager(mode, base_url, app_key, app_secret)
+            _managers[key] = manager
+        return manager
+
+
+class TokenManager:
+    """
+    KIS 접근 토큰 관리자.
+    - 메모리에 토큰을 보관하여 매 호출마다 파일/네트워크를 거치지 않음
+    - 토큰 파일과 파일 잠금으로 여러 프로세스(Streamlit 워커, 자동 매매 서비스 등)가 토큰을 공유
+    - 잠금을 잡은 뒤 파일을 다시 확인하므로 동시에 시작해도 /oauth2/tokenP 발급은 1회
+    - 만료 전에 백그라운드 스레드가 미리 재발급 (API 호출 경로에서는 발급하지 않음)
+    """
+
+    def __init__(self, mode, base_url, app_key, app_secret):
+        self.mode = mode
+        self.base_url = base_url
+        self.app_key = app_key
+        self.app_secret = app_secret
+
+        self.path = os.path.join(
+            TOKEN_DIR,
+            TOKEN_FILE_TEMPLATE.format(mode=mode, endpoint=_digest(base_url, 8)),
+        )
+        # 토큰 파일에는 앱 키 원문 대신 해시만 남겨 키가 바뀌었는지만 확인
+        self.app_key_hash = _digest(app_key)
+        self._file_lock = FileLock(self.path + ".lock", timeout=TOKEN_LOCK_TIMEOUT_SEC)
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._failed_at = float("-inf")
+
+        self.token = None
+        self.issued_at = None
+        self.expires_at = None
+
+    def _is_fresh(self, expires_at, now=None):
+        now = now or datetime.now()
+        return expires_at is not None and now < expires_at - timedelta(
+            minutes=TOKEN_REFRESH_AHEAD_MIN
+        )
+
+    def cached(self):
+        """메모리에 있는 유효한 토큰 (없거나 만료되었으면 None). I/O 없음"""
+        if self.token and self.expires_at and datetime.now() < self.expires_at:
+            return self.token
+        return None
+
+    def get_token(self):
+        """
+        유효한 토큰을 반환합니다. 메모리 → 토큰 파일 → 신규 발급 순으로 확인합니다.
+        발급에 실패하면 None을 반환합니다.
+        """
+        token = self.cached()
+        if token:
+            return token
+
+        with self._lock:
+            token = self.cached()
+            if token:
+                return token
+            # 직전 발급이 실패했다면 재시도 간격 동안은 호출마다 다시 발급하지 않음
+            if time.monotonic() - self._failed_at < TOKEN_RETRY_SEC:
+                return None
+            if not self._refresh(force=False):
+                self._failed_at = time.monotonic()
+            self._start_refresher()
+            return self.cached()
+
+    def _refresh(self, force):
+        """
+        파일 잠금 안에서 다른 프로세스가 이미 발급한 토큰이 있으면 그것을 쓰고, 없을 때만 발급합니다.
+        force=True이면 만료 임박 여부만 보고 판단합니다. (백그라운드 재발급)
+        """
+        try:
+            with self._file_lock:
+                stored = self._read_file()
+                if stored and (
+                    self._is_fresh(stored[2])
+                    or (not force and datetime.now() < stored[2])
+                ):
+                    self.token, self.issued_at, self.expires_at = stored
+                    return True
+
+                try:
+                    issued = self._issue()
+                except TokenIssueError as e:
+                    print(f"❌ {e}")
+                    return False
+                if issued is None:
+                    return False
+                self.token, self.issued_at, self.expires_at = issued
+                try:
+                    self._write_file()
+                except OSError as e:
+                    # 발급한 토큰은 이 프로세스에서 계속 사용 (다른 프로세스는 따로 발급)
+                    print(f"⚠️ 토큰 파일 저장 실패: {e}")
+                return True
+        except Timeout:
+            print("❌ 토큰 파일 잠금 대기 시간 초과")
+            return False
+
+    def _issue(self):
+        url = f"{self.base_url}/oauth2/tokenP"
+        body = {
+            "grant_type": "client_credentials",
+            "appkey": self.app_key,
+            "appsecret": self.app_secret,
+        }
+        try:
+            res = httpx.post(
+                url,
+                headers={"content-type": "application/json"},
+                content=json.dumps(body),
+                timeout=TOKEN_HTTP_TIMEOUT_SEC,
+            )
+            if res.status_code != 200:
+                print(f"❌ 토큰 발급 실패: {res.text}")
+                return None
+            data = res.json()
+        except Exception as e:
+            print(f"❌ 인증 중 오류 발생: {e}")
+            return None
+
+        token = data.get("access_token") if isinstance(data, dict) else None
+        if not token:
+            raise TokenIssueError(
+                f"토큰 발급 응답에 access_token이 없습니다: {res.text}"
+            )
+
+        issued_at = datetime.now()
+        expires_in = data.get("expires_in")
+        if expires_in:
+            expires_at = issued_at + timedelta(seconds=int(expires_in))
+        else:
+            expires_at = issued_at + timedelta(hours=TOKEN_EXPIRE_HOURS)
+        print("✅ 한국투자증권 토큰 발급 성공(새로 발급)")
+        return token, issued_at, expires_at
+
+    def _read_file(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            token = data.get("access_token")
+            issued_at = datetime.fromisoformat(data["issued_at"])
+            if data.get("expires_at"):
+                expires_at = datetime.fromisoformat(data["expires_at"])
+            else:
+                expires_at = issued_at + timedelta(hours=TOKEN_EXPIRE_HOURS)
+        except Exception:
+            return None
+        if not token or data.get("app_key_hash") != self.app_key_hash:
+            return None
+        return token, issued_at, expires_at
+
+    def _write_file(self):
+        # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "access_token": self.token,
+                    "issued_at": self.issued_at.isoformat(),
+                    "expires_at": self.expires_at.isoformat(),
+                    "app_key_hash": self.app_key_hash,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(tmp, self.path)
+
+    def _start_refresher(self):
+        if self._refresher is None or not self._refresher.is_alive():
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name=f"kis-token-{self.mode}", daemon=True
+            )
+            self._refresher.start()
+
+    def _refresh_loop(self):
+        while True:
+            try:
+                if self.expires_at is None:
+                    delay = TOKEN_RETRY_SEC
+                else:
+                    refresh_at = self.expires_at - timedelta(
+                        minutes=TOKEN_REFRESH_AHEAD_MIN
+                    )
+                    delay = max(0.0, (refresh_at - datetime.now()).total_seconds())
+                time.sleep(delay)
+
+                with self._lock:
+                    if self._is_fresh(self.expires_at):
+                        continue
+                    print("🔄 토큰 만료 임박 → 백그라운드 재발급")
+                    refreshed = self._refresh(force=True)
+            except Exception as e:
+                # 예외로 재발급 스레드가 끝나면 토큰이 만료된 뒤 복구되지 않음
+                print(f"❌ 토큰 백그라운드 재발급 오류: {e}")
+                refreshed = False
+            if not refreshed:
+                time.sleep(TOKEN_RETRY_SEC)
@@ -0,0 +1,221 @@
+# modules/trade_history.py
+import datetime
+import threading
+import time
+import uuid
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from modules.config import get_secret
+from modules.db import (
+    TRADES_TIMEZONE,
+    find_trade_owners,
+    insert_trades,
+    load_trades_between,
+    replace_order_trades,
+)
+from modules.trader import kis_ticker
+
+TRADE_FLUSH_SEC = 1.0  # 주문 기록을 모아서 DB에 쓰는 주기 (초)
+TRADE_BATCH_SIZE = 500  # 한 번에 쓰는 최대 기록 수
+TRADE_MAX_PENDING = 10_000  # DB 장애 시 메모리에 보관할 최대 기록 수
+# 증권사 체결 내역과 맞추는 주기 (초). 주문 시점 기록을 실제 체결 수량/가격으로 교체
+TRADE_SYNC_SEC = float(get_secret("TRADE_SYNC_SEC", 600))
+# 주문 기록이 없는 체결(HTS 등에서 직접 주문)을 기록할 사용자. 비어 있으면 건너뜀
+TRADE_DEFAULT_USER_ID = get_secret("TRADE_DEFAULT_USER_ID", "")
+
+TRADES_ZONE = ZoneInfo(TRADES_TIMEZONE)
+
+
+def _day_range(day):
+    start = datetime.datetime.combine(day, datetime.time(), TRADES_ZONE)
+    return start, start + datetime.timedelta(days=1)
+
+
+class TradeRecorder:
+    """
+    주문 성공 이벤트를 trades 테이블에 기록합니다. (KisTrader 주문 리스너)
+    주문 경로에서는 메모리 대기열에 넣기만 하고, 백그라운드 스레드가 모아서 한 번에 INSERT 합니다.
+    """
+
+    def __init__(self, flush_sec=TRADE_FLUSH_SEC, batch_size=TRADE_BATCH_SIZE):
+        self.flush_sec = flush_sec
+        self.batch_size = batch_size
+        self._cond = threading.Condition()
+        self._pending = []
+        self._writing = False
+        self._flush_requested = False
+        self.written = 0
+        self._writer = threading.Thread(
+            target=self._write_loop, name="trade-recorder", daemon=True
+        )
+        self._writer.start()
+
+    def attach(self, trader):
+        """KisTrader(또는 AsyncKisTrader)의 주문 성공 이벤트를 기록하도록 등록합니다."""
+        trader.add_order_listener(self.on_order)
+        return self
+
+    def on_order(self, event):
+        ts = event.get("ts") or datetime.datetime.now()
+        trade = {
+            "user_id": event.get("user_id") or "",
+            "executed_at": ts.astimezone(TRADES_ZONE),
+            "trade_id": event.get("order_no") or f"local-{uuid.uuid4().hex}",
+            # 체결 내역(pdno)과 같은 KIS 종목코드로 저장 (005930.KS → 005930)
+            "ticker": kis_ticker(event["ticker"]),
+            "side": event["order_type"],
+            "quantity": int(event["quantity"]),
+            "price": float(event.get("price") or 0),
+            "source": "order",
+        }
+        with self._cond:
+            self._pending.append(trade)
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """대기 중인 기록을 바로 쓰고 끝날 때까지 기다립니다."""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._writing, timeout=timeout
+            )
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._flush_requested
+                    or len(self._pending) >= self.batch_size,
+                    timeout=self.flush_sec,
+                )
+                self._flush_requested = bool(self._pending[self.batch_size :])
+                batch = self._pending[: self.batch_size]
+                del self._pending[: self.batch_size]
+                self._writing = bool(batch)
+            if batch:
+                self._write(batch)
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+    def _write(self, batch):
+        try:
+            self.written += insert_trades(batch)
+        except Exception as e:
+            print(f"체결 기록 저장 실패 ({len(batch)}건): {e}")
+            with self._cond:
+                # 다음 주기에 다시 시도 (오래된 기록부터 버려 메모리 사용량 제한)
+                self._pending[:0] = batch
+                del self._pending[: max(0, len(self._pending) - TRADE_MAX_PENDING)]
+            time.sleep(self.flush_sec)
+
+
+def execution_to_trade(row, user_id):
+    """일별 주문 체결 조회(output1) 한 행을 trades 기록으로 바꿉니다."""
+    executed_at = datetime.datetime.strptime(
+        row["ord_dt"] + row["ord_tmd"], "%Y%m%d%H%M%S"
+    ).replace(tzinfo=TRADES_ZONE)
+    return {
+        "user_id": user_id,
+        "executed_at": executed_at,
+        "trade_id": row["odno"],
+        "ticker": row["pdno"],
+        "side": "sell" if row["sll_buy_dvsn_cd"] == "01" else "buy",
+        "quantity": int(float(row["tot_ccld_qty"])),
+        "price": float(row["avg_prvs"]),
+        "source": "broker",
+    }
+
+
+def sync_executions(trader, day=None, default_user_id=TRADE_DEFAULT_USER_ID):
+    """
+    하루치 증권사 체결 내역으로 trades를 맞춥니다.
+    같은 주문번호로 주문 시점에 기록한 사용자에게 실제 체결 수량/가격을 기록하고,
+    주문 기록이 없는 체결은 default_user_id로 기록합니다. (비어 있으면 건너뜀)
+    Returns: 기록한 체결 수 (조회 실패 시 None)
+    """
+    day = day or datetime.datetime.now(TRADES_ZONE).date()
+    executions = trader.get_executions(day, day)
+    if executions is None:
+        return None
+
+    start, end = _day_range(day)
+    trade_ids = [row["odno"] for row in executions]
+    owners = find_trade_owners(trade_ids, start, end)
+    trades = []
+    for row in executions:
+        if row["odno"] in owners:
+            user_id = owners[row["odno"]]
+        elif default_user_id:
+            user_id = default_user_id
+        else:
+            continue
+        if int(float(row["tot_ccld_qty"] or 0)) > 0:
+            trades.append(execution_to_trade(row, user_id))
+    return replace_order_trades(list(owners), trades, start, end)
+
+
+class ExecutionSync:
+    """
+    TRADE_SYNC_SEC마다 오늘의 체결 내역을 맞춥니다. (매매 서비스 루프에서 호출)
+    recorder를 주면 동기화 전에 대기 중인 주문 기록을 먼저 저장하여 주문한 사용자를 찾을 수 있게 합니다.
+    """
+
+    def __init__(self, trader, recorder=None, interval=TRADE_SYNC_SEC):
+        self.trader = trader
+        self.recorder = recorder
+        self.interval = interval
+        self._last_sync = None
+        self._last_day = None
+
+    def maybe_sync(self):
+        today = datetime.datetime.now(TRADES_ZONE).date()
+        if self._last_day is not None and self._last_day != today:
+            # 날짜가 바뀌면 전날 마지막 동기화 이후의 체결분까지 한 번 더 맞춤
+            self._run(self._last_day)
+            self._last_sync = None
+        if (
+            self._last_sync is None
+            or time.monotonic() - self._last_sync >= self.interval
+        ):
+            self._run(today)
+        self._last_day = today
+
+    def _run(self, day):
+        self._last_sync = time.monotonic()
+        if self.recorder is not None:
+            self.recorder.flush(timeout=TRADE_FLUSH_SEC * 5)
+        try:
+            count = sync_executions(self.trader, day)
+        except Exception as e:
+            print(f"체결 내역 동기화 실패 ({day}): {e}")
+            return
+        if count is not None:
+            print(f"체결 내역 동기화 ({day}): {count}건")
+
+
+def load_day_trades(user_id, day):
+    """하루치 체결 기록 (시간 순)"""
+    return load_trades_between(user_id, *_day_range(day))
+
+
+def trades_dataframe(trades):
+    """체결 기록을 화면/PDF 표시용 DataFrame으로 바꿉니다."""
+    return pd.DataFrame(
+        {
+            "시간": [
+                t["executed_at"].astimezone(TRADES_ZONE).strftime("%Y-%m-%d %H:%M:%S")
+                for t in trades
+            ],
+            "종목": [t["ticker"] for t in trades],
+            "주문": ["매수" if t["side"] == "buy" else "매도" for t in trades],
+            "가격": [t["price"] for t in trades],
+            "수량": [t["quantity"] for t in trades],
+            # order: 주문 시점 기록(체결 확인 전), broker: 증권사 체결 내역
+            "구분": ["체결" if t["source"] == "broker" else "주문" for t in trades],
+        }
+    )
@@ -1,19 +1,117 @@
 # modules/trader.py
-import os
-import requests
 import json
-from datetime import datetime, timedelta
+import time
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+
+import httpx
 
 from modules.config import get_secret
+from modules.token_manager import get_token_manager
 
-TOKEN_FILE = "token.json"
-TOKEN_SAFETY_MIN = 5  # 만료 5분 전이면 갱신
-TOKEN_EXPIRE_HOURS = 23  # 24시간보다 조금 짧게
+# HTTP 연결 풀 설정 (keep-alive로 주문마다 TLS 연결을 새로 맺지 않도록)
+HTTP_CONNECT_TIMEOUT_SEC = 3
+HTTP_READ_TIMEOUT_SEC = 10
+HTTP_POOL_MAX_CONNECTIONS = 10
+HTTP_POOL_MAX_KEEPALIVE = 10
+HTTP_KEEPALIVE_EXPIRY_SEC = 60
+TIMING_HISTORY_SIZE = 200  # 보관할 최근 호출 시간 기록 수
+TIMING_KEYS = ("total_ms", "connect_ms", "tls_ms", "send_ms", "wait_ms", "receive_ms")
+THROTTLE_MSG_CODES = ("EGW00201",)  # 초당 거래건수를 초과하였습니다.
+BALANCE_MAX_PAGES = 100  # 잔고 연속 조회 최대 페이지 수 (무한 반복 방지)
+EXECUTION_MAX_PAGES = 100  # 체결 내역 연속 조회 최대 페이지 수
+KRX_YF_SUFFIXES = (".KS", ".KQ")  # yfinance의 국내 시장 접미사 (KIS 종목코드에는 없음)
 
 
-class KisTrader:
+def kis_ticker(ticker):
+    """yfinance 심볼(005930.KS)을 KIS 종목코드(005930)로 바꿉니다. 그 밖의 티커는 그대로 반환"""
+    ticker = str(ticker).strip().upper()
+    for suffix in KRX_YF_SUFFIXES:
+        if ticker.endswith(suffix):
+            return ticker[: -len(suffix)]
+    return ticker
+
+
+class BalanceInquiryError(Exception):
+    """잔고 연속 조회 도중 실패하여 일부 페이지만 받은 경우 (마지막 페이지와 구분하기 위함)"""
+
+
+class _CallTimer:
     """
-    한국투자증권(KIS) REST API 연동 클래스
+    httpx trace 이벤트로 호출 1건의 단계별 소요 시간(ms)을 기록합니다.
+    connect/tls 단계가 없으면 keep-alive 연결을 재사용한 호출입니다.
+    """
+
+    PHASES = {
+        "connect_tcp": "connect_ms",
+        "start_tls": "tls_ms",
+        "send_request_headers": "send_ms",
+        "send_request_body": "send_ms",
+        "receive_response_headers": "wait_ms",
+        "receive_response_body": "receive_ms",
+    }
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.phases = {}
+        self._open = {}
+
+    async def atrace(self, event_name, info):
+        # AsyncClient는 코루틴 trace 콜백을 요구합니다.
+        self.trace(event_name, info)
+
+    def trace(self, event_name, info):
+        # 예: "connection.connect_tcp.started", "http11.receive_response_headers.complete"
+        _, step, state = event_name.rsplit(".", 2)
+        phase = self.PHASES.get(step)
+        if phase is None:
+            return
+        now = time.perf_counter()
+        if state == "started":
+            self._open[step] = now
+        elif state == "complete" and step in self._open:
+            elapsed = (now - self._open.pop(step)) * 1000
+            self.phases[phase] = self.phases.get(phase, 0.0) + elapsed
+
+    def finish(self, status_code=None):
+        return {
+            "name": self.name,
+            "status": status_code,
+            "total_ms": (time.perf_counter() - self.started) * 1000,
+            "reused": "connect_ms" not in self.phases,
+            **self.phases,
+        }
+
+
+def is_throttled(status_code, msg_cd=None):
+    """초당 호출 한도 초과 응답인지 확인합니다. (msg_cd 없이 상태 코드만으로도 판단)"""
+    return status_code == 429 or msg_cd in THROTTLE_MSG_CODES
+
+
+def balance_tr_id(mode):
+    """잔고 조회 TR ID (모의투자와 실전투자 TR ID가 다름)"""
+    return "VTTC8434R" if mode == "VIRTUAL" else "TTTC8434R"
+
+
+def daily_execution_tr_id(mode):
+    """일별 주문 체결 조회 TR ID (3개월 이내)"""
+    return "VTTC8001R" if mode == "VIRTUAL" else "TTTC8001R"
+
+
+def order_tr_id(mode, order_type):
+    """현금 주문 TR ID (매수/매도, 모의/실전 구분)"""
+    if mode == "VIRTUAL":
+        return "VTTC0802U" if order_type == "buy" else "VTTC0801U"
+    return "TTTC0802U" if order_type == "buy" else "TTTC0801U"
+
+
+class AsyncKisTrader:
+    """
+    한국투자증권(KIS) REST API 연동 클래스 (asyncio 버전)
+    여러 종목의 주문/조회를 동시에 보낼 때 사용합니다. 동기 코드에서는 KisTrader를 사용하세요.
     """
 
     def __init__(self):
@@ -23,120 +121,161 @@ class KisTrader:
         self.account_no = get_secret("KIS_ACCOUNT_NO")  # 계좌번호 앞 8자리
         self.account_code = get_secret("KIS_ACCOUNT_CODE", "01")  # 계좌번호 뒤 2자리
 
-        # 모의투자 vs 실전투자 URL 설정
-        if self.mode == "PROD":
+        # 모의투자 vs 실전투자 URL 설정 (KIS_BASE_URL이 있으면 우선, 예: 로컬 모의 서버)
+        self.base_url = get_secret("KIS_BASE_URL")
+        if self.base_url:
+            self.base_url = self.base_url.rstrip("/")
+        elif self.mode == "PROD":
             self.base_url = "https://openapi.koreainvestment.com:9443"
         else:
             self.base_url = "https://openapivts.koreainvestment.com:29443"
 
-        self.access_token = None
-        self._auth()  # 초기화 시 바로 인증 토큰 발급 시도
-
-    def _auth(self):
+        # 모든 API 호출이 공유하는 keep-alive 연결 풀
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                HTTP_READ_TIMEOUT_SEC, connect=HTTP_CONNECT_TIMEOUT_SEC
+            ),
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SEC,
+            ),
+        )
+        self.timings = deque(maxlen=TIMING_HISTORY_SIZE)
+
+        self.tokens = get_token_manager(
+            self.mode, self.base_url, self.app_key, self.app_secret
+        )
+        self._order_listeners = []
+
+    def add_order_listener(self, listener):
         """
-        접근 토큰(Access Token) 발급 (1일 1회 갱신 필요)
+        주문 성공 시 호출할 함수를 등록합니다. (계좌 캐시, 주문 기록 등)
+        listener(event) - event: {"ticker", "quantity", "price", "order_type",
+                                  "order_no", "user_id", "ts"}
         """
-        # 1️⃣ 캐시된 토큰 먼저 확인
-
-        cached_token, issued_at = self._load_cached_token()
-        if cached_token:
-            self.access_token = cached_token
-            self.token_issued_at = issued_at  # issue 날짜 저장
-            print("♻️ 캐시된 토큰 사용")
-            return
-
-        # 2️⃣ 없으면 새로 발급
-        url = f"{self.base_url}/oauth2/tokenP"
-        headers = {"content-type": "application/json"}
-        body = {
-            "grant_type": "client_credentials",
-            "appkey": self.app_key,
-            "appsecret": self.app_secret,
-        }
-
-        try:
-            res = requests.post(url, headers=headers, data=json.dumps(body))
-            if res.status_code == 200:
-                self.access_token = res.json()["access_token"]
-                self.token_issued_at = datetime.now()
-                self._save_token(self.access_token)  # 토큰 저장
-                print("✅ 한국투자증권 토큰 발급 성공(새로 발급)")
-            else:
-                print(f"❌ 토큰 발급 실패: {res.text}")
-                self.access_token = None
-                self.token_issued_at = None
-        except Exception as e:
-            print(f"❌ 인증 중 오류 발생: {e}")
-            self.access_token = None
-            self.token_issued_at = None
-
-    def _load_cached_token(self):
-        if not os.path.exists(TOKEN_FILE):
-            return None, None
-
+        self._order_listeners.append(listener)
+
+    def remove_order_listener(self, listener):
+        if listener in self._order_listeners:
+            self._order_listeners.remove(listener)
+
+    def _notify_order(self, event):
+        for listener in list(self._order_listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                # 리스너 오류가 주문 결과에 영향을 주지 않도록 로그만 남김
+                print(f"주문 리스너 오류: {e}")
+
+    @classmethod
+    async def create(cls):
+        """객체 생성 후 바로 인증 토큰 발급까지 시도합니다."""
+        trader = cls()
+        await trader._auth()
+        return trader
+
+    async def _request(self, method, url, name, **kwargs):
+        """
+        연결 풀을 통해 요청을 보내고 단계별 소요 시간을 self.timings에 기록합니다.
+        """
+        timer = _CallTimer(name)
+        status_code = None
         try:
-            with open(TOKEN_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            token = data.get("access_token")
-            issued_at = datetime.fromisoformat(data["issued_at"])
+            res = await self.client.request(
+                method, url, extensions={"trace": timer.atrace}, **kwargs
+            )
+            status_code = res.status_code
+            return res
+        finally:
+            self.timings.append(timer.finish(status_code))
 
-            if not token or not issued_at:
-                return None, None
+    def timing_summary(self):
+        """
+        API별 최근 호출 시간 요약 (연결 재사용 확인용)
+        Returns: dict[str, dict] - {"send_order": {"count", "reuse_rate", "avg_total_ms", ...}, ...}
+        """
+        summary = {}
+        for t in self.timings:
+            s = summary.setdefault(t["name"], {"count": 0, "reused": 0, "totals": {}})
+            s["count"] += 1
+            s["reused"] += t["reused"]
+            for key in TIMING_KEYS:
+                s["totals"][key] = s["totals"].get(key, 0.0) + t.get(key, 0.0)
 
-            if datetime.now() - issued_at < timedelta(hours=TOKEN_EXPIRE_HOURS):
-                return token, issued_at
+        return {
+            name: {
+                "count": s["count"],
+                "reuse_rate": s["reused"] / s["count"],
+                **{f"avg_{k}": v / s["count"] for k, v in s["totals"].items()},
+            }
+            for name, s in summary.items()
+        }
 
-        except Exception:
-            return None, None
+    async def aclose(self):
+        await self.client.aclose()
 
-        return None, None
+    async def _auth(self):
+        """
+        접근 토큰(Access Token) 확보 (TokenManager가 메모리/토큰 파일/신규 발급 순으로 처리)
+        """
+        # 파일 잠금 대기나 발급 요청이 이벤트 루프를 막지 않도록 별도 스레드에서 실행
+        await asyncio.to_thread(self.tokens.get_token)
 
-    def _save_token(self, token: str):
-        with open(TOKEN_FILE, "w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "access_token": token,
-                    "issued_at": datetime.now().isoformat(),
-                },
-                f,
-                ensure_ascii=False,
-                indent=2,
-            )
+    @property
+    def access_token(self):
+        return self.tokens.token
 
-    def _ensure_token(self):
-        if not self.access_token or not self.token_issued_at:
-            self._auth()
-            return
+    @property
+    def token_issued_at(self):
+        return self.tokens.issued_at
 
-        # issued_at 기준 23시간 초과 시 재발급
-        if datetime.now() - self.token_issued_at >= timedelta(hours=TOKEN_EXPIRE_HOURS):
-            print("🔄 토큰 23시간 초과 → 재발급")
-            self._auth()
+    async def _ensure_token(self):
+        # 만료 전 재발급은 TokenManager의 백그라운드 스레드가 담당하므로 보통은 메모리 확인만 합니다.
+        if not self.tokens.cached():
+            await self._auth()
 
-    def _get_common_headers(self, tr_id):
+    async def _get_common_headers(self, tr_id, tr_cont=""):
         """
         API 호출에 필요한 공통 헤더 생성
+        tr_cont: 연속 조회 시 "N"
         """
-        self._ensure_token()
+        await self._ensure_token()
         return {
             "content-type": "application/json; charset=utf-8",
             "authorization": f"Bearer {self.access_token}",
             "appkey": self.app_key,
             "appsecret": self.app_secret,
             "tr_id": tr_id,
+            "tr_cont": tr_cont,
         }
 
-    def get_balance(self):
+    async def get_balance(self):
         """
         주식 잔고 조회 (TTTC8434R: 주식잔고조회_실전 / VTTC8434R: 주식잔고조회_모의)
+        연속 조회 키를 따라 모든 페이지의 보유 종목을 모아 반환합니다.
+        Returns: (output1 보유 종목 리스트, output2 계좌 총 자산 현황)
         """
-        url = f"{self.base_url}/uapi/domestic-stock/v1/trading/inquire-balance"
-
-        # 모의투자와 실전투자 TR ID가 다름
-        tr_id = "VTTC8434R" if self.mode == "VIRTUAL" else "TTTC8434R"
+        holdings, summary = [], []
+        try:
+            async for page, page_summary in self.iter_balance_pages():
+                holdings.extend(page)
+                summary = page_summary or summary
+        except BalanceInquiryError as e:
+            # 일부 페이지만 받은 잔고는 전체 잔고로 쓰지 않음 (첫 페이지 실패와 같게 처리)
+            print(f"잔고 조회 중단: {e}")
+            return [], []
+        return holdings, summary
 
-        headers = self._get_common_headers(tr_id)
+    async def iter_balance_pages(self):
+        """
+        잔고 조회 결과를 페이지 단위로 내보내는 비동기 제너레이터.
+        응답 헤더 tr_cont가 F/M이면 CTX_AREA_FK100/NK100 연속 조회 키로 다음 페이지를 요청합니다.
+        첫 페이지 조회에 실패하면 아무것도 내보내지 않고 끝나며, 그 뒤 페이지에서 실패하면
+        BalanceInquiryError를 발생시킵니다. (일부 페이지만 받은 잔고를 전체로 오인하지 않도록)
+        Yields: (output1 보유 종목 페이지, output2 계좌 총 자산 현황)
+        """
+        url = f"{self.base_url}/uapi/domestic-stock/v1/trading/inquire-balance"
 
         params = {
             "CANO": self.account_no,
@@ -151,54 +290,147 @@ class KisTrader:
             "CTX_AREA_FK100": "",
             "CTX_AREA_NK100": "",
         }
+        tr_cont = ""
+
+        for page_no in range(1, BALANCE_MAX_PAGES + 1):
+            headers = await self._get_common_headers(balance_tr_id(self.mode), tr_cont)
+            error = None
+            try:
+                res = await self._request(
+                    "GET", url, "get_balance", headers=headers, params=params
+                )
+                data = res.json()
+                if res.status_code != 200 or data.get("rt_cd") != "0":
+                    error = f"잔고 조회 실패: {data.get('msg1')}"
+            except Exception as e:
+                error = f"잔고 조회 에러: {e}"
+            if error:
+                if page_no > 1:
+                    raise BalanceInquiryError(f"{page_no} 페이지 {error}")
+                print(error)
+                return
+
+            # output1: 보유 종목 리스트, output2: 계좌 총 자산 현황
+            yield data.get("output1") or [], data.get("output2") or []
+
+            # F/M: 다음 페이지 있음, D/E: 마지막 페이지
+            if res.headers.get("tr_cont") not in ("F", "M"):
+                return
+            params["CTX_AREA_FK100"] = data.get("ctx_area_fk100", "")
+            params["CTX_AREA_NK100"] = data.get("ctx_area_nk100", "")
+            tr_cont = "N"
+
+        raise BalanceInquiryError(
+            f"잔고 조회 페이지가 {BALANCE_MAX_PAGES}개를 넘어 중단합니다."
+        )
+
+    async def get_executions(self, start_date, end_date):
+        """
+        주식 일별 주문 체결 조회 (TTTC8001R: 실전 / VTTC8001R: 모의, 최근 3개월)
+        Args: start_date, end_date - datetime.date (조회 기간, 양 끝 포함)
+        Returns: list - 체결된 주문의 output1 행 (odno, ord_dt, ord_tmd, pdno,
+                 sll_buy_dvsn_cd, tot_ccld_qty, avg_prvs 등). 실패 시 None
+        """
+        url = f"{self.base_url}/uapi/domestic-stock/v1/trading/inquire-daily-ccld"
+        params = {
+            "CANO": self.account_no,
+            "ACNT_PRDT_CD": self.account_code,
+            "INQR_STRT_DT": start_date.strftime("%Y%m%d"),
+            "INQR_END_DT": end_date.strftime("%Y%m%d"),
+            "SLL_BUY_DVSN_CD": "00",  # 전체
+            "INQR_DVSN": "00",  # 역순
+            "PDNO": "",
+            "CCLD_DVSN": "01",  # 체결된 주문만
+            "ORD_GNO_BRNO": "",
+            "ODNO": "",
+            "INQR_DVSN_3": "00",
+            "INQR_DVSN_1": "",
+            "CTX_AREA_FK100": "",
+            "CTX_AREA_NK100": "",
+        }
+        tr_cont = ""
+        executions = []
 
-        try:
-            res = requests.get(url, headers=headers, params=params)
-            data = res.json()
-            if res.status_code == 200 and data["rt_cd"] == "0":
-                # output1: 보유 종목 리스트, output2: 계좌 총 자산 현황
-                return data["output1"], data["output2"]
-            else:
-                print(f"잔고 조회 실패: {data.get('msg1')}")
-                return [], []
-        except Exception as e:
-            print(f"잔고 조회 에러: {e}")
-            return [], []
-
-    def send_order(self, ticker, quantity, price, order_type="buy"):
+        for _ in range(EXECUTION_MAX_PAGES):
+            headers = await self._get_common_headers(
+                daily_execution_tr_id(self.mode), tr_cont
+            )
+            try:
+                res = await self._request(
+                    "GET", url, "get_executions", headers=headers, params=params
+                )
+                data = res.json()
+            except Exception as e:
+                print(f"체결 내역 조회 에러: {e}")
+                return None
+            if res.status_code != 200 or data.get("rt_cd") != "0":
+                print(f"체결 내역 조회 실패: {data.get('msg1')}")
+                return None
+
+            executions.extend(data.get("output1") or [])
+            if res.headers.get("tr_cont") not in ("F", "M"):
+                return executions
+            params["CTX_AREA_FK100"] = data.get("ctx_area_fk100", "")
+            params["CTX_AREA_NK100"] = data.get("ctx_area_nk100", "")
+            tr_cont = "N"
+
+        print(f"체결 내역 조회 페이지가 {EXECUTION_MAX_PAGES}개를 넘어 중단합니다.")
+        return executions
+
+    async def send_order(self, ticker, quantity, price, order_type="buy", user_id=None):
         """
         주문 실행 (지정가 기준)
         Args:
-            ticker: 종목코드 (6자리)
+            ticker: 종목코드 (6자리, yfinance 심볼 005930.KS도 가능)
             quantity: 수량
             price: 가격 (0이면 시장가)
             order_type: 'buy' (매수) or 'sell' (매도)
+        Returns: bool - 주문 성공 여부 (상세 결과는 place_order 사용)
+        """
+        result = await self.place_order(ticker, quantity, price, order_type, user_id)
+        return result["success"]
+
+    async def place_order(
+        self, ticker, quantity, price, order_type="buy", user_id=None
+    ):
+        """
+        send_order와 같은 주문을 실행하고 응답 상세를 반환합니다.
+        throttled: 한도 초과(429/EGW00201)로 거부되어 다시 보내도 되는 주문
+        unknown: 전송 후 응답을 받지 못했거나 해석할 수 없어 접수 여부를 모르는 주문.
+                 주문은 멱등이 아니므로 다시 보내기 전에 체결 내역/잔고로 확인해야 합니다.
+        Returns: dict - {"success", "throttled", "unknown", "status_code", "msg_cd", "msg1", "order_no"}
         """
+        result = {
+            "success": False,
+            "throttled": False,
+            "unknown": False,
+            "status_code": None,
+            "msg_cd": None,
+            "msg1": None,
+            "order_no": None,
+        }
+
         # 입력값 검증
+        error = None
         if not ticker or not isinstance(ticker, str):
-            print("❌ 유효하지 않은 종목코드")
-            return False
-        ticker = ticker.strip()
-        if not isinstance(quantity, (int, float)) or quantity <= 0:
-            print("❌ 수량은 양수여야 합니다")
-            return False
+            error = "❌ 유효하지 않은 종목코드"
+        elif not isinstance(quantity, (int, float)) or quantity <= 0:
+            error = "❌ 수량은 양수여야 합니다"
+        elif price < 0:
+            error = "❌ 가격은 0 이상이어야 합니다"
+        elif order_type not in ("buy", "sell"):
+            error = "❌ order_type은 'buy' 또는 'sell'이어야 합니다"
+        if error:
+            print(error)
+            result["msg1"] = error
+            return result
+        # 자동 매매 규칙은 yfinance 심볼(005930.KS)로 저장되므로 KIS 종목코드로 바꿔 주문
+        ticker = kis_ticker(ticker)
         quantity = int(quantity)
-        if price < 0:
-            print("❌ 가격은 0 이상이어야 합니다")
-            return False
-        if order_type not in ("buy", "sell"):
-            print("❌ order_type은 'buy' 또는 'sell'이어야 합니다")
-            return False
 
         url = f"{self.base_url}/uapi/domestic-stock/v1/trading/order-cash"
 
-        # TR ID 설정 (매수/매도 구분)
-        if self.mode == "VIRTUAL":
-            tr_id = "VTTC0802U" if order_type == "buy" else "VTTC0801U"
-        else:
-            tr_id = "TTTC0802U" if order_type == "buy" else "TTTC0801U"
-
-        headers = self._get_common_headers(tr_id)
+        headers = await self._get_common_headers(order_tr_id(self.mode, order_type))
 
         data = {
             "CANO": self.account_no,
@@ -214,14 +446,151 @@ class KisTrader:
             data["ORD_DVSN"] = "00"
 
         try:
-            res = requests.post(url, headers=headers, data=json.dumps(data))
-            result = res.json()
-            if result["rt_cd"] == "0":
-                print(f"✅ {order_type} 주문 성공: {result['msg1']}")
-                return True
+            res = await self._request(
+                "POST", url, "send_order", headers=headers, content=json.dumps(data)
+            )
+            result["status_code"] = res.status_code
+            # 한도 초과(429)는 본문이 JSON이 아닐 수 있으므로 상태 코드로 먼저 판단
+            result["throttled"] = is_throttled(res.status_code)
+            try:
+                body = res.json()
+            except ValueError:
+                body = None
+            if not isinstance(body, dict) or "rt_cd" not in body:
+                # 게이트웨이 오류(5xx) 등: 증권사가 이미 주문을 접수했을 수 있으므로 실패로 단정하지 않음
+                result["unknown"] = not result["throttled"]
+                result["msg1"] = f"HTTP {res.status_code} 응답을 해석할 수 없습니다"
+                print(f"❓ 주문 결과 확인 불가: {result['msg1']}")
+                return result
+            result["msg_cd"] = body.get("msg_cd")
+            result["msg1"] = body.get("msg1")
+            result["throttled"] = is_throttled(res.status_code, result["msg_cd"])
+            if body.get("rt_cd") == "0":
+                result["success"] = True
+                result["order_no"] = (body.get("output") or {}).get("ODNO")
+                print(f"✅ {order_type} 주문 성공: {body.get('msg1')}")
+                self._notify_order(
+                    {
+                        "ticker": ticker,
+                        "quantity": quantity,
+                        "price": price,
+                        "order_type": order_type,
+                        "order_no": result["order_no"],
+                        "user_id": user_id,
+                        "ts": datetime.now(),
+                    }
+                )
             else:
-                print(f"❌ 주문 실패: {result['msg1']}")
-                return False
+                print(f"❌ 주문 실패: {body.get('msg1')}")
         except Exception as e:
             print(f"❌ 주문 중 에러: {e}")
-            return False
+            result["msg1"] = str(e)
+            # 연결 자체를 맺지 못한 경우만 주문이 전송되지 않았음이 확실함
+            result["unknown"] = not isinstance(
+                e, (httpx.ConnectError, httpx.ConnectTimeout)
+            )
+        return result
+
+    async def gather_orders(self, orders):
+        """
+        여러 주문을 동시에 실행합니다.
+        Args:
+            orders: [{"ticker", "quantity", "price", "order_type", "user_id"}, ...]
+                (user_id는 선택. 주문 이벤트 리스너에 그대로 전달됩니다)
+        Returns: list[bool] - 주문 순서대로의 성공 여부
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    self.send_order(
+                        o["ticker"],
+                        o["quantity"],
+                        o.get("price", 0),
+                        o.get("order_type", "buy"),
+                        user_id=o.get("user_id"),
+                    )
+                    for o in orders
+                )
+            )
+        )
+
+
+class KisTrader:
+    """
+    한국투자증권(KIS) REST API 연동 클래스
+    전용 이벤트 루프 스레드에서 AsyncKisTrader를 실행하는 동기 래퍼입니다.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="kis-trader-loop", daemon=True
+        )
+        self._thread.start()
+
+        self._async = AsyncKisTrader()
+        self._run(self._async._auth())  # 초기화 시 바로 인증 토큰 발급 시도
+
+    def _run(self, coro):
+        if threading.current_thread() is self._thread:
+            raise RuntimeError(
+                "KisTrader 이벤트 루프 안에서는 AsyncKisTrader를 직접 사용하세요."
+            )
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def __getattr__(self, name):
+        if name == "_async":
+            raise AttributeError(name)
+        # mode, base_url, access_token, timings 등 설정/상태 값은 비동기 객체의 값을 그대로 노출
+        return getattr(self._async, name)
+
+    def get_balance(self):
+        """
+        주식 잔고 조회 (TTTC8434R: 주식잔고조회_실전 / VTTC8434R: 주식잔고조회_모의)
+        """
+        return self._run(self._async.get_balance())
+
+    def iter_balance(self):
+        """
+        잔고를 페이지 단위로 조회하는 제너레이터. 다음 페이지는 소비하는 시점에 요청합니다.
+        Yields: (output1 보유 종목 페이지, output2 계좌 총 자산 현황)
+        Raises: BalanceInquiryError - 첫 페이지 이후 조회에 실패한 경우
+        """
+        pages = self._async.iter_balance_pages()
+        try:
+            while True:
+                try:
+                    yield self._run(pages.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._run(pages.aclose())
+
+    def get_executions(self, start_date, end_date):
+        """기간 내 체결된 주문 목록 (AsyncKisTrader.get_executions 참고)"""
+        return self._run(self._async.get_executions(start_date, end_date))
+
+    def send_order(self, ticker, quantity, price, order_type="buy", user_id=None):
+        """
+        주문 실행 (지정가 기준, 0이면 시장가). 성공 여부를 반환합니다.
+        """
+        return self._run(
+            self._async.send_order(ticker, quantity, price, order_type, user_id)
+        )
+
+    def place_order(self, ticker, quantity, price, order_type="buy", user_id=None):
+        """주문을 실행하고 응답 상세(dict)를 반환합니다. (AsyncKisTrader.place_order 참고)"""
+        return self._run(
+            self._async.place_order(ticker, quantity, price, order_type, user_id)
+        )
+
+    def gather_orders(self, orders):
+        """여러 주문을 동시에 실행하고 주문 순서대로의 성공 여부를 반환합니다."""
+        return self._run(self._async.gather_orders(orders))
+
+    def timing_summary(self):
+        return self._async.timing_summary()
+
+    def close(self):
+        self._run(self._async.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -0,0 +1,342 @@
+# modules/trading_service.py
+# 브라우저 탭과 무관하게 동작하는 백그라운드 자동 매매 서비스.
+# DB(auto_trade_rules)에 등록된 모든 (사용자, 종목, 목표가) 규칙을 하나의 스케줄러 루프에서
+# 감시하고, 조건 충족 시 주문 대기열(OrderQueue)을 거쳐 KisTrader로 주문한 뒤 상태를 DB에 기록합니다.
+# 가격이 목표가를 새로 넘어선 규칙에는 주문 여부와 별개로 도달 알림을 남깁니다. (ThresholdIndex)
+# Streamlit UI는 규칙을 등록하고 이 서비스가 기록한 상태만 읽습니다.
+#
+# 실행: python -m modules.trading_service
+import time
+from datetime import datetime, timedelta
+
+from modules.account_state import AccountCache
+from modules.db import ensure_schema, load_active_trade_rules, save_trade_rule_states
+from modules.order_journal import OrderJournal
+from modules.order_queue import OrderQueue
+from modules.price_stream import PRICE_POLL_SEC, create_price_source
+from modules.rule_engine import RuleTable
+from modules.threshold_index import ThresholdIndex
+from modules.trade_history import TRADES_ZONE, ExecutionSync, TradeRecorder
+from modules.trader import KisTrader, kis_ticker
+
+RULE_RELOAD_SEC = 10  # DB에서 규칙 목록을 다시 읽는 주기 (초)
+# 결과를 모르는 주문을 체결 내역과 맞추기 전에 기다리는 시간 (체결 내역 반영 지연)
+UNKNOWN_ORDER_CHECK_SEC = 30
+ORDER_CLOCK_SKEW_SEC = 60  # 주문 의도 기록 시각과 증권사 주문 시각의 허용 오차
+
+
+def evaluate_target_rule(price, target_buy, target_sell, bought):
+    """
+    목표가 매수/매도 규칙을 평가합니다. (단일 규칙 기준 정의, RuleTable은 이를 벡터화한 것)
+    - 매수: 목표 매수가가 설정되어 있고 현재가 <= 목표 매수가이며 아직 매수하지 않은 상태
+    - 매도: 목표 매도가가 설정되어 있고 현재가 >= 목표 매도가이며 보유 중인 상태
+    매수 조건 구간에서는 매도 조건을 확인하지 않습니다.
+    Returns: 'buy' | 'sell' | None
+    """
+    if target_buy > 0 and price <= target_buy:
+        return None if bought else "buy"
+    if target_sell > 0 and price >= target_sell:
+        return "sell" if bought else None
+    return None
+
+
+class TradingService:
+    """
+    등록된 모든 자동 매매 규칙을 주기적으로 평가하는 스케줄러.
+    규칙은 RuleTable에 배열로 보관하여 틱마다 한 번의 벡터 연산으로 평가합니다.
+    """
+
+    def __init__(self, trader=None, source=None, interval=PRICE_POLL_SEC):
+        self.trader = trader or KisTrader()
+        self.orders = OrderQueue(self.trader)
+        self.account = AccountCache(self.trader)
+        # 주문 선행 기록: 전송 전에 주문 의도를 디스크에 남겨, 전송 직후 중단되어도
+        # 재시작 시 매수 상태를 복원하여 중복 매수를 막음 (리스너 대신 run_once에서 직접 기록)
+        self.journal = OrderJournal()
+        # 체결 기록: 주문 성공 시 바로 남기고, 주기적으로 증권사 체결 내역으로 교체
+        self.trades = TradeRecorder().attach(self.trader)
+        self.executions = ExecutionSync(self.trader, self.trades)
+        self.source = source or create_price_source()
+        self.interval = interval
+        self.table = RuleTable()
+        # 목표가 도달 알림: 틱마다 전체 규칙이 아니라 직전 시세 대비 넘어선 규칙만 찾음
+        self.alerts = ThresholdIndex()
+        self._last_reload = 0.0
+        # 이 서비스가 접수를 확인한 주문번호 (결과 미확인 주문을 체결 내역과 대조할 때 제외)
+        self._order_nos = set()
+
+    def reload_rules(self):
+        """
+        DB의 규칙 목록으로 규칙 테이블을 다시 만듭니다.
+        매수 상태는 주문 기록(OrderJournal)에 있으면 그 값을, 없으면 DB에 기록된 값을 따릅니다.
+        (주문 성공 후 DB 저장 전에 중단된 경우에도 주문 기록이 남아 있음)
+        """
+        try:
+            rules = load_active_trade_rules()
+        except Exception as e:
+            print(f"자동 매매 규칙 로딩 실패: {e}")
+            return False
+        for rule in rules:
+            position = self.journal.position(rule["user_id"], rule["ticker"])
+            if position is not None:
+                rule["bought"] = position > 0
+        self.table = RuleTable.from_rules(rules)
+        self._sync_alerts(rules)
+        self._last_reload = time.monotonic()
+        return True
+
+    def _sync_alerts(self, rules):
+        """
+        알림 색인을 규칙 목록에 맞춥니다. (추가/변경/삭제분만 반영)
+        종목별 직전 시세는 유지되므로 규칙을 다시 읽어도 같은 알림이 반복되지 않습니다.
+        """
+        keys = set()
+        for rule in rules:
+            key = (rule["user_id"], rule["ticker"])
+            keys.add(key)
+            self.alerts.add_rule(
+                key, rule["ticker"], rule["target_buy"], rule["target_sell"]
+            )
+        for key in self.alerts.rule_ids():
+            if key not in keys:
+                self.alerts.remove_rule(key)
+
+    def run_once(self):
+        """규칙에 등장하는 모든 종목의 시세를 한 번에 조회하고 전체 규칙을 벡터 연산으로 평가합니다."""
+        reloaded = False
+        if time.monotonic() - self._last_reload >= RULE_RELOAD_SEC:
+            reloaded = self.reload_rules()
+        if not len(self.table):
+            return
+
+        try:
+            prices = self.source.fetch(self.table.tickers)
+        except Exception as e:
+            print(f"시세 조회 실패: {e}")
+            return
+
+        states = {}
+        for key, (acked, bought) in self.reconcile_unknown_orders().items():
+            self.table.set_bought(key, bought)
+            if prices.get(key[1]) is None:
+                continue
+            state = self._state(key, prices[key[1]])
+            state["last_message"] = f"🔎 {key[1]} 결과 미확인 주문 확인: " + (
+                "체결 내역에서 확인됨" if acked else "체결 내역 없음"
+            )
+            states[key] = state
+        if reloaded:
+            # 규칙을 다시 읽을 때마다 전체 규칙의 최근 시세를 기록합니다. (UI 상태 표시용)
+            for user_id, ticker in self.table.keys:
+                if prices.get(ticker) is not None:
+                    states[(user_id, ticker)] = self._state(
+                        (user_id, ticker), prices[ticker]
+                    )
+
+        # 목표가를 새로 넘어선 규칙의 도달 알림 (같은 틱에 주문이 나가면 주문 결과 메시지가 우선)
+        for ticker, price in prices.items():
+            if price is None:
+                continue
+            crossed = self.alerts.on_price(ticker, price, report_initial=False)
+            for side, label in (("buy", "매수"), ("sell", "매도")):
+                for key in crossed[side]:
+                    state = self._state(key, price)
+                    state["last_message"] = (
+                        f"🔔 {ticker} 목표 {label}가 도달 (현재가 {price:,.2f})"
+                    )
+                    states[key] = state
+
+        # 같은 틱의 주문은 의도를 먼저 기록하고, 대기열에 한꺼번에 넣어(매도 우선, 초당 한도 준수)
+        # 결과를 기다립니다.
+        intents = []
+        # 결과를 모르는 주문이 남아 있는 규칙은 확인될 때까지 새 주문을 보내지 않음 (중복 주문 방지)
+        unresolved = self.journal.unresolved_keys()
+        for intent in self.table.evaluate(prices):
+            key = intent["key"]
+            if (key[0] or "", key[1]) in unresolved:
+                continue
+            held = (
+                self.account.position(intent["ticker"])
+                if intent["side"] == "sell"
+                else None
+            )
+            if held is not None and held < intent["quantity"]:
+                # 증권사 잔고로 확인된 보유 수량이 부족하면 거부될 주문을 보내지 않고 보유 상태를 바로잡음
+                # (수량을 모르면(None) 그대로 보내고 거부 여부는 증권사가 판단)
+                state = self._state(key, intent["price"])
+                state.update(
+                    bought=False,
+                    last_action="sell",
+                    last_message=f"⚠️ {intent['ticker']} 보유 수량 부족으로 매도 생략",
+                )
+                self.table.set_bought(key, False)
+                self.journal.set_position(key[0], intent["ticker"], 0)
+                states[key] = state
+                continue
+            seq = self.journal.intent(
+                key[0], intent["ticker"], intent["side"], intent["quantity"]
+            )
+            intents.append((intent, seq))
+
+        # 주문 의도가 디스크에 반영된 뒤에만 전송 (그룹 커밋 1회)
+        if intents:
+            self.journal.flush()
+        submitted = [
+            (
+                intent,
+                seq,
+                self.orders.submit(
+                    intent["ticker"],
+                    intent["quantity"],
+                    0,
+                    intent["side"],
+                    user_id=intent["key"][0],
+                ),
+            )
+            for intent, seq in intents
+        ]
+
+        for intent, seq, future in submitted:
+            key = intent["key"]
+            result = future.result()
+            self.journal.resolve(seq, result)
+            if result.get("order_no"):
+                self._order_nos.add(result["order_no"])
+            state = self._state(key, intent["price"])
+            state.update(self._record(key, intent, result))
+            self.table.set_bought(key, state["bought"])
+            states[key] = state
+
+        # 이번 틱의 주문 결과 기록이 디스크에 반영된 뒤 DB 상태를 저장 (그룹 커밋 1회)
+        self.journal.flush()
+        try:
+            save_trade_rule_states(list(states.values()))
+        except Exception as e:
+            print(f"자동 매매 상태 저장 실패: {e}")
+
+    def reconcile_unknown_orders(self):
+        """
+        접수 여부를 모르는 주문 의도(게이트웨이 오류, 응답 없음, 전송 직후 중단)를 증권사 체결 내역과 맞춥니다.
+        의도를 기록한 뒤 같은 종목/방향/수량으로 들어간 주문이 체결 내역에 있으면 접수, 없으면
+        실패로 기록합니다. 기록 후 UNKNOWN_ORDER_CHECK_SEC가 지나지 않은 의도는 다음에 확인합니다.
+        Returns: {(user_id, ticker): (접수 여부, 매수 상태)} - 이번에 결과를 확정한 규칙
+        """
+        now = datetime.now()
+        due = [
+            r
+            for r in self.journal.unresolved()
+            if now - datetime.fromisoformat(r["ts"])
+            >= timedelta(seconds=UNKNOWN_ORDER_CHECK_SEC)
+        ]
+        if not due:
+            return {}
+
+        start = min(datetime.fromisoformat(r["ts"]) for r in due).astimezone(
+            TRADES_ZONE
+        )
+        executions = self.trader.get_executions(
+            start.date(), datetime.now(TRADES_ZONE).date()
+        )
+        if executions is None:
+            return {}  # 조회 실패: 미해결로 두고 다음 틱에 다시 확인
+
+        orders = []
+        for row in executions:
+            try:
+                orders.append(
+                    {
+                        "order_no": row["odno"],
+                        "ticker": row["pdno"],
+                        "side": "sell" if row["sll_buy_dvsn_cd"] == "01" else "buy",
+                        "quantity": int(float(row.get("ord_qty") or 0)),
+                        "ordered_at": datetime.strptime(
+                            row["ord_dt"] + row["ord_tmd"], "%Y%m%d%H%M%S"
+                        ).replace(tzinfo=TRADES_ZONE),
+                    }
+                )
+            except (KeyError, ValueError) as e:
+                print(f"체결 내역 행 처리 오류: {e}")
+
+        resolved = {}
+        for record in due:
+            since = datetime.fromisoformat(record["ts"]).astimezone(
+                TRADES_ZONE
+            ) - timedelta(seconds=ORDER_CLOCK_SKEW_SEC)
+            match = next(
+                (
+                    o
+                    for o in orders
+                    if o["order_no"] not in self._order_nos
+                    and o["ticker"] == kis_ticker(record["ticker"])
+                    and o["side"] == record["side"]
+                    and o["quantity"] == record["quantity"]
+                    and o["ordered_at"] >= since
+                ),
+                None,
+            )
+            if match:
+                self._order_nos.add(match["order_no"])
+                result = {"success": True, "order_no": match["order_no"]}
+            else:
+                result = {"success": False}
+            self.journal.resolve(record["seq"], result)
+            position = self.journal.position(record["user_id"], record["ticker"])
+            if position is None:
+                # 매수 상태가 DB에만 있던 규칙: 매수가 접수되었거나 매도가 실패했으면 보유 중
+                bought = result["success"] == (record["side"] == "buy")
+            else:
+                bought = position > 0
+            resolved[(record["user_id"], record["ticker"])] = (
+                result["success"],
+                bought,
+            )
+        return resolved
+
+    def _state(self, key, price):
+        user_id, ticker = key
+        return {
+            "user_id": user_id,
+            "ticker": ticker,
+            "bought": self.table.is_bought(key),
+            "last_price": float(price),
+            "last_action": None,
+            "last_message": None,
+        }
+
+    def _record(self, key, intent, result):
+        ticker, quantity, action = intent["ticker"], intent["quantity"], intent["side"]
+        label = "매수" if action == "buy" else "매도"
+
+        if result["success"]:
+            message = f"✅ {ticker} {quantity}주 {label} 완료! (현재가 {intent['price']:,.2f})"
+            bought = action == "buy"
+        elif result.get("unknown"):
+            # 접수 여부를 모름: 주문 기록과 같이 접수된 것으로 보고, 체결 내역으로 확인할 때까지
+            # 이 규칙의 새 주문을 보내지 않음 (reconcile_unknown_orders)
+            message = f"❓ {ticker} {label} 주문 결과 확인 불가 ({result.get('msg1')})"
+            bought = action == "buy"
+        else:
+            message = f"❌ {ticker} {label} 주문 실패"
+            bought = self.table.is_bought(key)
+        print(f"[{key[0]}] {message}")
+        return {"bought": bought, "last_action": action, "last_message": message}
+
+    def run_forever(self):
+        print(
+            f"🤖 자동 매매 서비스 시작 (주문 기록 복원: {len(self.journal.positions):,}건, "
+            f"결과 미확인 주문: {len(self.journal.intents):,}건)"
+        )
+        while True:
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception as e:
+                # 한 번의 오류로 서비스가 멈추지 않도록 로그만 남기고 계속 진행
+                print(f"자동 매매 루프 오류: {e}")
+            self.executions.maybe_sync()
+            time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    ensure_schema()
+    TradingService().run_forever()
@@ -0,0 +1,163 @@
+# modules/watchlist_repo.py
+import csv
+import io
+import threading
+
+import streamlit as st
+
+from modules.db import (
+    add_watchlist,
+    export_watchlist_csv,
+    import_watchlist,
+    load_watchlist,
+    remove_watchlist,
+)
+from modules.symbols import normalize_ticker, resolve_name
+
+# CSV 가져오기에서 인식하는 헤더 이름 (소문자 비교)
+CSV_TICKER_COLUMNS = ("ticker", "symbol", "code", "종목코드")
+CSV_NAME_COLUMNS = ("stock_name", "name", "종목명", "종목이름")
+
+
+def parse_watchlist_csv(text: str) -> list:
+    """
+    CSV 텍스트에서 (ticker, name) 목록을 읽습니다.
+    헤더가 있으면 티커/이름 컬럼을 이름으로 찾고, 없으면 첫 번째 열을 티커, 두 번째 열을 이름으로 봅니다.
+    이름이 비어 있으면 None
+    """
+    rows = [row for row in csv.reader(io.StringIO(text.lstrip("\ufeff"))) if row]
+    if not rows:
+        return []
+
+    header = [cell.strip().lower() for cell in rows[0]]
+    ticker_col = next(
+        (header.index(c) for c in CSV_TICKER_COLUMNS if c in header), None
+    )
+    if ticker_col is None:
+        ticker_col, name_col = 0, 1
+    else:
+        name_col = next(
+            (header.index(c) for c in CSV_NAME_COLUMNS if c in header), None
+        )
+        rows = rows[1:]
+
+    result = []
+    for row in rows:
+        if ticker_col >= len(row) or not row[ticker_col].strip():
+            continue
+        name = (
+            row[name_col].strip()
+            if name_col is not None and name_col < len(row)
+            else ""
+        )
+        result.append((row[ticker_col], name or None))
+    return result
+
+
+class WatchlistRepository:
+    """
+    유저별 관심 종목 메모리 캐시 (write-through).
+    - 처음 조회할 때만 DB에서 읽고, 이후 조회는 메모리에서 반환
+    - 추가/삭제는 DB에 반영한 뒤 같은 호출 안에서 캐시도 갱신 (변경 후 다시 읽지 않음)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items = {}  # user_id -> [{"ticker", "name"}] (ticker 순)
+
+    def list(self, user_id: str) -> list:
+        """관심 종목 목록. 호출한 쪽에서 수정해도 캐시에 영향이 없도록 복사본을 반환합니다."""
+        with self._lock:
+            items = self._items.get(user_id)
+        if items is None:
+            items = load_watchlist(user_id)
+            with self._lock:
+                # 읽는 동안 다른 스레드가 먼저 채웠다면 그쪽(이후 변경이 반영된 값)을 사용
+                items = self._items.setdefault(user_id, items)
+        return [dict(item) for item in items]
+
+    def contains(self, user_id: str, ticker: str) -> bool:
+        ticker = ticker.upper().strip()
+        return any(item["ticker"] == ticker for item in self.list(user_id))
+
+    def add(self, user_id: str, ticker: str, name: str = None) -> bool:
+        """
+        관심 종목을 추가합니다. 이름을 주지 않으면 로컬 종목 테이블에서 찾습니다.
+        Returns: 새로 추가했으면 True, 이미 등록된 종목이면 False
+        """
+        ticker = ticker.upper().strip()
+        if not ticker or self.contains(user_id, ticker):
+            return False
+        name = name or resolve_name(ticker)
+        add_watchlist(user_id, ticker, name)
+
+        with self._lock:
+            items = [
+                item
+                for item in self._items.get(user_id, [])
+                if item["ticker"] != ticker
+            ]
+            items.append({"ticker": ticker, "name": name})
+            items.sort(key=lambda item: item["ticker"])
+            self._items[user_id] = items
+        return True
+
+    def remove(self, user_id: str, ticker: str) -> bool:
+        """Returns: 삭제했으면 True, 등록되지 않은 종목이면 False"""
+        ticker = ticker.upper().strip()
+        if not self.contains(user_id, ticker):
+            return False
+        remove_watchlist(user_id, ticker)
+
+        with self._lock:
+            self._items[user_id] = [
+                item
+                for item in self._items.get(user_id, [])
+                if item["ticker"] != ticker
+            ]
+        return True
+
+    def import_csv(self, user_id: str, text: str) -> int:
+        """
+        CSV의 종목을 한 번에 등록합니다. (KOSPI200 목록 등)
+        티커는 KRX 상장 목록으로 정규화하고 이름이 없으면 같은 목록에서 채운 뒤, DB에는 한 번에 보냅니다.
+        Returns: 등록(갱신)한 종목 수
+        """
+        rows = []
+        for ticker, name in parse_watchlist_csv(text):
+            ticker = normalize_ticker(ticker)
+            if not name:
+                # 찾지 못하면 None → 이미 등록된 종목의 기존 이름을 유지
+                name = resolve_name(ticker)
+                name = name if name != ticker else None
+            rows.append((ticker, name))
+        count = import_watchlist(user_id, rows)
+        if not count:
+            return 0
+
+        current = {item["ticker"]: item for item in self.list(user_id)}
+        for ticker, name in rows:
+            old = current.get(ticker, {}).get("name")
+            current[ticker] = {"ticker": ticker, "name": name or old or ticker}
+        with self._lock:
+            self._items[user_id] = sorted(
+                current.values(), key=lambda item: item["ticker"]
+            )
+        return count
+
+    def export_csv(self, user_id: str) -> str:
+        return export_watchlist_csv(user_id)
+
+    def invalidate(self, user_id: str = None):
+        """캐시를 비웁니다. (다른 프로세스가 DB를 직접 수정한 경우 등)"""
+        with self._lock:
+            if user_id is None:
+                self._items.clear()
+            else:
+                self._items.pop(user_id, None)
+
+
+@st.cache_resource
+def get_watchlist_repo():
+    """프로세스 전체가 공유하는 관심 종목 저장소"""
+    return WatchlistRepository()
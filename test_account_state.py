@@ -0,0 +1,63 @@
+# test_account_state.py
+# 계좌 캐시(modules/account_state.py)가 보유 수량을 모를 때 0이 아닌 None을 반환하는지 확인합니다.
+# 실행: python -m pytest test_account_state.py
+from modules.account_state import AccountCache
+
+
+class _FakeTrader:
+    """잔고 조회 결과를 지정할 수 있는 가짜 trader (pages가 None이면 조회 실패)"""
+
+    def __init__(self, pages=None):
+        self.pages = pages
+        self.listeners = []
+
+    def add_order_listener(self, listener):
+        self.listeners.append(listener)
+
+    def iter_balance(self):
+        yield from self.pages or []
+
+
+def _page(*holdings):
+    rows = [
+        {
+            "pdno": ticker,
+            "prdt_name": ticker,
+            "hldg_qty": str(qty),
+            "pchs_avg_pric": "100.0",
+            "prpr": "100",
+            "evlu_pfls_amt": "0",
+            "evlu_pfls_rt": "0.00",
+        }
+        for ticker, qty in holdings
+    ]
+    return rows, [{"dnca_tot_amt": "1000000", "tot_evlu_amt": "1000000"}]
+
+
+def test_unsynced_position_is_unknown():
+    account = AccountCache(_FakeTrader(pages=None))
+    assert account.position("005930.KS") is None
+
+
+def test_synced_position_is_confirmed():
+    account = AccountCache(_FakeTrader(pages=[_page(("005930", 3))]))
+    assert account.position("005930.KS") == 3
+    assert account.position("000660.KS") == 0
+
+
+def test_suspicious_position_is_unknown_until_reconciled():
+    trader = _FakeTrader(pages=[_page(("005930", 3))])
+    account = AccountCache(trader)
+    assert account.position("005930") == 3
+
+    # 보유하지 않은 종목의 시장가 매수는 금액을 추정할 수 없어 캐시가 의심스러워짐
+    trader.pages = None  # 재조회도 실패
+    account.on_order(
+        {"ticker": "000660", "quantity": 1, "price": 0, "order_type": "buy"}
+    )
+    assert account.position("005930") is None
+    assert account.position("000660") is None
+
+    trader.pages = [_page(("005930", 3), ("000660", 1))]
+    account._retry_at = 0.0  # 재시도 대기 시간 생략
+    assert account.position("000660") == 1
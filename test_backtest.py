@@ -0,0 +1,77 @@
+# test_backtest.py
+# 벡터화 백테스트(modules/backtest.py)가 봉마다 규칙을 적용하는 반복문 구현과 같은 결과를 내는지 확인합니다.
+# 실행: python -m pytest test_backtest.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.backtest import backtest, run_grid
+from modules.trading_service import evaluate_target_rule
+
+# 매수 구간(<= 95)과 매도 구간(>= 105)을 여러 번 오가며, 구간 안에서 여러 봉 머무는 시계열
+CLOSE = [100, 95, 94, 96, 105, 110, 104, 93, 92, 94, 108, 106, 95, 99, 90, 101]
+HISTORY = pd.DataFrame(
+    {"Close": np.array(CLOSE, dtype=np.float64)},
+    index=pd.bdate_range("2024-01-01", periods=len(CLOSE)),
+)
+
+
+def _loop_backtest(close, target_buy, target_sell, quantity=1, fee_rate=0.0):
+    """검증용 반복문 구현 (자동 매매 서비스의 규칙을 봉마다 그대로 적용)"""
+    bought, cash, peak, max_drawdown = False, 0.0, 0.0, 0.0
+    num_buys = num_sells = 0
+    for price in close:
+        notional = price * quantity
+        action = evaluate_target_rule(price, target_buy, target_sell, bought)
+        if action == "buy":
+            bought, num_buys = True, num_buys + 1
+            cash -= notional * (1 + fee_rate)
+        elif action == "sell":
+            bought, num_sells = False, num_sells + 1
+            cash += notional * (1 - fee_rate)
+        equity = cash + (notional if bought else 0.0)
+        peak = max(peak, equity)
+        max_drawdown = max(max_drawdown, peak - equity)
+    return {
+        "total_pnl": equity,
+        "max_drawdown": max_drawdown,
+        "num_buys": num_buys,
+        "num_sells": num_sells,
+        "holding_at_end": bought,
+    }
+
+
+@pytest.mark.parametrize(
+    "target_buy, target_sell",
+    [(95, 105), (93, 108), (95, 0), (0, 105), (110, 100), (80, 120)],
+)
+def test_backtest_matches_loop(target_buy, target_sell):
+    summary, equity = backtest(HISTORY, target_buy, target_sell, 2, fee_rate=0.001)
+    expected = _loop_backtest(CLOSE, target_buy, target_sell, 2, fee_rate=0.001)
+
+    assert summary == pytest.approx(expected)
+    assert equity.index.equals(HISTORY.index)
+    assert equity.iloc[-1] == pytest.approx(expected["total_pnl"])
+
+
+def test_repeated_zone_entries_trade_once_per_entry():
+    summary, _ = backtest(HISTORY, 95, 105)
+    # 매수 구간 진입 3회(95, 93, 95), 매도 구간 진입 2회(105, 108) → 구간 안의 연속 봉은 추가 주문 없음
+    assert (summary["num_buys"], summary["num_sells"]) == (3, 2)
+    assert summary["holding_at_end"] is True
+
+
+def test_grid_matches_loop():
+    buy_levels, sell_levels = [0, 92, 95, 99], [0, 101, 105, 110]
+    sweep = run_grid(HISTORY, buy_levels, sell_levels, fee_rate=0.001, processes=1)
+
+    assert len(sweep) == len(buy_levels) * len(sell_levels)
+    for row in sweep.itertuples():
+        expected = _loop_backtest(CLOSE, row.target_buy, row.target_sell, 1, 0.001)
+        assert row.total_pnl == pytest.approx(expected["total_pnl"])
+        assert row.max_drawdown == pytest.approx(expected["max_drawdown"])
+        assert (row.num_buys, row.num_sells) == (
+            expected["num_buys"],
+            expected["num_sells"],
+        )
+        assert row.holding_at_end == expected["holding_at_end"]
@@ -0,0 +1,59 @@
+# test_bar_store.py
+# 로컬 이력 저장소(modules/bar_store.py)의 기간 포함 판단과 재수집 여부를 확인합니다. (네트워크 없음)
+# 실행: python -m pytest test_bar_store.py
+import pandas as pd
+
+from modules import scraper
+from modules.bar_store import BarStore, covers
+
+# 2024-01-03(수) ~ 2024-01-08(월): 주말(6, 7일)을 사이에 둔 일봉
+SESSIONS = pd.DatetimeIndex(
+    ["2024-01-03", "2024-01-04", "2024-01-05", "2024-01-08"], tz="Asia/Seoul"
+)
+BARS = pd.DataFrame({"Close": [1.0, 2.0, 3.0, 4.0]}, index=SESSIONS)
+MONDAY = pd.Timestamp("2024-01-08 10:00", tz="Asia/Seoul")
+
+
+def test_nd_coverage_counts_stored_sessions():
+    friday = str(SESSIONS[2])
+    # 금요일에 1d만 받았다면 월요일 기준 3d는 (달력으로 3일 전이어도) 포함하지 않음
+    assert not covers(friday, "3d", MONDAY, SESSIONS[2:])
+    assert covers(friday, "2d", MONDAY, SESSIONS[2:])
+    assert covers(str(SESSIONS[0]), "3d", MONDAY, SESSIONS)
+    # covered_from 이전의 봉은 연속 수집이 보장되지 않으므로 세지 않음
+    assert not covers(friday, "3d", MONDAY, SESSIONS)
+
+
+class _FakeStock:
+    """period 조회 시 마지막 거래일이 `today`인 일봉을 돌려주는 가짜 yf.Ticker"""
+
+    def __init__(self):
+        self.today = SESSIONS[2]
+        self.calls = []
+
+    def history(self, period=None, start=None, interval="1d"):
+        self.calls.append(period or "incremental")
+        bars = BARS[BARS.index <= self.today]
+        if start is not None:
+            return bars[bars.index >= start]
+        return bars.iloc[-int(period[:-1]) :]
+
+
+def test_nd_request_after_weekend_refetches(monkeypatch, tmp_path):
+    store = BarStore(str(tmp_path))
+    monkeypatch.setattr(scraper, "get_bar_store", lambda: store)
+    stock_scraper = scraper.StockScraper("005930.KS")
+    stock_scraper.stock = fake = _FakeStock()
+
+    assert len(stock_scraper.get_history("1d")) == 1  # 금요일
+
+    fake.today = SESSIONS[3]  # 월요일
+    history = stock_scraper.get_history("3d")
+
+    assert fake.calls == ["1d", "3d"]
+    assert list(history.index) == list(SESSIONS[1:])
+    assert list(history["Close"]) == [2.0, 3.0, 4.0]
+
+    # 이제 3거래일이 저장되었으므로 2d는 마지막 봉 이후만 추가로 받음
+    assert len(stock_scraper.get_history("2d")) == 2
+    assert fake.calls[-1] == "incremental"
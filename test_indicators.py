@@ -0,0 +1,154 @@
+# test_indicators.py
+# 스트리밍 지표(modules/indicators.py)가 pandas 일괄 계산과 같은 값을 내는지 확인합니다.
+# 실행: python -m pytest test_indicators.py
+import numpy as np
+import pandas as pd
+
+from modules.indicators import EMA, RSI, MACD, Bollinger, VWAP, IndicatorSet
+
+TOL = 1e-8
+
+
+def _sample_ohlcv(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    high = close * (1 + rng.uniform(0, 0.01, n))
+    low = close * (1 - rng.uniform(0, 0.01, n))
+    volume = rng.integers(1_000, 100_000, n).astype(float)
+    index = pd.date_range("2024-01-02 09:00", periods=n, freq="30min", tz="Asia/Seoul")
+    return pd.DataFrame(
+        {"Open": close, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=index,
+    )
+
+
+def _stream(indicator, values):
+    out = []
+    for v in values:
+        result = indicator.update(v)
+        out.append(np.nan if result is None else result)
+    return np.array(out)
+
+
+def test_ema_matches_pandas():
+    close = _sample_ohlcv()["Close"]
+    expected = close.ewm(span=20, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(_stream(EMA(20), close), expected, rtol=TOL)
+
+
+def test_rsi_matches_pandas():
+    close = _sample_ohlcv()["Close"]
+    delta = close.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    avg_loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+    expected = (100 - 100 / (1 + avg_gain / avg_loss)).to_numpy()
+    np.testing.assert_allclose(_stream(RSI(14), close), expected, rtol=TOL)
+
+
+def test_macd_matches_pandas():
+    close = _sample_ohlcv()["Close"]
+    macd = (
+        close.ewm(span=12, adjust=False).mean()
+        - close.ewm(span=26, adjust=False).mean()
+    )
+    signal = macd.ewm(span=9, adjust=False).mean()
+
+    indicator = MACD()
+    streamed = np.array([indicator.update(v) for v in close])
+    np.testing.assert_allclose(streamed[:, 0], macd, rtol=TOL, atol=TOL)
+    np.testing.assert_allclose(streamed[:, 1], signal, rtol=TOL, atol=TOL)
+    np.testing.assert_allclose(streamed[:, 2], macd - signal, rtol=TOL, atol=TOL)
+
+
+def test_bollinger_matches_pandas():
+    close = _sample_ohlcv()["Close"]
+    mean = close.rolling(20).mean()
+    std = close.rolling(20).std()
+
+    indicator = Bollinger(20, 2.0)
+    streamed = np.array(
+        [indicator.update(v) or (np.nan, np.nan, np.nan) for v in close]
+    )
+    np.testing.assert_allclose(streamed[:, 0], mean, rtol=TOL)
+    np.testing.assert_allclose(streamed[:, 1], mean + 2 * std, rtol=TOL)
+    np.testing.assert_allclose(streamed[:, 2], mean - 2 * std, rtol=TOL)
+
+
+def test_vwap_matches_pandas_daily_reset():
+    df = _sample_ohlcv()
+    typical = (df["High"] + df["Low"] + df["Close"]) / 3
+    session = df.index.date
+    expected = (typical * df["Volume"]).groupby(session).cumsum() / df[
+        "Volume"
+    ].groupby(session).cumsum()
+
+    indicator = VWAP()
+    streamed = [
+        indicator.update(h, l, c, v, ts)
+        for ts, h, l, c, v in zip(
+            df.index, df["High"], df["Low"], df["Close"], df["Volume"]
+        )
+    ]
+    np.testing.assert_allclose(streamed, expected, rtol=TOL)
+
+
+def _batch_last(df):
+    """pandas 일괄 계산으로 마지막 봉의 지표 값을 구합니다."""
+    close = df["Close"]
+    delta = close.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    avg_loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+    macd = (
+        close.ewm(span=12, adjust=False).mean()
+        - close.ewm(span=26, adjust=False).mean()
+    )
+    signal = macd.ewm(span=9, adjust=False).mean()
+    mean = close.rolling(20).mean()
+    std = close.rolling(20).std()
+    session = df.index.date == df.index[-1].date()
+    typical = (df["High"] + df["Low"] + df["Close"]) / 3
+    return {
+        "ema": close.ewm(span=20, adjust=False).mean().iloc[-1],
+        "rsi": (100 - 100 / (1 + avg_gain / avg_loss)).iloc[-1],
+        "macd": macd.iloc[-1],
+        "macd_signal": signal.iloc[-1],
+        "macd_hist": (macd - signal).iloc[-1],
+        "bb_middle": mean.iloc[-1],
+        "bb_upper": (mean + 2 * std).iloc[-1],
+        "bb_lower": (mean - 2 * std).iloc[-1],
+        "vwap": (typical * df["Volume"])[session].sum() / df["Volume"][session].sum(),
+    }
+
+
+def _assert_matches(actual, expected):
+    for name, value in expected.items():
+        assert abs(actual[name] - value) <= TOL * max(1.0, abs(value)), name
+
+
+def test_ticks_update_forming_bar_and_close_advances():
+    df = _sample_ohlcv()
+
+    # 앞부분 이력으로 워밍업한 뒤, 봉마다 형성 중 틱을 여러 번 보내고 마감 시에만 다음 봉으로 넘어갑니다.
+    indicators = IndicatorSet.from_history(df.iloc[:300])
+    for i in range(300, len(df)):
+        ts, bar = df.index[i], df.iloc[i]
+        for frac in (0.25, 0.5, 0.75):
+            tick_close = bar["Open"] * (1 + 0.01 * frac)
+            forming = df.iloc[: i + 1].copy()
+            forming.iloc[-1, forming.columns.get_loc("Close")] = tick_close
+            forming.iloc[-1, forming.columns.get_loc("Volume")] = bar["Volume"] * frac
+
+            tick = indicators.update_tick(
+                bar["High"], bar["Low"], tick_close, bar["Volume"] * frac, ts
+            )
+            if i % 50 == 0:
+                # 형성 중인 봉은 현재가를 마지막 값으로 둔 일괄 계산과 같아야 합니다.
+                _assert_matches(tick, _batch_last(forming))
+
+        latest = indicators.close_bar(
+            bar["High"], bar["Low"], bar["Close"], bar["Volume"], ts
+        )
+
+    # 틱을 몇 번 받았든 마감된 봉만 반영된 전체 이력의 일괄 계산과 같아야 합니다.
+    _assert_matches(latest, _batch_last(df))
+    _assert_matches(indicators.snapshot(), _batch_last(df))
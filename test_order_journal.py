@@ -0,0 +1,48 @@
+# test_order_journal.py
+# 주문 선행 기록(modules/order_journal.py)의 복원과 쓰기 실패 처리를 확인합니다.
+# 실행: python -m pytest test_order_journal.py
+import errno
+
+import pytest
+
+from modules.order_journal import OrderJournal, OrderJournalError
+
+
+def test_replay_restores_positions(tmp_path):
+    journal = OrderJournal(str(tmp_path), fsync_sec=0)
+    seq = journal.intent("alice", "005930.KS", "buy", 3)
+    journal.flush()
+    journal.resolve(seq, {"success": True, "status_code": 200})
+    journal.intent("alice", "000660.KS", "buy", 1)  # 결과 미확인 주문
+    journal.flush()
+    journal.close()
+
+    restored = OrderJournal(str(tmp_path), fsync_sec=0)
+    assert restored.position("alice", "005930.KS") == 3
+    assert restored.is_bought("alice", "000660.KS")
+    assert len(restored.intents) == 1
+    restored.close()
+
+
+class _FullDisk:
+    def write(self, data):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    def flush(self):
+        pass
+
+    def fileno(self):
+        raise OSError(errno.EBADF, "closed")
+
+
+def test_write_failure_wakes_flush_with_error(tmp_path):
+    journal = OrderJournal(str(tmp_path), fsync_sec=0)
+    journal._file = _FullDisk()
+    journal.intent("alice", "005930.KS", "buy", 3)
+
+    # 기록 스레드가 멈춰도 flush가 영원히 기다리지 않고 예외를 받아야 합니다.
+    with pytest.raises(OrderJournalError):
+        journal.flush(timeout=5)
+    journal.intent("alice", "005930.KS", "sell", 3)
+    with pytest.raises(OrderJournalError):
+        journal.flush(timeout=5)
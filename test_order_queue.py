@@ -0,0 +1,91 @@
+# test_order_queue.py
+# 한도 초과/게이트웨이 오류 응답이 주문 대기열(modules/order_queue.py)에서 재시도되는지 확인합니다.
+# 실행: python -m pytest test_order_queue.py
+import asyncio
+
+import httpx
+
+from modules.order_queue import OrderQueue
+from modules.trader import AsyncKisTrader
+
+
+def _place_with_response(response):
+    async def run():
+        trader = await AsyncKisTrader.create()
+        await trader.client.aclose()
+        trader.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda _: response)
+        )
+        try:
+            return await trader.place_order("005930", 1, 0, "buy")
+        finally:
+            await trader.aclose()
+
+    return asyncio.run(run())
+
+
+def test_non_json_gateway_error_is_unknown(mock_kis):
+    # 게이트웨이 오류는 주문이 이미 접수되었을 수 있으므로 재시도 대상(throttled)이 아님
+    result = _place_with_response(
+        httpx.Response(503, text="<html>Service Unavailable</html>")
+    )
+    assert result["success"] is False
+    assert result["throttled"] is False
+    assert result["unknown"] is True
+    assert result["status_code"] == 503
+
+
+def test_non_json_429_is_throttled(mock_kis):
+    result = _place_with_response(httpx.Response(429, text="Too Many Requests"))
+    assert result["throttled"] is True
+    assert result["unknown"] is False
+
+
+class _FlakyTrader:
+    """처음 몇 번은 한도 초과, 그다음부터 성공하는 가짜 trader (unknown=True면 항상 결과 모름)"""
+
+    mode = "VIRTUAL"
+
+    def __init__(self, throttled_calls, unknown=False):
+        self.throttled_calls = throttled_calls
+        self.unknown = unknown
+        self.calls = 0
+
+    def place_order(self, ticker, quantity, price, order_type="buy", user_id=None):
+        self.calls += 1
+        if self.unknown:
+            return {"success": False, "throttled": False, "unknown": True}
+        throttled = self.calls <= self.throttled_calls
+        return {
+            "success": not throttled,
+            "throttled": throttled,
+            "status_code": 429 if throttled else 200,
+        }
+
+
+def test_queue_retries_throttled_orders():
+    trader = _FlakyTrader(throttled_calls=2)
+    queue = OrderQueue(trader, rate=100, backoff=0.01)
+    try:
+        result = queue.submit("005930", 1).result(timeout=5)
+        metrics = queue.metrics()
+    finally:
+        queue.close()
+
+    assert result["success"] is True
+    assert result["attempts"] == 3
+    assert metrics["retried"] == 2
+    assert metrics["completed"] == 1
+
+
+def test_queue_does_not_retry_unknown_orders():
+    trader = _FlakyTrader(throttled_calls=0, unknown=True)
+    queue = OrderQueue(trader, rate=100, backoff=0.01)
+    try:
+        result = queue.submit("005930", 1).result(timeout=5)
+    finally:
+        queue.close()
+
+    assert result["unknown"] is True
+    assert result["attempts"] == 1
+    assert trader.calls == 1
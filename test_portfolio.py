@@ -0,0 +1,38 @@
+# test_portfolio.py
+# 잔고 연속 조회(CTX_AREA)를 로컬 KIS 모의 서버로 확인합니다.
+# 실행: python -m pytest test_portfolio.py
+from modules.kis_mock import BALANCE_PAGE_SIZE
+from modules.portfolio import PortfolioManager
+from modules.trader import KisTrader
+
+HOLDINGS = {f"{i:06d}": i for i in range(1, BALANCE_PAGE_SIZE + 6)}  # 2페이지 분량
+
+
+def test_load_status_follows_continuation_pages(mock_kis):
+    mock_kis.state.holdings = dict(HOLDINGS)
+    trader = KisTrader()
+    try:
+        status = PortfolioManager(trader).load_status()
+    finally:
+        trader.close()
+
+    assert status is not None
+    _, df = status
+    assert dict(zip(df["종목코드"], df["보유수량"])) == HOLDINGS
+    assert mock_kis.state.stats["balance"] == 2
+
+
+def test_load_status_rejects_partial_pages_when_throttled(mock_kis):
+    mock_kis.state.holdings = dict(HOLDINGS)
+    mock_kis.state.rate_limit = 1  # 1페이지는 성공, 곧바로 이어지는 2페이지는 EGW00201
+    trader = KisTrader()
+    try:
+        status = PortfolioManager(trader).load_status()
+        holdings, _ = trader.get_balance()
+    finally:
+        trader.close()
+
+    # 일부 페이지만 받은 잔고를 전체 잔고로 쓰면 안 됩니다.
+    assert status is None
+    assert holdings == []
+    assert mock_kis.state.stats["throttled"] >= 1
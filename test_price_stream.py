@@ -0,0 +1,83 @@
+# test_price_stream.py
+# 시세 스트림(modules/price_stream.py)의 구독자별 틱 전달, 유휴 구독 해제, 생산자 종료를 확인합니다.
+# 실행: python -m pytest test_price_stream.py
+import time
+
+from modules.price_stream import PriceStream, ReplaySource
+
+
+class _CountingSource(ReplaySource):
+    """조회 호출마다 요청 종목을 기록하는 재생 소스"""
+
+    def __init__(self, series):
+        super().__init__(series, loop=False)
+        self.calls = []
+
+    def fetch(self, tickers):
+        self.calls.append(sorted(tickers))
+        return super().fetch(tickers)
+
+
+def _prices(sub):
+    return [tick["price"] for tick in sub.drain()]
+
+
+def test_ticks_fan_out_to_every_subscription():
+    source = _CountingSource({"AAPL": [1, 2, 3], "MSFT": [10, 20, 30]})
+    stream = PriceStream(source=source)
+    first, second = stream.subscribe("AAPL"), stream.subscribe("AAPL")
+    msft = stream.subscribe("MSFT")
+
+    for _ in range(3):
+        stream.poll_once()
+
+    # 같은 종목을 여러 구독자가 받아도 소스 조회는 주기마다 1회
+    assert source.calls == [["AAPL", "MSFT"]] * 3
+    assert _prices(first) == _prices(second) == [1.0, 2.0, 3.0]
+    assert _prices(msft) == [10.0, 20.0, 30.0]
+
+    # 늦게 구독해도 마지막 시세를 바로 받음
+    assert _prices(stream.subscribe("AAPL")) == [3.0]
+
+
+def test_closed_subscription_stops_receiving():
+    stream = PriceStream(source=ReplaySource({"AAPL": [1, 2]}, loop=False))
+    kept, closed = stream.subscribe("AAPL"), stream.subscribe("AAPL")
+    closed.close()
+    stream.poll_once()
+
+    assert _prices(kept) == [1.0]
+    assert closed.closed and _prices(closed) == []
+
+
+def test_idle_subscription_expires():
+    source = _CountingSource({"AAPL": [1, 2, 3], "MSFT": [10, 20, 30]})
+    stream = PriceStream(source=source, idle_sec=0.05)
+    active, idle = stream.subscribe("AAPL"), stream.subscribe("MSFT")
+
+    time.sleep(0.1)
+    active.drain()
+    stream.poll_once()
+
+    # 읽지 않은 구독은 해제되고 그 종목은 더 이상 조회하지 않음
+    assert idle.closed and not active.closed
+    assert source.calls == [["AAPL"]]
+    assert _prices(active) == [1.0]
+
+
+def test_stop_ends_producer_thread():
+    stream = PriceStream(source=ReplaySource({"AAPL": [1, 2, 3]}), interval=0.01)
+    sub = stream.subscribe("AAPL")
+    stream.start()
+
+    deadline = time.monotonic() + 2
+    while not sub.queue.qsize() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stream.stop()
+    stream._thread.join(timeout=1)
+
+    assert not stream._thread.is_alive()
+    assert _prices(sub)  # 종료 전까지 틱을 받음
+    sub.drain()
+    time.sleep(0.05)
+    assert _prices(sub) == []  # 종료 후에는 더 이상 발행하지 않음
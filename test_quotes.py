@@ -0,0 +1,70 @@
+# test_quotes.py
+# 시세 조회(modules/quotes.py)의 결과 형식 처리와 일괄/종목별 제한 시간을 확인합니다. (네트워크 없음)
+# 실행: python -m pytest test_quotes.py
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+
+from modules import quotes
+
+INDEX = pd.date_range("2024-01-02", periods=3, freq="D")
+
+
+def test_single_symbol_flat_columns(monkeypatch):
+    flat = pd.DataFrame({"Close": [1.0, 2.0, None], "Volume": [1, 2, 3]}, index=INDEX)
+    monkeypatch.setattr(quotes.yf, "download", lambda *a, **k: flat)
+    assert quotes._download_last_prices(["AAPL"]) == {"AAPL": 2.0}
+
+
+def test_multi_symbol_columns(monkeypatch):
+    columns = pd.MultiIndex.from_product([["Close", "Volume"], ["AAPL", "MSFT"]])
+    data = pd.DataFrame(
+        [[1.0, 10.0, 1, 1], [2.0, None, 2, 2], [3.0, None, 3, 3]],
+        index=INDEX,
+        columns=columns,
+    )
+    monkeypatch.setattr(quotes.yf, "download", lambda *a, **k: data)
+    assert quotes._download_last_prices(["AAPL", "MSFT"]) == {
+        "AAPL": 3.0,
+        "MSFT": 10.0,
+    }
+
+
+def test_slow_download_is_bounded(monkeypatch):
+    def slow_download(*args, **kwargs):
+        time.sleep(1.0)
+        return pd.DataFrame()
+
+    monkeypatch.setattr(quotes.yf, "download", slow_download)
+    started = time.monotonic()
+    assert quotes._download_last_prices(["AAPL", "MSFT"], timeout=0.2) == {}
+    assert time.monotonic() - started < 0.8
+
+
+class _FakeTicker:
+    """SLOW 종목만 fast_info 조회가 오래 걸리는 가짜 yf.Ticker"""
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    @property
+    def fast_info(self):
+        if self.symbol == "SLOW":
+            time.sleep(1.0)
+        return SimpleNamespace(last_price=100.0, market_cap=1e9)
+
+
+def test_slow_ticker_is_dropped_at_deadline(monkeypatch):
+    monkeypatch.setattr(quotes.yf, "download", lambda *a, **k: pd.DataFrame())
+    monkeypatch.setattr(quotes.yf, "Ticker", _FakeTicker)
+
+    started = time.monotonic()
+    result = quotes.fetch_quotes(["AAPL", "SLOW", "MSFT"], timeout=0.2)
+
+    # 느린 종목을 기다리지 않고 제한 시간 안에 나머지 종목만 반환
+    assert time.monotonic() - started < 0.8
+    assert result == {
+        "AAPL": {"last_price": 100.0, "market_cap": 1e9},
+        "MSFT": {"last_price": 100.0, "market_cap": 1e9},
+    }
@@ -0,0 +1,55 @@
+# test_threshold_index.py
+# 목표가 도달 색인(modules/threshold_index.py)이 넘어선 규칙만 정확히 찾는지 확인합니다.
+# 실행: python -m pytest test_threshold_index.py
+from modules.threshold_index import ThresholdIndex
+
+
+def _index():
+    index = ThresholdIndex()
+    index.add_rule("a", "AAA", 90, 110)
+    index.add_rule("b", "AAA", 95, 120)
+    index.add_rule("c", "AAA", 0, 105)  # 매수 목표가 미설정
+    index.add_rule("d", "BBB", 95, 0)  # 다른 종목
+    return index
+
+
+def test_buy_crossing_includes_boundary():
+    index = _index()
+    assert index.crossed("AAA", 100, 95) == {"buy": ["b"], "sell": []}
+    assert sorted(index.crossed("AAA", 100, 90)["buy"]) == ["a", "b"]
+    # 이미 목표가 이하에서 더 내려간 경우는 새로 넘어선 것이 아님
+    assert index.crossed("AAA", 95, 91) == {"buy": [], "sell": []}
+
+
+def test_sell_crossing_includes_boundary():
+    index = _index()
+    assert index.crossed("AAA", 100, 105) == {"buy": [], "sell": ["c"]}
+    assert index.crossed("AAA", 105, 110) == {"buy": [], "sell": ["a"]}
+    assert sorted(index.crossed("AAA", 100, 130)["sell"]) == ["a", "b", "c"]
+
+
+def test_first_price_returns_rules_already_satisfied():
+    index = _index()
+    assert index.crossed("AAA", None, 92) == {"buy": ["b"], "sell": []}
+    assert index.crossed("AAA", None, 110) == {"buy": [], "sell": ["c", "a"]}
+    assert index.on_price("AAA", 92, report_initial=False) == {"buy": [], "sell": []}
+    assert index.on_price("AAA", 89) == {"buy": ["a"], "sell": []}
+
+
+def test_equal_prices_cross_nothing():
+    index = _index()
+    for price in (90, 95, 100, 110):
+        assert index.crossed("AAA", price, price) == {"buy": [], "sell": []}
+
+
+def test_add_and_remove_between_ticks():
+    index = _index()
+    assert index.on_price("AAA", 100) == {"buy": [], "sell": []}
+
+    index.remove_rule("b")
+    index.add_rule("e", "AAA", 97, 0)
+    index.add_rule("a", "AAA", 80, 110)  # 목표가 변경
+    assert index.on_price("AAA", 90) == {"buy": ["e"], "sell": []}
+    assert index.on_price("AAA", 80) == {"buy": ["a"], "sell": []}
+    assert len(index) == 4
+    assert sorted(index.rule_ids()) == ["a", "c", "d", "e"]
@@ -0,0 +1,75 @@
+# test_token_manager.py
+# 접근 토큰 파일(modules/token_manager.py)의 내용, 접속 서버별 분리, 발급 실패 처리를 확인합니다.
+# 실행: python -m pytest test_token_manager.py
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from modules import token_manager
+from modules.token_manager import TokenIssueError, get_token_manager
+
+
+def test_token_file_keeps_only_app_key_hash(mock_kis):
+    manager = get_token_manager("VIRTUAL", mock_kis.url, "test-app-key", "secret")
+    assert manager.get_token() == "mock-access-token"
+
+    with open(manager.path, encoding="utf-8") as f:
+        raw = f.read()
+    assert "test-app-key" not in raw
+    assert json.loads(raw)["app_key_hash"] == manager.app_key_hash
+
+    # 파일에서 다시 읽어도 같은 키로 인정되어 재발급하지 않음
+    manager.token = None
+    assert manager._refresh(force=False)
+    assert mock_kis.state.stats["token"] == 1
+
+
+def test_managers_and_files_are_separated_by_base_url(mock_kis):
+    mock = get_token_manager("VIRTUAL", mock_kis.url, "test-app-key", "secret")
+    real = get_token_manager(
+        "VIRTUAL",
+        "https://openapivts.koreainvestment.com:29443",
+        "test-app-key",
+        "secret",
+    )
+    assert mock is not real
+    assert mock.path != real.path
+    assert mock is get_token_manager("VIRTUAL", mock_kis.url, "test-app-key", "secret")
+
+
+def test_missing_access_token_is_a_failed_issue(mock_kis, monkeypatch):
+    manager = get_token_manager("VIRTUAL", mock_kis.url, "test-app-key", "secret")
+    response = httpx.Response(200, json={"error_description": "유효하지 않은 AppKey"})
+    monkeypatch.setattr(token_manager.httpx, "post", lambda *a, **k: response)
+
+    with pytest.raises(TokenIssueError):
+        manager._issue()
+    assert manager.get_token() is None
+    assert not os.path.exists(manager.path)
+
+
+def test_refresh_loop_survives_errors(mock_kis, monkeypatch):
+    monkeypatch.setattr(token_manager, "TOKEN_RETRY_SEC", 0.01)
+    manager = get_token_manager("VIRTUAL", mock_kis.url, "test-app-key", "secret")
+    calls = []
+    refreshed = threading.Event()
+
+    def flaky_refresh(force):
+        calls.append(force)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        manager.expires_at = datetime.now() + timedelta(hours=1)
+        refreshed.set()
+        return True
+
+    manager._refresh = flaky_refresh
+    manager._start_refresher()
+
+    # 첫 재발급이 예외로 실패해도 스레드는 살아서 잠시 후 다시 시도
+    assert refreshed.wait(timeout=2)
+    assert manager._refresher.is_alive()
+    assert calls == [True, True]
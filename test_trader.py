@@ -9,17 +9,28 @@ bot = KisTrader()
 if bot.access_token:
     # 2. 잔고 조회 테스트
     print("\n[잔고 조회]")
-    balance = bot.get_balance()
-    if balance:
-        for stock in balance:
+    count = 0
+    for page_no, (holdings, _) in enumerate(bot.iter_balance(), start=1):
+        print(f"- {page_no} 페이지: {len(holdings)}종목")
+        for stock in holdings:
             print(
                 f"종목: {stock['prdt_name']}, 수량: {stock['hldg_qty']}, 수익률: {stock['evlu_pfls_rt']}%"
             )
-    else:
+        count += len(holdings)
+    if not count:
         print("보유 종목이 없거나 조회 실패")
 
     # 3. (주의) 매수 주문 테스트 - 모의투자일 경우만 주석 해제하세요
     print("\n[매수 테스트]")
     bot.send_order("005930", 1, 0, "buy")  # 삼성전자 1주 시장가 매수
+
+    # 4. API 호출별 소요 시간 (keep-alive 연결 재사용 확인)
+    print("\n[API 호출 시간]")
+    for name, t in bot.timing_summary().items():
+        print(
+            f"{name}: {t['count']}회, 연결 재사용률 {t['reuse_rate']:.0%}, "
+            f"평균 {t['avg_total_ms']:.1f}ms (연결 {t['avg_connect_ms']:.1f} / "
+            f"TLS {t['avg_tls_ms']:.1f} / 응답 대기 {t['avg_wait_ms']:.1f})"
+        )
 else:
     print("API 연결 실패. .env 파일을 확인하세요.")
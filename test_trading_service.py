@@ -0,0 +1,144 @@
+# test_trading_service.py
+# 자동 매매 서비스(modules/trading_service.py)가 로컬 KIS 모의 서버로 주문하는지 확인합니다.
+# 실행: python -m pytest test_trading_service.py
+import pytest
+
+from modules import trading_service
+from modules.order_journal import OrderJournal
+from modules.price_stream import ReplaySource
+from modules.trader import KisTrader
+
+
+@pytest.fixture
+def make_service(mock_kis, monkeypatch, tmp_path):
+    """
+    규칙 목록과 가격 시계열로 TradingService를 만듭니다. (테스트 종료 시 정리)
+    Returns: 생성 함수 - make(rules, series) -> service (service.saved: 저장된 상태 목록)
+    """
+    created = []
+    monkeypatch.setattr(
+        trading_service, "OrderJournal", lambda: OrderJournal(str(tmp_path / "journal"))
+    )
+
+    def make(rules, series):
+        saved = []
+        monkeypatch.setattr(trading_service, "load_active_trade_rules", lambda: rules)
+        monkeypatch.setattr(trading_service, "save_trade_rule_states", saved.extend)
+        trader = KisTrader()
+        service = trading_service.TradingService(
+            trader=trader, source=ReplaySource(series, loop=False)
+        )
+        service.saved = saved
+        created.append(service)
+        return service
+
+    yield make
+    for service in created:
+        service.orders.close()
+        service.trader.close()
+
+
+def _rule(**overrides):
+    rule = {
+        "user_id": "alice",
+        "ticker": "005930.KS",
+        "target_buy": 70_000,
+        "target_sell": 0,
+        "quantity": 3,
+        "bought": False,
+    }
+    rule.update(overrides)
+    return rule
+
+
+def _unknown_orders(service, send):
+    """주문 결과를 '접수 여부 모름'으로 바꿉니다. send=True면 실제로는 접수된 경우"""
+    place_order = service.trader.place_order
+
+    def unknown(*args, **kwargs):
+        if send:
+            place_order(*args, **kwargs)
+        return {
+            "success": False,
+            "throttled": False,
+            "unknown": True,
+            "status_code": 502,
+        }
+
+    service.trader.place_order = unknown
+    return place_order
+
+
+def test_krx_rule_orders_with_kis_ticker(mock_kis, make_service):
+    service = make_service([_rule()], {"005930.KS": [69_000]})
+    service.run_once()
+
+    # yfinance 심볼(005930.KS)의 규칙도 KIS 종목코드(005930)로 주문되어 체결되어야 합니다.
+    assert mock_kis.state.holdings == {"005930": 3}
+    assert service.saved[-1]["ticker"] == "005930.KS"
+    assert service.saved[-1]["bought"] is True
+    assert service.journal.is_bought("alice", "005930.KS")
+
+
+def test_alert_only_when_threshold_is_crossed(mock_kis, make_service):
+    # 이미 매수한 규칙은 주문 없이 목표가를 새로 넘어선 틱에만 알림을 남깁니다.
+    rules = [_rule(bought=True), _rule(user_id="bob", target_buy=60_000, bought=True)]
+    service = make_service(rules, {"005930.KS": [69_500, 72_000, 69_000]})
+    for _ in range(3):
+        service.run_once()
+
+    alerts = [s for s in service.saved if (s["last_message"] or "").startswith("🔔")]
+    assert [(s["user_id"], s["last_price"]) for s in alerts] == [("alice", 69_000)]
+    assert mock_kis.state.stats["order"] == 0
+
+
+def test_unknown_order_blocks_rule_until_reconciled(
+    mock_kis, make_service, monkeypatch
+):
+    mock_kis.state.holdings = {"005930": 3}
+    rules = [_rule(target_sell=80_000, bought=True)]
+    service = make_service(rules, {"005930.KS": [81_000, 69_000, 69_000]})
+    _unknown_orders(service, send=False)
+
+    service.run_once()  # 매도 결과 모름 → 의도 미해결
+    service.run_once()  # 매수 구간이지만 매도 결과를 확인하기 전이라 주문하지 않음
+    assert mock_kis.state.stats["order"] == 0
+    assert len(service.journal.intents) == 1
+
+    # 확인 시점: 체결 내역에 매도가 없으므로 실패로 확정하고 보유 상태를 되돌림 (재매수 없음)
+    monkeypatch.setattr(trading_service, "UNKNOWN_ORDER_CHECK_SEC", 0)
+    service.run_once()
+    assert not service.journal.intents
+    assert service.table.is_bought(("alice", "005930.KS"))
+    assert mock_kis.state.stats["order"] == 0
+
+
+def test_unknown_order_found_in_executions_is_acked(
+    mock_kis, make_service, monkeypatch
+):
+    monkeypatch.setattr(trading_service, "UNKNOWN_ORDER_CHECK_SEC", 0)
+    service = make_service([_rule()], {"005930.KS": [69_000, 69_000]})
+    place_order = _unknown_orders(service, send=True)
+
+    service.run_once()  # 매수는 실제로 접수되었지만 응답은 게이트웨이 오류
+    service.trader.place_order = place_order
+    service.run_once()  # 체결 내역에서 주문을 찾아 접수로 확정 → 다시 매수하지 않음
+
+    assert not service.journal.intents
+    assert mock_kis.state.holdings == {"005930": 3}
+    assert mock_kis.state.stats["order"] == 1
+    assert service.table.is_bought(("alice", "005930.KS"))
+
+
+def test_sell_is_sent_when_position_is_unknown(mock_kis, make_service):
+    mock_kis.state.holdings = {"005930": 3}
+    rules = [_rule(target_buy=0, target_sell=80_000, bought=True)]
+    service = make_service(rules, {"005930.KS": [81_000]})
+    service.account.position = lambda ticker: None  # 잔고 조회 실패 등으로 수량을 모름
+
+    service.run_once()
+
+    # 0주로 단정하고 매도를 건너뛰지 않고 주문을 보내 증권사가 판단하게 함
+    assert mock_kis.state.holdings == {}
+    assert service.journal.position("alice", "005930.KS") == 0
+    assert service.saved[-1]["last_message"].startswith("✅")
@@ -0,0 +1,103 @@
+# ui/auto_trade_ui.py
+import streamlit as st
+
+from modules.constants import SK_PRICE_SUBSCRIPTION, SK_LAST_TICK, SK_SYNCED_RULE
+from modules.db import load_trade_rule, upsert_trade_rule
+from modules.price_stream import PRICE_POLL_SEC, PriceStream
+
+
+@st.cache_resource
+def get_price_stream():
+    """모든 세션이 공유하는 시세 스트림 (앱 실행 중 1회만 생성)"""
+    return PriceStream().start()
+
+
+def _get_subscription(ticker):
+    """
+    현재 세션의 구독을 반환합니다. 종목이 바뀌면 이전 구독을 해제하고,
+    오래 읽지 않아 스트림이 해제한 구독은 새로 만듭니다.
+    """
+    sub = st.session_state.get(SK_PRICE_SUBSCRIPTION)
+    if sub is not None and (sub.closed or sub.ticker != ticker):
+        sub.close()
+        sub = None
+    if sub is None:
+        sub = get_price_stream().subscribe(ticker)
+        st.session_state[SK_PRICE_SUBSCRIPTION] = sub
+        st.session_state[SK_LAST_TICK] = None
+    return sub
+
+
+def close_price_subscription():
+    """모니터링 영역을 그리지 않을 때(자동 매매 꺼짐) 현재 세션의 시세 구독을 해제합니다."""
+    sub = st.session_state.pop(SK_PRICE_SUBSCRIPTION, None)
+    if sub is not None:
+        sub.close()
+    st.session_state.pop(SK_LAST_TICK, None)
+
+
+def sync_auto_trade_rule(user_id, ticker, is_auto, target_buy, target_sell):
+    """
+    사이드바의 자동 매매 설정을 매매 서비스가 감시하는 규칙 테이블에 반영합니다.
+    설정이 바뀐 경우에만 DB에 기록합니다.
+    자동 매매 중에 다른 종목으로 바꾸면 이전 종목의 규칙은 비활성화합니다.
+    """
+    rule = (ticker, is_auto, target_buy, target_sell)
+    if st.session_state.get(SK_SYNCED_RULE) == rule:
+        return
+
+    synced = st.session_state.get(SK_SYNCED_RULE)
+    if synced and synced[0] != ticker and synced[1]:
+        # 다른 종목으로 바꾸면 이전 종목의 자동 매매를 끕니다.
+        # (사이드바 토글은 종목별 키라 새 종목에서는 꺼진 상태로 시작)
+        upsert_trade_rule(user_id, synced[0], synced[2], synced[3], enabled=False)
+    # 자동 매매를 켠 적 없는 종목은 굳이 비활성 규칙을 만들지 않습니다.
+    if is_auto or (synced and synced[0] == ticker and synced[1]):
+        upsert_trade_rule(user_id, ticker, target_buy, target_sell, enabled=is_auto)
+    st.session_state[SK_SYNCED_RULE] = rule
+
+
+@st.fragment(run_every=PRICE_POLL_SEC)
+def render_auto_trade_monitor(user_id, ticker, target_buy, target_sell, fallback_price):
+    """
+    자동 매매 모니터링 영역만 주기적으로 다시 그립니다. (전체 스크립트 재실행 없음)
+    주문은 백그라운드 매매 서비스가 실행하며, 이 화면은 서비스가 기록한 상태만 표시합니다.
+    """
+    st.subheader("🤖 자동 매매 모니터링")
+
+    ticks = _get_subscription(ticker).drain()
+    if ticks:
+        st.session_state[SK_LAST_TICK] = ticks[-1]
+    last_tick = st.session_state.get(SK_LAST_TICK)
+    current_price = last_tick["price"] if last_tick else fallback_price
+
+    status_cols = st.columns(4)
+    status_cols[0].metric(
+        "현재가", f"{current_price:,.0f}" if current_price is not None else "-"
+    )
+    status_cols[1].metric("목표 매수가", f"{target_buy:,.0f}")
+    status_cols[2].metric("목표 매도가", f"{target_sell:,.0f}")
+
+    try:
+        status = load_trade_rule(user_id, ticker)
+    except Exception as e:
+        st.error(f"자동 매매 상태 조회 실패: {e}")
+        return
+
+    if status is None:
+        st.info("⏳ 매매 서비스에 규칙을 등록하는 중...")
+        return
+
+    status_cols[3].info("상태: 보유 중" if status["bought"] else "상태: 보유 주식 없음")
+
+    if status["last_message"]:
+        if status["last_message"].startswith("❌"):
+            st.error(status["last_message"])
+        else:
+            st.success(status["last_message"])
+
+    updated_at = status["updated_at"]
+    st.caption(
+        f"⏳ 매매 서비스 감시 중... (서비스 최근 시세: {status['last_price'] or '-'}, "
+        f"갱신: {updated_at:%Y-%m-%d %H:%M:%S})"
+    )
@@ -1,13 +1,24 @@
 # ui/dashboard.py
 import streamlit as st
 import plotly.graph_objects as go
-import pandas as pd
 from datetime import datetime, timedelta
 
-from modules.dart import ticker_to_corp_code, search_disclosures
+from modules.dart import (
+    DISCLOSURE_LOOKBACK_DAYS,
+    DISCLOSURE_PAGE_COUNT,
+    ticker_to_corp_code,
+    search_disclosures,
+)
+from modules.constants import SK_TRADE_LOG_PAGES
+from modules.db import load_trades
+from modules.trade_history import trades_dataframe
+from modules.trader import kis_ticker
 
+TRADE_LOG_PAGE_SIZE = 20
+TRADE_LOG_TTL_SEC = 10  # 매매 로그 페이지 캐시 시간 (자동 새로고침 때마다 조회하지 않도록)
 
-def render_dashboard(df, basic_info, news_list, ticker=None):
+
+def render_dashboard(df, basic_info, news_list, ticker=None, user_id=None):
     """
     수집된 데이터를 기반으로 메인 대시보드를 그립니다.
     """
@@ -104,15 +115,7 @@ def render_dashboard(df, basic_info, news_list, ticker=None):
         _render_disclosure_tab(ticker)
 
     with tab4:
-        st.write("자동 매매 기록이 이곳에 표시됩니다. (기능 구현 예정)")
-        # 예시 데이터프레임
-        dummy_log = pd.DataFrame({
-            "시간": ["2023-10-25 10:00", "2023-10-25 14:30"],
-            "주문": ["매수", "매도"],
-            "가격": [150.00, 155.00],
-            "수량": [10, 10]
-        })
-        st.dataframe(dummy_log, use_container_width=True)
+        _render_trade_log_tab(user_id, ticker)
 
 
 def _render_disclosure_tab(ticker):
@@ -133,7 +136,7 @@ def _render_disclosure_tab(ticker):
     with col1:
         bgn_date = st.date_input(
             "시작일",
-            value=datetime.now() - timedelta(days=90),
+            value=datetime.now() - timedelta(days=DISCLOSURE_LOOKBACK_DAYS),
             key="dart_bgn_date",
         )
     with col2:
@@ -146,7 +149,9 @@ def _render_disclosure_tab(ticker):
     bgn_de = bgn_date.strftime("%Y%m%d")
     end_de = end_date.strftime("%Y%m%d")
 
-    disclosures = search_disclosures(corp_code, bgn_de, end_de, page_count=50)
+    disclosures = search_disclosures(
+        corp_code, bgn_de, end_de, page_count=DISCLOSURE_PAGE_COUNT
+    )
 
     if not disclosures:
         st.info("해당 기간에 공시 내역이 없습니다.")
@@ -171,4 +176,60 @@ def _render_disclosure_tab(ticker):
             f"**[{report_nm}]({dart_url})**  \n"
             f"`{date_display}` · {flr_nm}"
         )
-        st.divider()
\ No newline at end of file
+        st.divider()
+
+
+@st.cache_data(ttl=TRADE_LOG_TTL_SEC, show_spinner=False)
+def _load_trade_page(user_id, ticker, before):
+    return load_trades(user_id, ticker, limit=TRADE_LOG_PAGE_SIZE, before=before)
+
+
+def _next_trade_page(cursor):
+    st.session_state[SK_TRADE_LOG_PAGES]["cursors"].append(cursor)
+
+
+def _prev_trade_page():
+    st.session_state[SK_TRADE_LOG_PAGES]["cursors"].pop()
+
+
+def _render_trade_log_tab(user_id, ticker):
+    """선택한 종목의 체결 기록을 최근 순으로 페이지 단위(키셋 페이지네이션)로 표시합니다."""
+    if not user_id or not ticker:
+        st.info("종목을 선택하면 매매 기록이 표시됩니다.")
+        return
+
+    # 체결 기록은 KIS 종목코드로 저장됨 (005930.KS → 005930)
+    code = kis_ticker(ticker)
+
+    # 페이지마다 시작 커서를 쌓아 두고 이전 페이지는 꺼내서 돌아감 (종목이 바뀌면 처음부터)
+    pages = st.session_state.get(SK_TRADE_LOG_PAGES)
+    if not pages or pages["key"] != (user_id, code):
+        pages = {"key": (user_id, code), "cursors": [None]}
+        st.session_state[SK_TRADE_LOG_PAGES] = pages
+    cursors = pages["cursors"]
+
+    trades, next_cursor = _load_trade_page(user_id, code, cursors[-1])
+    if not trades and len(cursors) == 1:
+        st.info(f"{code} 매매 기록이 없습니다.")
+        return
+
+    st.dataframe(trades_dataframe(trades), width="stretch", hide_index=True)
+
+    col_prev, col_next, col_page = st.columns([1, 1, 4])
+    col_prev.button(
+        "◀ 최근",
+        key="trade_log_prev",
+        disabled=len(cursors) == 1,
+        on_click=_prev_trade_page,
+    )
+    col_next.button(
+        "이전 기록 ▶",
+        key="trade_log_next",
+        disabled=next_cursor is None,
+        on_click=_next_trade_page,
+        args=(next_cursor,),
+    )
+    col_page.caption(
+        f"{len(cursors)} 페이지 "
+        "(체결 확인 전 주문은 '주문', 증권사 체결 내역과 맞춘 기록은 '체결')"
+    )
@@ -0,0 +1,191 @@
+# ui/journal_ui.py
+import datetime
+import threading
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+from streamlit_calendar import calendar
+
+from modules.constants import (
+    SK_JOURNAL_CALENDAR_EVENT,
+    SK_JOURNAL_DATE,
+    SK_JOURNAL_MONTH,
+    SK_JOURNAL_PREFETCHED,
+    SK_JOURNAL_SEARCH,
+    SK_JOURNAL_SEARCH_PAGE,
+)
+from modules.db import get_journal_calendar, search_journals
+
+JOURNAL_SEARCH_PAGE_SIZE = 10
+JOURNAL_CALENDAR_TTL_SEC = (
+    600  # 다른 세션/프로세스에서 쓴 일지가 달력에 보이기까지 최대 시간
+)
+
+
+def _month_start(date):
+    return date.replace(day=1)
+
+
+def _add_months(month, step):
+    index = month.year * 12 + month.month - 1 + step
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+@st.cache_data(ttl=JOURNAL_CALENDAR_TTL_SEC, show_spinner=False)
+def load_journal_month(user_id: str, month: datetime.date) -> list:
+    """한 달(month: 1일)의 일지 날짜/글자 수/수정 시각"""
+    return get_journal_calendar(user_id, month, _add_months(month, 1))
+
+
+def refresh_journal_month(user_id: str, date):
+    """일지를 저장한 뒤 그 달의 달력 캐시를 비웁니다."""
+    load_journal_month.clear(user_id, _month_start(date))
+
+
+def _prefetch_months(user_id, months):
+    """이전/다음 달을 백그라운드에서 미리 캐시에 올려 달 이동을 즉시 처리합니다."""
+
+    def run():
+        for month in months:
+            try:
+                load_journal_month(user_id, month)
+            except Exception as e:
+                print(f"일지 달력 미리 읽기 실패 ({month:%Y-%m}): {e}")
+
+    thread = threading.Thread(target=run, name="journal-prefetch", daemon=True)
+    add_script_run_ctx(thread)
+    thread.start()
+
+
+def _reset_page():
+    st.session_state[SK_JOURNAL_SEARCH_PAGE] = 0
+
+
+def _move_page(step):
+    st.session_state[SK_JOURNAL_SEARCH_PAGE] += step
+
+
+def _open_journal(date):
+    # 날짜 선택 위젯(key=SK_JOURNAL_DATE)이 그려지기 전에 실행되는 콜백에서만 값을 바꿀 수 있음
+    st.session_state[SK_JOURNAL_DATE] = date
+    st.session_state[SK_JOURNAL_MONTH] = _month_start(date)
+
+
+def _move_month(step):
+    st.session_state[SK_JOURNAL_MONTH] = _add_months(
+        st.session_state[SK_JOURNAL_MONTH], step
+    )
+
+
+def render_journal_search(user_id: str):
+    """매매 일지 키워드 검색창과 결과(관련도 순, 일치 부분 강조)를 렌더링합니다."""
+    st.session_state.setdefault(SK_JOURNAL_SEARCH_PAGE, 0)
+    query = st.text_input(
+        "🔍 일지 검색",
+        key=SK_JOURNAL_SEARCH,
+        placeholder='예: 삼성 손절, "분할 매수", 반도체 -익절',
+        on_change=_reset_page,
+    )
+    if not query.strip():
+        return
+
+    page = st.session_state[SK_JOURNAL_SEARCH_PAGE]
+    # 다음 페이지가 있는지 알기 위해 1건 더 조회
+    results = search_journals(
+        user_id,
+        query,
+        limit=JOURNAL_SEARCH_PAGE_SIZE + 1,
+        offset=page * JOURNAL_SEARCH_PAGE_SIZE,
+    )
+    has_next = len(results) > JOURNAL_SEARCH_PAGE_SIZE
+    results = results[:JOURNAL_SEARCH_PAGE_SIZE]
+
+    if not results:
+        st.info("검색 결과가 없습니다.")
+    for item in results:
+        date = item["journal_date"]
+        cols = st.columns([1, 5])
+        cols[0].button(
+            str(date),
+            key=f"journal_hit_{date}",
+            on_click=_open_journal,
+            args=(date,),
+            help="이 날짜의 일지 열기",
+        )
+        cols[1].markdown(item["headline"])
+
+    if page or has_next:
+        cols = st.columns([1, 1, 4])
+        cols[0].button(
+            "◀ 이전",
+            disabled=page == 0,
+            on_click=_move_page,
+            args=(-1,),
+            key="journal_search_prev",
+        )
+        cols[1].button(
+            "다음 ▶",
+            disabled=not has_next,
+            on_click=_move_page,
+            args=(1,),
+            key="journal_search_next",
+        )
+        cols[2].caption(f"{page + 1} 페이지")
+    st.markdown("---")
+
+
+def render_journal_calendar(user_id: str):
+    """
+    월 단위 일지 달력을 렌더링합니다. 날짜(또는 일지)를 누르면 그 날짜의 일지를 엽니다.
+    아래 날짜 선택 위젯(key=SK_JOURNAL_DATE)보다 먼저 호출해야 합니다.
+    """
+    if SK_JOURNAL_MONTH not in st.session_state:
+        st.session_state[SK_JOURNAL_MONTH] = _month_start(datetime.date.today())
+    month = st.session_state[SK_JOURNAL_MONTH]
+
+    cols = st.columns([1, 4, 1])
+    cols[0].button("◀", on_click=_move_month, args=(-1,), key="journal_month_prev")
+    cols[1].markdown(f"#### {month:%Y년 %m월}")
+    cols[2].button("▶", on_click=_move_month, args=(1,), key="journal_month_next")
+
+    entries = load_journal_month(user_id, month)
+    events = [
+        {
+            "title": f"📝 {entry['content_length']:,}자",
+            "start": entry["journal_date"].isoformat(),
+            "allDay": True,
+            "extendedProps": {"updated_at": entry["updated_at"].isoformat()},
+        }
+        for entry in entries
+    ]
+    state = calendar(
+        events=events,
+        options={
+            "initialView": "dayGridMonth",
+            "initialDate": month.isoformat(),
+            "headerToolbar": False,  # 달 이동은 위 버튼으로 (이동할 달을 미리 읽어 두기 위해)
+            "locale": "ko",
+            "timeZone": "UTC",  # 클릭한 날짜가 시간대 때문에 하루 밀리지 않도록
+            "height": 420,
+        },
+        callbacks=["dateClick", "eventClick"],
+        # 달마다 다른 key: 달이 바뀌면 initialDate가 적용되도록 달력을 새로 그림
+        key=f"journal_calendar_{month:%Y%m}",
+    )
+    st.caption(f"이번 달 작성한 일지 {len(entries)}개")
+
+    # 같은 클릭 결과가 재실행마다 다시 들어오므로 새 클릭일 때만 날짜를 바꿈
+    clicked = None
+    if state.get("callback") == "dateClick":
+        clicked = state["dateClick"]["date"]
+    elif state.get("callback") == "eventClick":
+        clicked = state["eventClick"]["event"]["start"]
+    if clicked and clicked != st.session_state.get(SK_JOURNAL_CALENDAR_EVENT):
+        st.session_state[SK_JOURNAL_CALENDAR_EVENT] = clicked
+        st.session_state[SK_JOURNAL_DATE] = datetime.date.fromisoformat(clicked[:10])
+
+    # 달이 바뀌었을 때만 이웃한 달을 미리 읽음 (재실행마다 스레드를 만들지 않도록)
+    prefetch_key = (user_id, month)
+    if st.session_state.get(SK_JOURNAL_PREFETCHED) != prefetch_key:
+        st.session_state[SK_JOURNAL_PREFETCHED] = prefetch_key
+        _prefetch_months(user_id, [_add_months(month, 1), _add_months(month, -1)])
@@ -1,7 +1,7 @@
 # ui/sidebar.py
 import streamlit as st
 
-from modules.constants import SK_USER_INFO, SK_WATCHLIST
+from modules.constants import SK_AUTO_TRADE_TOGGLE, SK_USER_INFO, SK_WATCHLIST
 from ui.stock_search import search_assets
 from ui.watchlist_ui import render_watchlist_section
 
@@ -62,7 +62,11 @@ def render_sidebar():
         "목표 매도가 ($)", min_value=0.0, value=0.0, step=1.0
     )
 
-    is_auto_trading = st.sidebar.toggle("🤖 자동 매매 활성화")
+    # 종목별 키를 주어 다른 종목을 고르면 토글이 꺼진 상태로 다시 시작합니다.
+    # (보던 종목의 자동 매매가 새 종목으로 옮겨가 켜지지 않도록)
+    is_auto_trading = st.sidebar.toggle(
+        "🤖 자동 매매 활성화", key=f"{SK_AUTO_TRADE_TOGGLE}_{selected_ticker.upper()}"
+    )
     if is_auto_trading:
         st.sidebar.success("자동 매매 감시 중...")
 
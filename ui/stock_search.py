@@ -1,37 +1,9 @@
 # ui/stock_search.py
 import re
 
-import FinanceDataReader as fdr
-import pandas as pd
 import requests
-import streamlit as st
 
-
-@st.cache_data
-def get_krx_list():
-    """
-    한국거래소(KRX) 상장 종목 전체 리스트를 가져와 캐싱합니다.
-    """
-    try:
-        df = fdr.StockListing("KRX")
-        return df[["Code", "Name", "Market"]]
-    except Exception as e:
-        st.warning(f"KRX Listing(FDR) 실패 → CSV 백업으로 폴백: {repr(e)}")
-
-        backup_url = "https://raw.githubusercontent.com/corazzon/finance-data-analysis/main/krx.csv"
-        try:
-            df = pd.read_csv(backup_url)
-            if "Symbol" in df.columns and "Code" not in df.columns:
-                df = df.rename(columns={"Symbol": "Code"})
-            for col in ["Code", "Name", "Market"]:
-                if col not in df.columns:
-                    raise ValueError(
-                        f"백업 CSV에 {col} 컬럼이 없습니다. columns={df.columns.tolist()}"
-                    )
-            return df[["Code", "Name", "Market"]]
-        except Exception as e2:
-            st.error(f"KRX CSV 폴백도 실패: {repr(e2)}")
-            return pd.DataFrame()
+from modules.symbols import MARKET_SUFFIX, get_krx_list, remember_names
 
 
 def search_krx_market(query):
@@ -45,12 +17,7 @@ def search_krx_market(query):
 
     search_results = []
     for _, row in results_df.head(10).iterrows():
-        market_suffix = ""
-        if row["Market"] in ["KOSPI"]:
-            market_suffix = ".KS"
-        elif row["Market"] in ["KOSDAQ", "KONEX"]:
-            market_suffix = ".KQ"
-
+        market_suffix = MARKET_SUFFIX.get(row["Market"], "")
         final_ticker = f"{row['Code']}{market_suffix}"
         search_results.append(
             {
@@ -102,8 +69,10 @@ def search_assets(query):
     """입력 언어에 따라 검색 엔진을 분기합니다."""
     if not query:
         return []
-    if contains_korean(query):
-        return search_krx_market(query)
-    if query.isdigit() and len(query) == 6:
-        return search_krx_market(query)
-    return search_yahoo_market(query)
+    if contains_korean(query) or (query.isdigit() and len(query) == 6):
+        results = search_krx_market(query)
+    else:
+        results = search_yahoo_market(query)
+    # 관심 종목 등록 시 네트워크 조회 없이 이름을 쓸 수 있도록 기억
+    remember_names(results)
+    return results
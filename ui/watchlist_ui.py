@@ -1,8 +1,7 @@
 # ui/watchlist_ui.py
 import streamlit as st
 
-from modules.db import load_watchlist, add_watchlist, remove_watchlist
-from modules.scraper import fetch_stock_info
+from modules.watchlist_repo import get_watchlist_repo
 from modules.constants import (
     SK_WATCHLIST,
     SK_NEW_TICKER_INPUT,
@@ -14,9 +13,9 @@ def render_watchlist_section(user_id: str, selected_ticker: str):
     """사이드바에 관심 종목 관리 UI를 렌더링합니다."""
     st.sidebar.subheader("📌 관심 종목 목록")
 
-    # 초기화 및 DB 로딩 (세션에 없을 때만)
-    if SK_WATCHLIST not in st.session_state:
-        st.session_state[SK_WATCHLIST] = load_watchlist(user_id)
+    # 관심 종목 목록 (DB는 처음 한 번만 읽고 이후에는 메모리 캐시에서 가져옴)
+    repo = get_watchlist_repo()
+    st.session_state[SK_WATCHLIST] = repo.list(user_id)
 
     # 선택된 티커가 바뀌었을 때만 입력창을 자동 업데이트
     if st.session_state.get(SK_LAST_SELECTED_TICKER) != selected_ticker.upper():
@@ -28,11 +27,9 @@ def render_watchlist_section(user_id: str, selected_ticker: str):
     # 추가 버튼
     if st.sidebar.button("➕ 관심 종목 등록"):
         if new_ticker:
-            ticker_to_add = new_ticker.upper()
-            if ticker_to_add not in st.session_state[SK_WATCHLIST]:
-                info = fetch_stock_info(new_ticker)
-                add_watchlist(user_id, new_ticker, info["name"])
-                st.session_state[SK_WATCHLIST] = load_watchlist(user_id)
+            ticker_to_add = new_ticker.upper().strip()
+            # 종목명은 로컬 종목 테이블에서 찾으므로 등록은 INSERT 한 번으로 끝남
+            if repo.add(user_id, ticker_to_add):
                 st.sidebar.success(f"{ticker_to_add} 등록 완료!")
                 st.rerun()
             else:
@@ -47,6 +44,29 @@ def render_watchlist_section(user_id: str, selected_ticker: str):
             cols = st.sidebar.columns([3, 1])
             cols[0].write(f"- {ticker} ({name})")
             if cols[1].button("❌", key=f"remove_{ticker}"):
-                remove_watchlist(user_id, ticker)
-                st.session_state[SK_WATCHLIST] = load_watchlist(user_id)
+                repo.remove(user_id, ticker)
                 st.rerun()
+
+    # 일괄 가져오기/내보내기 (CSV)
+    with st.sidebar.expander("📂 CSV 가져오기 / 내보내기"):
+        uploaded = st.file_uploader(
+            "종목 CSV",
+            type=["csv"],
+            help="ticker(또는 종목코드) 열과 선택적으로 name(종목명) 열. 헤더가 없으면 첫 열을 티커로 읽습니다.",
+        )
+        if uploaded is not None and st.button("📥 일괄 등록"):
+            text = uploaded.getvalue().decode("utf-8-sig", errors="replace")
+            count = repo.import_csv(user_id, text)
+            if count:
+                st.success(f"{count}개 종목 등록 완료!")
+                st.rerun()
+            else:
+                st.warning("CSV에서 종목을 찾지 못했습니다.")
+
+        st.download_button(
+            "📤 관심 종목 내보내기",
+            # 클릭했을 때만 DB에서 내보냄 (화면을 그릴 때마다 조회하지 않도록)
+            data=lambda: repo.export_csv(user_id),
+            file_name="watchlist.csv",
+            mime="text/csv",
+        )